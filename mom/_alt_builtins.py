@@ -152,6 +152,59 @@ def integer_bit_length_word_aligned(num):
     return bits
 
 
+def integer_bit_length_hex(num):
+  """
+  Number of bits needed to represent a integer excluding any prefix
+  0 bits. Reads the first digit of the hexadecimal representation.
+
+  Alternative implementation of :func:`mom.builtins.integer_bit_length`
+  for interpreters without ``int.bit_length``.
+
+  :param num:
+      Integer value. If num is 0, returns 0. Only the absolute value of the
+      number is considered.
+  :returns:
+      Returns the number of bits in the integer.
+  """
+  # Do not change this to `not num` otherwise a TypeError will not
+  # be raised when `None` is passed in as a value.
+  if num == 0:
+    return 0
+  if num < 0:
+    num = -num
+  _ = num & 1
+  hex_num = "%x" % num
+  return ((len(hex_num) - 1) * 4) + {
+      "0": 0, "1": 1, "2": 2, "3": 2,
+      "4": 3, "5": 3, "6": 3, "7": 3,
+      "8": 4, "9": 4, "a": 4, "b": 4,
+      "c": 4, "d": 4, "e": 4, "f": 4,
+      }[hex_num[0]]
+
+
+def integer_bit_count_clearing(num):
+  """
+  Returns the number of set (1) bits in an unsigned integer by clearing
+  the lowest set bit until none remain.
+
+  Alternative implementation of :func:`mom.builtins.integer_bit_count`.
+
+  :param num:
+      An integer. If this is a negative integer, its absolute
+      value will be considered.
+  :returns:
+      The number of set bits in an unsigned integer.
+  """
+  # Licensed under the PSF License.
+  # Taken from http://wiki.python.org/moin/BitManipulation
+  num = abs(num)
+  count = 0
+  while num:
+    num &= num - 1
+    count += 1
+  return count
+
+
 # def _bin_lookup(num, prefix="0b"):
 #   """
 #   Converts a long value to its binary representation based on a lookup table.
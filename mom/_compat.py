@@ -11,6 +11,7 @@ Should not be used in public code. Use the wrappers in mom.
 # DO NOT REMOVE THIS LINE.
 from __future__ import absolute_import
 
+import array
 import os
 import struct
 import sys
@@ -145,6 +146,62 @@ HAVE_LITTLE_ENDIAN = bool(struct.pack("h", 1) == "\x01\x00")
 #     builtins.byte_ord(array("i", [1]).tostring()[0])
 #     )
 
+try:
+  # Python 3.2+ calls it ``tobytes()`` and Python 3.9 removed ``tostring()``.
+  array_tobytes = array.array.tobytes
+except AttributeError:
+  # Python 2.x
+  array_tobytes = array.array.tostring
+
+
+if HAVE_PYTHON3:
+
+  def byte_view(obj):
+    """Returns a flat unsigned-byte view of a buffer without copying it.
+
+    :param obj:
+        Any C-contiguous object supporting the buffer protocol.
+    :returns:
+        A one-dimensional ``memoryview`` of format "B".
+    """
+    view = memoryview(obj)
+    if not view.c_contiguous:
+      raise ValueError("buffer must be C-contiguous")
+    if view.ndim != 1 or view.format != "B":
+      view = view.cast("B")
+    return view
+
+  def buffer_bytes(obj):
+    """Copies the contents of a buffer into a bytes object.
+
+    :param obj:
+        Any C-contiguous object supporting the buffer protocol.
+    :returns:
+        Bytes.
+    """
+    return bytes(obj)
+else:
+
+  def byte_view(obj):
+    """Returns a read-only view of a buffer without copying it.
+
+    :param obj:
+        Any object supporting the (old-style) buffer protocol.
+    :returns:
+        A ``buffer`` object.
+    """
+    return buffer(obj)
+
+  def buffer_bytes(obj):
+    """Copies the contents of a buffer into a bytes object.
+
+    :param obj:
+        Any object supporting the (old-style) buffer protocol.
+    :returns:
+        Bytes.
+    """
+    return str(buffer(obj))
+
 
 try:
   # Check whether we have reduce as a built-in.
@@ -234,7 +291,9 @@ try:
     return os.urandom(count)
 except AttributeError:
   try:
-    __urandom_device__ = open("/dev/urandom", "rb")
+    # Unbuffered, so that forked processes never replay bytes read ahead
+    # into a buffer they inherited.
+    __urandom_device__ = open("/dev/urandom", "rb", 0)
 
     def generate_random_bytes(count):
       """Generates a random byte string with ``count`` bytes.
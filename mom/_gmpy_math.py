@@ -25,6 +25,8 @@ except ImportError:
 
 if HAVE_GMPY:
 
+  mpz = gmpy.mpz
+
   def pow_mod(base, power, modulus):
     """Calculates:
 
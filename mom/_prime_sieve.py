@@ -3,12 +3,395 @@
 # http://goo.gl/9qEXu
 # Public domain.
 
-"""Generates a prime sieve."""
+"""Generates a prime sieve.
+
+:func:`iter_primes` is a segmented sieve of Eratosthenes: only odd numbers
+are represented, 8 of them per byte of a ``bytearray``, and the range is
+sieved one cache-sized segment at a time. Memory use is bounded by the
+segment size plus the primes up to ``sqrt(high)``, however far the range
+extends, and windows far from zero can be sieved without sieving everything
+below them.
+"""
 
 from __future__ import division
 
+import math
+
 from mom import _compat
 
+
+__author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
+
+
+# Bytes of sieve per segment. Every byte holds 8 odd numbers, so a segment
+# spans ``16 * SEGMENT_SIZE`` integers. 32 KB stays within the data cache.
+SEGMENT_SIZE = 1 << 15
+
+# Base primes below this bound are found with a plain (unsegmented)
+# byte-per-odd sieve; larger bounds are themselves sieved in segments.
+_SIMPLE_SIEVE_LIMIT = 1 << 22
+
+# _CLEAR_BIT[bit] is a translation table that clears ``bit`` in every byte.
+_CLEAR_BIT = [bytes(bytearray(byte & ~(1 << bit) & 0xff
+                              for byte in _compat.range(256)))
+              for bit in _compat.range(8)]
+
+# _SET_BITS[byte] lists the positions of the bits set in ``byte``.
+_SET_BITS = [tuple(bit for bit in _compat.range(8) if byte >> bit & 1)
+             for byte in _compat.range(256)]
+
+# Integers below this have exact float square roots.
+_FLOAT_SQRT_LIMIT = 1 << 52
+
+
+def iter_primes(low=2, high=None, segment_size=SEGMENT_SIZE):
+  """
+  Yields the primes ``p`` with ``low <= p < high`` in increasing order.
+
+  :param low:
+      Lower bound (inclusive).
+  :param high:
+      Upper bound (exclusive). ``None`` (default) yields primes forever.
+  :param segment_size:
+      Bytes of sieve per segment. Each segment covers ``16 * segment_size``
+      integers.
+  :yields:
+      Prime numbers.
+  """
+  if segment_size < 1:
+    raise ValueError("segment_size must be positive: got %r" % segment_size)
+  if high is not None and high <= low:
+    return
+  if low <= 2 and (high is None or high > 2):
+    yield 2
+
+  # The first odd number in the range other than 1.
+  start = max(low, 3) | 1
+  span = segment_size << 4
+  base_primes = []
+  base_limit = 2
+  while high is None or start < high:
+    stop = start + span
+    if high is not None and stop > high:
+      stop = high
+    needed = _isqrt(stop - 1)
+    if needed > base_limit:
+      if high is None:
+        # Grow geometrically so the base primes are extended only rarely.
+        limit = max(needed, base_limit << 1)
+      else:
+        limit = _isqrt(high - 1)
+      base_primes.extend(_odd_primes(base_limit + 1, limit + 1))
+      base_limit = limit
+    for prime in _sieve_segment(start, stop, base_primes):
+      yield prime
+    start = stop
+
+
+def primes_between(low, high, segment_size=SEGMENT_SIZE):
+  """
+  Returns a list of the primes ``p`` with ``low <= p < high``.
+
+  :param low:
+      Lower bound (inclusive).
+  :param high:
+      Upper bound (exclusive).
+  :param segment_size:
+      Bytes of sieve per segment.
+  :returns:
+      List of primes.
+  """
+  return list(iter_primes(low, high, segment_size))
+
+
+def _sieve_segment(start, stop, base_primes):
+  """Yields the primes in ``[start, stop)``, where ``start`` is odd and
+  greater than 1, crossing off multiples of the odd ``base_primes``."""
+  set_bits = _SET_BITS
+  number = start
+  for byte in _sieve_bits(start, stop, base_primes):
+    if byte:
+      for bit in set_bits[byte]:
+        yield number + (bit << 1)
+    number += 16
+
+
+def _sieve_bits(start, stop, base_primes):
+  """Returns the sieve of the odd numbers in ``[start, stop)``, where
+  ``start`` is odd, crossing off multiples of the odd ``base_primes``.
+
+  Bit ``i`` of the segment stands for ``start + 2 * i``. The multiples of
+  an odd prime ``p`` are ``p`` bits apart, so after every 8 of them the
+  pattern repeats ``p`` bytes further on: each prime is crossed off with
+  8 strided slice translations instead of one Python operation per
+  multiple.
+
+  :returns:
+      A ``bytearray`` with a bit set for every number left; bits past
+      ``stop`` are clear.
+  """
+  num_bits = (stop - start + 1) >> 1
+  segment = bytearray(b"\xff") * ((num_bits + 7) >> 3)
+  if num_bits & 7:
+    segment[-1] = (1 << (num_bits & 7)) - 1
+
+  for prime in base_primes:
+    first = prime * prime
+    if first >= stop:
+      break
+    if first < start:
+      # Smallest odd multiple of prime that is not less than start.
+      first = start + (-start) % prime
+      if not first & 1:
+        first += prime
+    index = (first - start) >> 1
+    for _ in _compat.range(8):
+      if index >= num_bits:
+        break
+      pos = index >> 3
+      segment[pos::prime] = segment[pos::prime].translate(
+          _CLEAR_BIT[index & 7])
+      index += prime
+  return segment
+
+
+def _odd_primes(low, high):
+  """Returns a list of the odd primes ``p`` with ``low <= p < high``."""
+  if high > _SIMPLE_SIEVE_LIMIT:
+    return [prime for prime in iter_primes(max(low, 3), high)]
+  # Index i stands for 2 * i + 1.
+  sieve = bytearray(b"\x01") * (high >> 1)
+  if sieve:
+    sieve[0] = 0
+  size = len(sieve)
+  for i in _compat.range(1, (_isqrt(max(high - 1, 0)) + 1) >> 1):
+    if sieve[i]:
+      prime = 2 * i + 1
+      first = (prime * prime) >> 1
+      sieve[first::prime] = bytearray((size - 1 - first) // prime + 1)
+  return [2 * i + 1 for i in _compat.range(max(low, 3) >> 1, size)
+          if sieve[i]]
+
+
+def _isqrt(num):
+  """Returns the integer square root ``floor(sqrt(num))`` of ``num >= 0``."""
+  if num < _FLOAT_SQRT_LIMIT:
+    root = int(num ** 0.5)
+  else:
+    # Newton's method starting above the root.
+    root = 1 << ((num.bit_length() + 1) >> 1)
+    while True:
+      smaller = (root + num // root) >> 1
+      if smaller >= root:
+        break
+      root = smaller
+  while root * root > num:
+    root -= 1
+  while (root + 1) * (root + 1) <= num:
+    root += 1
+  return root
+
+
+# _POPCOUNT translates every byte into the number of bits set in it.
+_POPCOUNT = bytes(bytearray(len(bits) for bits in _SET_BITS))
+
+# prime_pi uses NumPy, when available, from this bound on; below it the
+# import would cost more than it saves.
+_NUMPY_PRIME_PI_LIMIT = 1 << 26
+
+
+def count_primes(low, high, segment_size=SEGMENT_SIZE):
+  """
+  Counts the primes ``p`` with ``low <= p < high`` with the segmented
+  sieve, adding up the bits left in every segment instead of listing the
+  primes.
+
+  :param low:
+      Lower bound (inclusive).
+  :param high:
+      Upper bound (exclusive).
+  :param segment_size:
+      Bytes of sieve per segment.
+  :returns:
+      Number of primes.
+  """
+  if segment_size < 1:
+    raise ValueError("segment_size must be positive: got %r" % segment_size)
+  if high <= low:
+    return 0
+  count = int(low <= 2 < high)
+  start = max(low, 3) | 1
+  span = segment_size << 4
+  base_primes = _odd_primes(3, _isqrt(max(high - 1, 0)) + 1)
+  while start < high:
+    stop = min(start + span, high)
+    count += sum(bytearray(
+        _sieve_bits(start, stop, base_primes).translate(_POPCOUNT)))
+    start = stop
+  return count
+
+
+def prime_pi(num):
+  """
+  Counts the primes less than or equal to ``num``.
+
+  Uses Lucy Hedgehog's variant of Legendre's method in O(num**(3/4)) time
+  and O(num**(1/2)) memory: the counts of the numbers up to every distinct
+  ``num // i`` that survive sieving by the primes below ``p`` are updated
+  one sieving prime at a time. The updates for a prime are array
+  operations with NumPy when it is installed; around ``10**11`` takes
+  under a second that way, and about 20 times as long without.
+
+  :param num:
+      Integer.
+  :returns:
+      Number of primes ``p <= num``.
+  """
+  if num < 2:
+    return 0
+  if num < 1 << 62 and num >= _NUMPY_PRIME_PI_LIMIT:
+    try:
+      import numpy
+    except ImportError:
+      numpy = None
+    if numpy is not None:
+      return _numpy_prime_pi(numpy, num)
+  return _pure_prime_pi(num)
+
+
+def _pure_prime_pi(num):
+  """Pure-Python :func:`prime_pi`."""
+  root = _isqrt(num)
+  # small[v] counts the survivors in [2, v] and large[i] those in
+  # [2, num // i]; at first, every number is a survivor.
+  small = list(_compat.range(-1, root))
+  small[0] = 0
+  large = [0] + [num // i - 1 for i in _compat.range(1, root + 1)]
+  for survivors, prime in enumerate(primes_between(2, root + 1)):
+    # survivors: the number of primes below prime.
+    square = prime * prime
+    limit = min(root, num // square)
+    middle = min(limit, root // prime)
+    large[1:middle + 1] = [
+        count - other + survivors for count, other in
+        zip(large[1:middle + 1], large[prime:middle * prime + 1:prime])]
+    large[middle + 1:limit + 1] = [
+        large[i] - small[num // (i * prime)] + survivors
+        for i in _compat.range(middle + 1, limit + 1)]
+    if square <= root:
+      small[square:] = [
+          small[v] - small[v // prime] + survivors
+          for v in _compat.range(square, root + 1)]
+  return large[1]
+
+
+def _numpy_prime_pi(numpy, num):
+  """Vectorized :func:`prime_pi` for ``num < 2**62``."""
+  root = _isqrt(num)
+  small = numpy.arange(-1, root, dtype=numpy.int64)
+  small[0] = 0
+  # quotients[i] == num // i
+  quotients = numpy.zeros(root + 1, dtype=numpy.int64)
+  quotients[1:] = num // numpy.arange(1, root + 1, dtype=numpy.int64)
+  large = quotients - 1
+  scratch = numpy.empty(root + 1, dtype=numpy.int64)
+  for survivors, prime in enumerate(primes_between(2, root + 1)):
+    square = prime * prime
+    limit = min(root, num // square)
+    middle = min(limit, root // prime)
+    large[1:middle + 1] -= large[prime:middle * prime + 1:prime]
+    large[1:middle + 1] += survivors
+    if limit > middle:
+      # num // (i * prime) == (num // i) // prime; dividing an array by a
+      # scalar is much faster than by another array.
+      indices = numpy.floor_divide(quotients[middle + 1:limit + 1], prime,
+                                   out=scratch[:limit - middle])
+      large[middle + 1:limit + 1] -= numpy.take(small, indices)
+      large[middle + 1:limit + 1] += survivors
+    if square <= root:
+      # small[v // prime] for v = square, square + 1, ... repeats every
+      # value prime times.
+      small[square:] -= numpy.repeat(
+          small[prime:root // prime + 1], prime)[:root + 1 - square]
+      small[square:] += survivors
+  return int(large[1])
+
+
+def _log_integral(num):
+  """Returns the logarithmic integral li(num) for ``num > 1``, summing
+  Ramanujan's series."""
+  log_num = math.log(num)
+  total = 0.0
+  term = -1.0
+  factor = 0.0
+  for k in _compat.range(1, 200):
+    term *= -log_num / k
+    if k & 1:
+      factor += 1.0 / k
+    change = term * factor / (1 << (k - 1))
+    total += change
+    if abs(change) < 1e-12 * abs(total):
+      break
+  return 0.5772156649015329 + math.log(log_num) + math.sqrt(num) * total
+
+
+def nth_prime(index):
+  """
+  Returns the ``index``-th prime, counting 2 as the first.
+
+  The prime is estimated by inverting the logarithmic integral, and the
+  estimate corrected with :func:`prime_pi` at it and a segmented sieve
+  over the gap between the two.
+
+  :param index:
+      Positive integer.
+  :returns:
+      The prime.
+  """
+  if index < 1:
+    raise ValueError("index must be positive: got %r" % index)
+  if index < 6:
+    return (2, 3, 5, 7, 11)[index - 1]
+  # li(x) - pi(x) is O(sqrt(x) * log(x)), so the estimate is usually a
+  # segment or two away from the prime.
+  estimate = index * math.log(index)
+  for _ in _compat.range(100):
+    step = (_log_integral(estimate) - index) * math.log(estimate)
+    estimate -= step
+    if abs(step) < 1:
+      break
+  estimate = int(estimate)
+  # Small estimates are close enough not to need whole segments.
+  span = min(SEGMENT_SIZE << 4, (_isqrt(estimate) << 4) + 256)
+  count = prime_pi(estimate)
+  if count < index:
+    # Walk up from the estimate.
+    start = (estimate + 1) | 1
+    base_primes = []
+    while True:
+      stop = start + span
+      if not base_primes or base_primes[-1] ** 2 < stop:
+        base_primes = _odd_primes(3, 2 * _isqrt(stop) + 2)
+      found = sum(bytearray(
+          _sieve_bits(start, stop, base_primes).translate(_POPCOUNT)))
+      if count + found >= index:
+        return list(_sieve_segment(start, stop, base_primes))[
+            index - count - 1]
+      count += found
+      start = stop
+  # Walk down from the estimate.
+  stop = estimate + 1
+  base_primes = _odd_primes(3, _isqrt(stop) + 1)
+  while True:
+    start = max(stop - span, 3) | 1
+    found = sum(bytearray(
+        _sieve_bits(start, stop, base_primes).translate(_POPCOUNT)))
+    if count - found < index:
+      return list(_sieve_segment(start, stop, base_primes))[
+          index - (count - found) - 1]
+    count -= found
+    stop = start
+
 try:
   # TODO(yesudeep): numpy import disabled temporarily until we can convert
   # the generated list to Python native. Rename "nump" to "numpy" when ready.
@@ -27,14 +410,6 @@ try:
 
 except ImportError:
 
-  def make_prime_sieve(max_n):  # def _rwh_primes1(max_n):
+  def make_prime_sieve(max_n):
     """Returns a list of primes < n"""
-    sieve = [True] * (max_n // 2)
-    for i in _compat.range(3, int(max_n ** 0.5) + 1, 2):
-      if sieve[i // 2]:
-        sieve[i * i // 2::i] = ([False] *
-                                ((max_n - i * i - 1) // (2 * i) + 1))
-    return [2] + [2 * i + 1 for i in _compat.range(1, max_n // 2) if sieve[i]]
-
-
-__author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
+    return primes_between(2, max_n)
@@ -62,6 +62,16 @@ Encodings
 .. autofunction:: byte
 .. autofunction:: byte_ord
 
+Buffers
+-------
+Codecs accept any C-contiguous object that supports the buffer protocol
+(``bytes``, ``bytearray``, ``memoryview``, ``array.array``, ``mmap.mmap``,
+...) wherever raw bytes are expected, so large buffers need not be copied
+into ``bytes`` before they are encoded.
+
+.. autofunction:: byte_view
+.. autofunction:: buffer_bytes
+
 
 Bits and bytes size counting
 ----------------------------
@@ -69,11 +79,15 @@ Bits and bytes size counting
 .. autofunction:: bytes_trailing
 .. autofunction:: integer_bit_length
 .. autofunction:: integer_bit_size
+.. autofunction:: integer_bit_count
 .. autofunction:: integer_byte_length
 .. autofunction:: integer_byte_size
+.. autofunction:: bit_length_many
+.. autofunction:: popcount_many
 
 Type detection predicates
 -------------------------
+.. autofunction:: is_buffer
 .. autofunction:: is_bytes
 .. autofunction:: is_bytes_or_unicode
 .. autofunction:: is_integer
@@ -102,7 +116,10 @@ except ImportError:  # pragma: no cover
   psyco = None
 # pylint: enable-msg=R0801
 
+import array
 import struct
+import sys
+
 from mom import _compat
 
 
@@ -110,8 +127,10 @@ __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
 
 
 __all__ = [
+    "buffer_bytes",
     "byte",
     "byte_ord",
+    "byte_view",
     "bytes",
     "bytes_leading",
     "bytes_trailing",
@@ -119,7 +138,11 @@ __all__ = [
     "hex",
     "integer_byte_length",
     "integer_byte_size",
+    "integer_bit_count",
     "integer_bit_length",
+    "bit_length_many",
+    "popcount_many",
+    "is_buffer",
     "is_sequence",
     "is_unicode",
     "is_bytes",
@@ -149,6 +172,8 @@ bytes = _compat.BYTES_TYPE
 b = _compat.byte_literal
 
 byte_ord = _compat.byte_ord
+byte_view = _compat.byte_view
+buffer_bytes = _compat.buffer_bytes
 
 
 dict_each = _compat.dict_each
@@ -179,19 +204,21 @@ def bytes_leading(raw_bytes, needle=_compat.ZERO_BYTE):
   Useful when you want to deal with padding.
 
   :param raw_bytes:
-      Raw bytes.
+      Raw bytes or any other buffer.
   :param needle:
       The byte to count. Default \000.
   :returns:
       The number of leading needle bytes.
   """
-  if not is_bytes(raw_bytes):
+  if not is_buffer(raw_bytes):
     raise TypeError("argument must be raw bytes: got %r" %
                     type(raw_bytes).__name__)
+  if is_bytes(raw_bytes):
+    return len(raw_bytes) - len(raw_bytes.lstrip(needle))
   leading = 0
   # Indexing keeps compatibility between Python 2.x and Python 3.x
   needle_byte = needle[0]
-  for raw_byte in raw_bytes:
+  for raw_byte in byte_view(raw_bytes):
     if raw_byte == needle_byte:
       leading += 1
     else:
@@ -206,19 +233,21 @@ def bytes_trailing(raw_bytes, needle=_compat.ZERO_BYTE):
   Useful when you want to deal with padding.
 
   :param raw_bytes:
-      Raw bytes.
+      Raw bytes or any other buffer.
   :param needle:
       The byte to count. Default \000.
   :returns:
       The number of trailing needle bytes.
   """
-  if not is_bytes(raw_bytes):
+  if not is_buffer(raw_bytes):
     raise TypeError("argument must be raw bytes: got %r" %
                     type(raw_bytes).__name__)
+  if is_bytes(raw_bytes):
+    return len(raw_bytes) - len(raw_bytes.rstrip(needle))
   trailing = 0
   # Indexing keeps compatibility between Python 2.x and Python 3.x
   needle_byte = needle[0]
-  for raw_byte in reversed(raw_bytes):
+  for raw_byte in reversed(byte_view(raw_bytes)):
     if raw_byte == needle_byte:
       trailing += 1
     else:
@@ -320,6 +349,28 @@ def is_bytes(obj):
   return isinstance(obj, _compat.BYTES_TYPE)
 
 
+def is_buffer(obj):
+  """
+  Determines whether the given value exposes raw bytes through the buffer
+  protocol: ``bytes``, ``bytearray``, ``memoryview``, ``array.array``,
+  ``mmap.mmap``, etc. Unicode strings are never considered buffers.
+
+  :param obj:
+      The value to test.
+  :returns:
+      ``True`` if value is a buffer; ``False`` otherwise.
+  """
+  if isinstance(obj, _compat.BYTES_TYPE):
+    return True
+  if isinstance(obj, _compat.UNICODE_TYPE):
+    return False
+  try:
+    byte_view(obj)
+    return True
+  except (TypeError, ValueError):
+    return False
+
+
 def is_bytes_or_unicode(obj):
   """
   Determines whether the given value is an instance of a string irrespective
@@ -354,10 +405,7 @@ def integer_byte_length(number):
   :returns:
       The number of bytes in the integer.
   """
-  quanta, remainder = divmod(integer_bit_length(number), 8)
-  if remainder:
-    quanta += 1
-  return quanta
+  return (integer_bit_length(number) + 7) >> 3
 
 
 def integer_byte_size(number):
@@ -369,43 +417,74 @@ def integer_byte_size(number):
   :returns:
       Size in bytes of an integer.
   """
-  quanta, remainder = divmod(integer_bit_length(number), 8)
-  if remainder or number == 0:
-    quanta += 1
-  return quanta
-
-
-def integer_bit_length(number):
-  """
-  Number of bits needed to represent a integer excluding any prefix
-  0 bits.
-
-  :param number:
-      Integer value. If num is 0, returns 0. Only the absolute value of the
-      number is considered. Therefore, signed integers will be abs(num)
-      before the number's bit length is determined.
-  :returns:
-      Returns the number of bits in the integer.
-  """
-  # Public domain. Taken from tlslite. This is the fastest implementation
-  # I have found.
-
-  # Do not change this to `not num` otherwise a TypeError will not
-  # be raised when `None` is passed in as a value.
-  if number == 0:
-    return 0
-  if number < 0:
-    number = -number
-    # Make sure this is an int and not float.
-  _ = number & 1
-  hex_num = "%x" % number
-  return ((len(hex_num) - 1) * 4) + {
+  return ((integer_bit_length(number) + 7) >> 3) or 1
+
+
+try:
+  # Python 2.7+ and 3.1+
+  (0).bit_length()
+  HAVE_BIT_LENGTH = True
+except AttributeError:
+  HAVE_BIT_LENGTH = False
+
+try:
+  # Python 3.10+
+  (0).bit_count()
+  HAVE_BIT_COUNT = True
+except AttributeError:
+  HAVE_BIT_COUNT = False
+
+
+if HAVE_BIT_LENGTH:
+
+  def integer_bit_length(number):
+    """
+    Number of bits needed to represent a integer excluding any prefix
+    0 bits.
+
+    :param number:
+        Integer value. If num is 0, returns 0. Only the absolute value of the
+        number is considered. Therefore, signed integers will be abs(num)
+        before the number's bit length is determined.
+    :returns:
+        Returns the number of bits in the integer.
+    """
+    # Make sure this is an int and not float (or None).
+    _ = number & 1
+    return number.bit_length()
+else:
+
+  def integer_bit_length(number):
+    """
+    Number of bits needed to represent a integer excluding any prefix
+    0 bits.
+
+    :param number:
+        Integer value. If num is 0, returns 0. Only the absolute value of the
+        number is considered. Therefore, signed integers will be abs(num)
+        before the number's bit length is determined.
+    :returns:
+        Returns the number of bits in the integer.
+    """
+    # Public domain. Taken from tlslite.
+
+    # Do not change this to `not num` otherwise a TypeError will not
+    # be raised when `None` is passed in as a value.
+    if number == 0:
+      return 0
+    if number < 0:
+      number = -number
+      # Make sure this is an int and not float.
+    _ = number & 1
+    hex_num = "%x" % number
+    return ((len(hex_num) - 1) * 4) + _HEX_DIGIT_BIT_LENGTHS[hex_num[0]]
+
+  _HEX_DIGIT_BIT_LENGTHS = {
       "0": 0, "1": 1, "2": 2, "3": 2,
       "4": 3, "5": 3, "6": 3, "7": 3,
       "8": 4, "9": 4, "a": 4, "b": 4,
       "c": 4, "d": 4, "e": 4, "f": 4,
-      }[hex_num[0]]
-  #return int(math.floor(math.log(n, 2))+1)
+      }
 
 
 def integer_bit_size(number):
@@ -425,24 +504,151 @@ def integer_bit_size(number):
   return integer_bit_length(number)
 
 
-def integer_bit_count(number):
+if HAVE_BIT_COUNT:
+
+  def integer_bit_count(number):
+    """
+    Returns the number of set (1) bits in an unsigned integer.
+
+    :param number:
+        An integer. If this is a negative integer, its absolute
+        value will be considered.
+    :returns:
+        The number of set bits in an unsigned integer.
+    """
+    # Make sure this is an int and not float (or None).
+    _ = number & 1
+    return number.bit_count()
+else:
+
+  def integer_bit_count(number):
+    """
+    Returns the number of set (1) bits in an unsigned integer.
+
+    :param number:
+        An integer. If this is a negative integer, its absolute
+        value will be considered.
+    :returns:
+        The number of set bits in an unsigned integer.
+    """
+    # Make sure this is an int and not float (or None).
+    _ = number & 1
+    # Binary formatting is done in C and takes time linear in the size of the
+    # number, unlike clearing one set bit at a time.
+    return format(number, "b").count("1")
+
+
+def bit_length_many(numbers):
   """
-  Returns the number of set (1) bits in an unsigned integer.
+  Returns the bit length of every integer in a sequence.
 
-  :param number:
-      An integer. If this is a negative integer, its absolute
-      value will be considered.
+  NumPy integer arrays are processed in a vectorized manner, and so are
+  ``array.array`` sequences of integers when NumPy has already been
+  imported.
+
+  :param numbers:
+      Sequence of integers.
+  :returns:
+      NumPy array of bit lengths for NumPy input; list of bit lengths
+      otherwise. See :func:`integer_bit_length`.
+  """
+  values = _numpy_integers(numbers)
+  if values is not None:
+    lengths = _numpy_bit_length(values)
+    return lengths if values is numbers else lengths.tolist()
+  if HAVE_BIT_LENGTH:
+    try:
+      return [number.bit_length() for number in numbers]
+    except AttributeError:
+      pass
+  return [integer_bit_length(number) for number in numbers]
+
+
+def popcount_many(numbers):
+  """
+  Returns the number of set bits of every integer in a sequence.
+
+  Vectorized like :func:`bit_length_many`.
+
+  :param numbers:
+      Sequence of integers.
   :returns:
-      The number of set bits in an unsigned integer.
-  """
-  # Licensed under the PSF License.
-  # Taken from http://wiki.python.org/moin/BitManipulation
-  number = abs(number)
-  count = 0
-  while number:
-    number &= number - 1
-    count += 1
-  return count
+      NumPy array of bit counts for NumPy input; list of bit counts
+      otherwise. See :func:`integer_bit_count`.
+  """
+  values = _numpy_integers(numbers)
+  if values is not None:
+    counts = _numpy_popcount(values)
+    return counts if values is numbers else counts.tolist()
+  if HAVE_BIT_COUNT:
+    try:
+      return [number.bit_count() for number in numbers]
+    except AttributeError:
+      pass
+  return [integer_bit_count(number) for number in numbers]
+
+
+# ``array.array`` type codes of integer arrays.
+_ARRAY_INTEGER_TYPECODES = "bBhHiIlLqQ"
+
+
+def _numpy_integers(numbers):
+  """
+  Returns ``numbers`` as a NumPy integer array when it can be processed
+  with NumPy, or ``None`` otherwise.
+
+  NumPy is never imported here: a NumPy array can only exist if NumPy has
+  already been imported by someone else, and importing it just for an
+  ``array.array`` would cost more than it saves.
+  """
+  numpy = sys.modules.get("numpy")
+  if numpy is None:
+    return None
+  if isinstance(numbers, numpy.ndarray):
+    if numbers.dtype.kind not in "iub":
+      raise TypeError("array must hold integers: got %s" % numbers.dtype)
+    return numbers
+  if (isinstance(numbers, array.array) and
+      numbers.typecode in _ARRAY_INTEGER_TYPECODES):
+    return numpy.asarray(numbers)
+  return None
+
+
+def _numpy_magnitudes(values):
+  """Returns the absolute values of an integer array as ``uint64``."""
+  numpy = sys.modules["numpy"]
+  if values.dtype.kind == "i":
+    # Widened first so that abs() of the most negative value of a narrow
+    # type does not overflow; abs(-2**63) wraps to 2**63 in uint64 anyway.
+    return numpy.abs(values.astype(numpy.int64)).view(numpy.uint64)
+  return numpy.ascontiguousarray(values, dtype=numpy.uint64)
+
+
+def _numpy_bit_length(values):
+  """Vectorized :func:`integer_bit_length` for 64-bit or narrower arrays."""
+  numpy = sys.modules["numpy"]
+  words = _numpy_magnitudes(values)
+  lengths = numpy.zeros(words.shape, dtype=numpy.int64)
+  # Binary search for the highest set bit in every word at once.
+  for shift in (32, 16, 8, 4, 2, 1):
+    high = words >> numpy.uint64(shift)
+    found = high != 0
+    lengths += found * shift
+    words = numpy.where(found, high, words)
+  lengths += words.astype(numpy.int64)
+  return lengths
+
+
+def _numpy_popcount(values):
+  """Vectorized :func:`integer_bit_count` for 64-bit or narrower arrays."""
+  numpy = sys.modules["numpy"]
+  words = _numpy_magnitudes(values)
+  if hasattr(numpy, "bitwise_count"):
+    # NumPy 2.0+
+    return numpy.bitwise_count(words).astype(numpy.int64)
+  table = numpy.array([integer_bit_count(i) for i in range(256)],
+                      dtype=numpy.int64)
+  return table[words.view(numpy.uint8)].reshape(words.shape + (8,)).sum(-1)
 
 
 def is_even(num):
@@ -261,8 +261,16 @@ Use them. They will help prevent unexpected bugs.
 .. autofunction:: base64_urlsafe_decode
 .. autofunction:: base62_encode
 .. autofunction:: base62_decode
+.. autofunction:: base62_encode_many
+.. autofunction:: base62_decode_many
+.. autofunction:: base62_encode_blocks
+.. autofunction:: base62_decode_blocks
 .. autofunction:: base58_encode
 .. autofunction:: base58_decode
+.. autofunction:: base58_encode_many
+.. autofunction:: base58_decode_many
+.. autofunction:: base58_encode_blocks
+.. autofunction:: base58_decode_blocks
 .. autofunction:: base36_encode
 .. autofunction:: base36_decode
 .. autofunction:: hex_encode
@@ -272,6 +280,13 @@ Use them. They will help prevent unexpected bugs.
 .. autofunction:: bin_encode
 .. autofunction:: bin_decode
 
+Files
+-----
+Converts whole files in bounded memory.
+
+.. autofunction:: encode_file
+.. autofunction:: decode_file
+
 .. automodule:: mom.codec.base85
 .. automodule:: mom.codec.base62
 .. automodule:: mom.codec.base58
@@ -294,6 +309,9 @@ except ImportError:  # pragma: no cover
 # pylint: enable-msg=R0801
 
 import binascii
+import io
+import mmap
+import os
 
 from mom import _compat
 from mom import builtins
@@ -314,9 +332,17 @@ __all__ = [
     "base36_decode",
     "base36_encode",
     "base58_decode",
+    "base58_decode_blocks",
+    "base58_decode_many",
     "base58_encode",
+    "base58_encode_blocks",
+    "base58_encode_many",
     "base62_decode",
+    "base62_decode_blocks",
+    "base62_decode_many",
     "base62_encode",
+    "base62_encode_blocks",
+    "base62_encode_many",
     "base64_decode",
     "base64_encode",
     "base64_urlsafe_decode",
@@ -327,6 +353,8 @@ __all__ = [
     "bin_encode",
     "decimal_decode",
     "decimal_encode",
+    "decode_file",
+    "encode_file",
     "hex_decode",
     "hex_encode",
     ]
@@ -406,7 +434,7 @@ def base64_urlsafe_encode(raw_bytes):
   :returns:
       Base64 encoded string without newline characters.
   """
-  if not builtins.is_bytes(raw_bytes):
+  if not builtins.is_buffer(raw_bytes):
     raise TypeError("argument must be bytes: got %r" %
                     type(raw_bytes).__name__)
     # This is 3-4x faster than urlsafe_b64decode() -Guido.
@@ -430,8 +458,10 @@ def base64_urlsafe_decode(encoded):
       Raw bytes.
   """
   if not builtins.is_bytes(encoded):
-    raise TypeError("argument must be bytes: got %r" %
-                    type(encoded).__name__)
+    if not builtins.is_buffer(encoded):
+      raise TypeError("argument must be bytes: got %r" %
+                      type(encoded).__name__)
+    encoded = builtins.buffer_bytes(encoded)
   remainder = len(encoded) % 4
   if remainder:
     encoded += EQUAL_BYTE * (4 - remainder)
@@ -457,7 +487,7 @@ def base64_encode(raw_bytes):
   :returns:
       Base64 encoded bytes without newline characters.
   """
-  if not builtins.is_bytes(raw_bytes):
+  if not builtins.is_buffer(raw_bytes):
     raise TypeError("argument must be bytes: got %r" %
                     type(raw_bytes).__name__)
   return binascii.b2a_base64(raw_bytes)[:-1]
@@ -472,7 +502,7 @@ def base64_decode(encoded):
   :returns:
       Raw bytes.
   """
-  if not builtins.is_bytes(encoded):
+  if not builtins.is_buffer(encoded):
     raise TypeError("argument must be bytes: got %r" %
                     type(encoded).__name__)
   return binascii.a2b_base64(encoded)
@@ -509,6 +539,72 @@ def base62_decode(encoded):
   return base62.b62decode(encoded)
 
 
+def base62_encode_many(raw_bytes_list, workers=None):
+  """
+  Encodes a sequence of raw byte strings into base-62 representation.
+
+  Much faster than calling :func:`base62_encode` for every item.
+
+  :param raw_bytes_list:
+      Sequence of bytes to encode.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      List of base-62 encoded bytes.
+  """
+  return base62.b62encode_many(raw_bytes_list, workers=workers)
+
+
+def base62_decode_many(encoded_list, workers=None):
+  """
+  Decodes a sequence of base-62-encoded byte strings into raw bytes.
+
+  Much faster than calling :func:`base62_decode` for every item.
+
+  :param encoded_list:
+      Sequence of base-62 encoded bytes.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      List of raw bytes.
+  """
+  return base62.b62decode_many(encoded_list, workers=workers)
+
+def base62_encode_blocks(raw_bytes, workers=None):
+  """
+  Encodes raw bytes into block-mode base-62 representation. URL-safe.
+
+  Linear-time alternative to :func:`base62_encode` for large payloads;
+  the two formats are not interchangeable.
+
+  :param raw_bytes:
+      Bytes to encode.
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      Block-mode base-62 encoded bytes.
+  """
+  return base62.b62encode_blocks(raw_bytes, workers=workers)
+
+
+def base62_decode_blocks(encoded, workers=None):
+  """
+  Decodes block-mode base-62-encoded bytes into raw bytes.
+
+  :param encoded:
+      Block-mode base-62 encoded bytes.
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      Raw bytes.
+  """
+  return base62.b62decode_blocks(encoded, workers=workers)
+
+
 def base58_encode(raw_bytes):
   """
   Encodes raw bytes into base-58 representation. URL-safe and human safe.
@@ -540,6 +636,72 @@ def base58_decode(encoded):
   return base58.b58decode(encoded)
 
 
+def base58_encode_many(raw_bytes_list, workers=None):
+  """
+  Encodes a sequence of raw byte strings into base-58 representation.
+
+  Much faster than calling :func:`base58_encode` for every item.
+
+  :param raw_bytes_list:
+      Sequence of bytes to encode.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      List of base-58 encoded bytes.
+  """
+  return base58.b58encode_many(raw_bytes_list, workers=workers)
+
+
+def base58_decode_many(encoded_list, workers=None):
+  """
+  Decodes a sequence of base-58-encoded byte strings into raw bytes.
+
+  Much faster than calling :func:`base58_decode` for every item.
+
+  :param encoded_list:
+      Sequence of base-58 encoded bytes.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      List of raw bytes.
+  """
+  return base58.b58decode_many(encoded_list, workers=workers)
+
+def base58_encode_blocks(raw_bytes, workers=None):
+  """
+  Encodes raw bytes into block-mode base-58 representation. URL-safe.
+
+  Linear-time alternative to :func:`base58_encode` for large payloads;
+  the two formats are not interchangeable.
+
+  :param raw_bytes:
+      Bytes to encode.
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      Block-mode base-58 encoded bytes.
+  """
+  return base58.b58encode_blocks(raw_bytes, workers=workers)
+
+
+def base58_decode_blocks(encoded, workers=None):
+  """
+  Decodes block-mode base-58-encoded bytes into raw bytes.
+
+  :param encoded:
+      Block-mode base-58 encoded bytes.
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      Raw bytes.
+  """
+  return base58.b58decode_blocks(encoded, workers=workers)
+
+
 def base36_encode(raw_bytes):
   """
   Encodes raw bytes into base-36 representation.
@@ -582,7 +744,7 @@ def hex_encode(raw_bytes):
   :returns:
       Hex-encoded representation.
   """
-  if not builtins.is_bytes(raw_bytes):
+  if not builtins.is_buffer(raw_bytes):
     raise TypeError("argument must be raw bytes: got %r" %
                     type(raw_bytes).__name__)
   return binascii.b2a_hex(raw_bytes)
@@ -597,7 +759,7 @@ def hex_decode(encoded):
   :returns:
       Raw bytes.
   """
-  if not builtins.is_bytes(encoded):
+  if not builtins.is_buffer(encoded):
     raise TypeError("argument must be bytes: got %r" %
                     type(encoded).__name__)
   return binascii.a2b_hex(encoded)
@@ -634,6 +796,8 @@ def decimal_decode(encoded):
   :returns:
       Raw bytes.
   """
+  if not builtins.is_bytes(encoded) and builtins.is_buffer(encoded):
+    encoded = builtins.buffer_bytes(encoded)
   padding = ZERO_BYTE * builtins.bytes_leading(encoded, DIGIT_ZERO_BYTE)
   int_val = int(encoded)
   if int_val:
@@ -696,7 +860,7 @@ def bin_encode(raw_bytes):
   :returns:
       Binary representation.
   """
-  if not builtins.is_bytes(raw_bytes):
+  if not builtins.is_buffer(raw_bytes):
     raise TypeError("argument must be raw bytes: got %r" %
                     type(raw_bytes).__name__)
   return EMPTY_BYTE.join(_HEX_TO_BIN_LOOKUP[hex_char]
@@ -713,8 +877,209 @@ def bin_decode(encoded):
       Raw bytes.
   """
   if not builtins.is_bytes(encoded):
-    raise TypeError("argument must be bytes: got %r" %
-                    type(encoded).__name__)
+    if not builtins.is_buffer(encoded):
+      raise TypeError("argument must be bytes: got %r" %
+                      type(encoded).__name__)
+    encoded = builtins.buffer_bytes(encoded)
   return binascii.a2b_hex(EMPTY_BYTE.join(_BIN_TO_HEX_LOOKUP[nibble]
                                           for nibble
                                           in functional.chunks(encoded, 4)))
+
+
+# File-to-file conversion.
+
+# Bytes read (and memory-mapped) per step. Rounded down to a multiple of the
+# codec's group size so that every step except the last converts whole groups.
+FILE_CHUNK_SIZE = 1 << 20
+
+
+class _GroupCoder(object):
+  """Incremental coder for codecs that convert fixed-size groups of input
+  independently of each other (base64, hex).
+
+  :param convert:
+      Function that converts a whole number of groups.
+  :param group_size:
+      Number of input bytes per group.
+  :param ignore_whitespace:
+      ``True`` if whitespace in the input should be skipped (decoding);
+      ``False`` (default) otherwise.
+  """
+
+  def __init__(self, convert, group_size, ignore_whitespace=False):
+    self._convert = convert
+    self._group_size = group_size
+    self._ignore_whitespace = ignore_whitespace
+    self._pending = EMPTY_BYTE
+
+  def update(self, data):
+    """Converts all the complete groups available so far.
+
+    :param data:
+        Bytes or any buffer.
+    :returns:
+        Converted bytes.
+    """
+    if self._ignore_whitespace:
+      data = builtins.buffer_bytes(data).translate(None,
+                                                  base85.WHITESPACE_BYTES)
+    if self._pending:
+      data = self._pending + builtins.buffer_bytes(data)
+    cut = len(data) - len(data) % self._group_size
+    # Only the partial group at the end is ever copied.
+    self._pending = builtins.buffer_bytes(data[cut:])
+    if not cut:
+      return EMPTY_BYTE
+    return self._convert(data[:cut])
+
+  def finalize(self):
+    """Converts the trailing partial group, if any.
+
+    :returns:
+        Converted bytes.
+    """
+    data, self._pending = self._pending, EMPTY_BYTE
+    if not data:
+      return EMPTY_BYTE
+    return self._convert(data)
+
+
+# codec name: (encoder factory, decoder factory, raw bytes per group)
+_FILE_CODECS = {
+    "BASE64": (lambda: _GroupCoder(base64_encode, 3),
+               lambda: _GroupCoder(base64_decode, 4, True),
+               3),
+    "HEX": (lambda: _GroupCoder(hex_encode, 1),
+            lambda: _GroupCoder(hex_decode, 2, True),
+            1),
+    "BASE58-BLOCKS": (lambda: _GroupCoder(base58_encode_blocks, 8),
+                      lambda: _GroupCoder(base58_decode_blocks, 11, True),
+                      8),
+    "BASE62-BLOCKS": (lambda: _GroupCoder(base62_encode_blocks, 8),
+                      lambda: _GroupCoder(base62_decode_blocks, 11, True),
+                      8),
+    B85_ASCII: (base85.B85Encoder, base85.B85Decoder, 4),
+    B85_RFC1924: (base85.RFC1924B85Encoder, base85.RFC1924B85Decoder, 4),
+    }
+_FILE_CODECS["BASE85"] = _FILE_CODECS[B85_ASCII]
+
+
+def _file_codec(codec):
+  """Looks up a codec usable with :func:`encode_file` and
+  :func:`decode_file`."""
+  try:
+    return _FILE_CODECS[codec.upper()]
+  except KeyError:
+    raise ValueError("unsupported codec: %r" % codec)
+
+
+def _map_file(src):
+  """Memory-maps a readable file object.
+
+  :param src:
+      File object.
+  :returns:
+      ``mmap.mmap`` of the entire file, or ``None`` if the object is not
+      backed by a mappable file (pipes, sockets, in-memory streams, empty
+      files).
+  """
+  try:
+    fileno = src.fileno()
+    if not os.fstat(fileno).st_size:
+      return None
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+  except (AttributeError, ValueError, EnvironmentError, io.UnsupportedOperation):
+    return None
+
+
+def _convert_file(src, dst, coder, chunk_size):
+  """Pushes ``src`` through an incremental coder into ``dst``."""
+  write = dst.write
+  mapped = _map_file(src)
+  if mapped is None:
+    while True:
+      chunk = src.read(chunk_size)
+      if not chunk:
+        break
+      output = coder.update(chunk)
+      if output:
+        write(output)
+  else:
+    view = builtins.byte_view(mapped)
+    try:
+      for offset in builtins.range(0, len(mapped), chunk_size):
+        output = coder.update(view[offset:offset + chunk_size])
+        if output:
+          write(output)
+    finally:
+      if _compat.HAVE_PYTHON3:
+        # The map cannot be closed while views of it are alive.
+        view.release()
+      mapped.close()
+  output = coder.finalize()
+  if output:
+    write(output)
+
+
+def _transcode_file(src, dst, coder, group_size, chunk_size):
+  """Opens paths as needed and converts ``src`` into ``dst``."""
+  if chunk_size < 1:
+    raise ValueError("chunk_size must be positive: got %r" % chunk_size)
+  chunk_size = max(chunk_size - chunk_size % group_size, group_size)
+  src_file = open(src, "rb") if builtins.is_bytes_or_unicode(src) else src
+  try:
+    dst_file = open(dst, "wb") if builtins.is_bytes_or_unicode(dst) else dst
+    try:
+      _convert_file(src_file, dst_file, coder, chunk_size)
+    finally:
+      if dst_file is not dst:
+        dst_file.close()
+  finally:
+    if src_file is not src:
+      src_file.close()
+
+
+def encode_file(src, dst, codec="base64", chunk_size=FILE_CHUNK_SIZE):
+  """
+  Encodes the contents of a file into another file.
+
+  The input is memory-mapped when possible and converted in chunks
+  aligned to the codec's group size, so memory use stays around
+  ``chunk_size`` no matter how large the file is. Output is the same as
+  encoding the whole file at once.
+
+  :param src:
+      Path or binary file object to read raw bytes from. Files that can
+      be memory-mapped are encoded in their entirety; other file objects
+      are read from their current position.
+  :param dst:
+      Path or any object with a ``write(bytes)`` method.
+  :param codec:
+      One of "base64", "hex", "base85" (same as "ASCII85"), "RFC1924",
+      "base58-blocks", or "base62-blocks" (see :func:`base58_encode_blocks`).
+  :param chunk_size:
+      Number of input bytes converted per step.
+  """
+  encoder_factory, _, group_size = _file_codec(codec)
+  _transcode_file(src, dst, encoder_factory(), group_size, chunk_size)
+
+
+def decode_file(src, dst, codec="base64", chunk_size=FILE_CHUNK_SIZE):
+  """
+  Decodes the contents of a file into another file.
+
+  Works in bounded memory like :func:`encode_file`. Whitespace (line
+  breaks, for example) in the encoded input is ignored.
+
+  :param src:
+      Path or binary file object to read encoded bytes from.
+  :param dst:
+      Path or any object with a ``write(bytes)`` method.
+  :param codec:
+      One of "base64", "hex", "base85" (same as "ASCII85"), "RFC1924",
+      "base58-blocks", or "base62-blocks".
+  :param chunk_size:
+      Number of input bytes converted per step.
+  """
+  _, decoder_factory, _ = _file_codec(codec)
+  _transcode_file(src, dst, decoder_factory(), 1, chunk_size)
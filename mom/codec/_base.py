@@ -21,8 +21,48 @@
 
 .. autofunction:: base_encode
 .. autofunction:: base_decode
+.. autofunction:: base_encode_many
+.. autofunction:: base_decode_many
+.. autofunction:: base_encode_blocks
+.. autofunction:: base_decode_blocks
 .. autofunction:: base_to_uint
+.. autofunction:: uint_to_base
 .. autofunction:: uint_to_base256
+
+Divide-and-conquer conversion
+-----------------------------
+Peeling one digit at a time off a big integer costs one full-size division
+per digit and is therefore quadratic in the size of the input. Instead,
+:func:`uint_to_base` and :func:`base_to_uint` split the number (or the
+encoded digits) in halves around a power ``base**(2**k)`` and recurse on
+each half, so that the bulk of the work is done by a few big
+multiplications and divisions rather than by millions of small ones. The
+powers ``base**1, base**2, base**4, ...`` (the "tower") are computed once
+per base and cached, and are grown lazily as longer inputs show up, so
+importing a codec costs nothing and there is no length beyond which
+conversion suddenly becomes slower.
+
+Batch conversion
+----------------
+For many short payloads (identifiers, keys, hashes) the cost of a
+conversion is dominated by per-call overhead rather than arithmetic.
+:func:`base_encode_many` and :func:`base_decode_many` type-check the whole
+batch up front, build their lookup tables once per batch (a two-digit
+table for encoding and a byte translation table for decoding), and can
+optionally spread large batches over a pool of worker processes.
+
+Block mode
+----------
+:func:`base_encode_blocks` and :func:`base_decode_blocks` implement a
+different format: the input is cut into ``BLOCK_SIZE``-byte blocks and
+each block is encoded on its own into a fixed number of digits (11 for
+base-58 and base-62), much like base-85 encodes 4-byte groups. A trailing
+partial block of ``n`` bytes is encoded into the fewest digits that can
+represent any ``n`` bytes; these lengths are distinct for every ``n``, so
+the decoder can tell how long the partial block was. Conversion is linear
+in the size of the input, can be done a chunk at a time, and can be
+spread over worker processes. The output is not compatible with
+:func:`base_encode`.
 """
 
 from __future__ import absolute_import
@@ -36,6 +76,10 @@ except ImportError:  # pragma: no cover
   psyco = None
 # pylint: enable-msg=R0801
 
+import binascii
+import multiprocessing
+import struct
+
 from mom import _compat
 from mom import builtins
 from mom.codec import integer
@@ -47,50 +91,168 @@ __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
 ZERO_BYTE = _compat.ZERO_BYTE
 EMPTY_BYTE = _compat.EMPTY_BYTE
 
+# Numbers of at most 2**_LEAF_LEVEL digits are converted a digit at a time.
+# Larger ones are split in halves by the divide-and-conquer engine. Tuned
+# by bench-marking; small integers divide by small integers really fast.
+_LEAF_LEVEL = 6
+_LEAF_DIGITS = 1 << _LEAF_LEVEL
+
+# Cache of ``[base**1, base**2, base**4, ..., base**(2**k)]`` lists keyed by
+# base. See _power_tower().
+_POWER_TOWERS = {}
+
+# Batches are handed to worker processes in slices of this many items.
+# Smaller slices spend more time pickling than converting.
+BATCH_CHUNK_SIZE = 4096
+
+# Marks bytes outside the character set in decoding translation tables.
+_INVALID_DIGIT = 0xff
+
+# Raw bytes per block in block mode. One 64-bit word per block.
+BLOCK_SIZE = 8
+
+# Blocks are converted in segments of this many blocks, and handed to
+# worker processes this many segments (1 MiB of raw bytes) at a time.
+_BLOCK_SEGMENT_SIZE = BATCH_CHUNK_SIZE
+_BLOCK_TASK_SEGMENTS = 32
+
+# Cache of block-mode tables keyed by base. See _block_table().
+_BLOCK_TABLES = {}
+
 
 def base_encode(raw_bytes, base, base_bytes, base_zero, padding=True):
   """
   Encodes raw bytes given a base.
 
   :param raw_bytes:
-      Raw bytes to encode.
+      Raw bytes (or any other buffer) to encode.
   :param base:
       Unsigned integer base.
   :param base_bytes:
       The ASCII bytes used in the encoded string. "Character set" or "alphabet".
   :param base_zero:
-
+      The ASCII byte used to represent a leading zero byte.
+  :param padding:
+      ``True`` (default) to prefix one ``base_zero`` for every leading
+      zero byte in ``raw_bytes``.
+  :returns:
+      Encoded bytes.
   """
-  if not builtins.is_bytes(raw_bytes):
+  if not builtins.is_buffer(raw_bytes):
     raise TypeError("data must be raw bytes: got %r" %
                     type(raw_bytes).__name__)
   number = integer.bytes_to_uint(raw_bytes)
-  encoded = EMPTY_BYTE
-  while number > 0:
-    number, remainder = divmod(number, base)
-    encoded = base_bytes[remainder] + encoded
+  encoded = uint_to_base(number, base, base_bytes)
   if padding:
     zero_leading = builtins.bytes_leading(raw_bytes)
     encoded = encoded.rjust(len(encoded) + zero_leading, base_zero)
   return encoded
 
 
-def base_decode(encoded, base, base_ords, base_zero, powers):
+def base_decode(encoded, base, base_ords, base_zero, powers=None):
   """Decode from base to base 256."""
   if not builtins.is_bytes(encoded):
-    raise TypeError("encoded data must be bytes: got %r" %
-                    type(encoded).__name__)
-    # Ignore whitespace.
+    if not builtins.is_buffer(encoded):
+      raise TypeError("encoded data must be bytes: got %r" %
+                      type(encoded).__name__)
+    encoded = builtins.buffer_bytes(encoded)
+  # Ignore whitespace.
   encoded = EMPTY_BYTE.join(encoded.split())
   # Convert to big integer.
   number = base_to_uint(encoded, base, base_ords, powers)
   return uint_to_base256(number, encoded, base_zero)
 
 
+def _power_tower(base, level):
+  """
+  Returns the cached list ``[base**1, base**2, base**4, ..., base**(2**k)]``
+  for the given base, grown to at least ``level + 1`` entries.
+
+  The list is never mutated once published, so concurrent callers growing
+  the same tower at worst compute a few squares twice.
+
+  :param base:
+      Unsigned integer base.
+  :param level:
+      The highest index ``k`` required.
+  :returns:
+      List of powers where ``tower[k] == base ** (2 ** k)``.
+  """
+  tower = _POWER_TOWERS.get(base) or [base]
+  if len(tower) <= level:
+    tower = list(tower)
+    while len(tower) <= level:
+      tower.append(tower[-1] * tower[-1])
+    _POWER_TOWERS[base] = tower
+  return tower
+
+
+def uint_to_base(number, base, base_bytes):
+  """
+  Converts an unsigned integer into its representation in the given base.
+
+  Leading zero digits are not included, so 0 is encoded as an empty byte
+  string.
+
+  :param number:
+      Unsigned integer.
+  :param base:
+      Unsigned integer base.
+  :param base_bytes:
+      The ASCII bytes used in the encoded string. "Character set" or "alphabet".
+  :returns:
+      Encoded bytes.
+  """
+  digits = []
+  tower = _power_tower(base, _LEAF_LEVEL)
+  if number < tower[_LEAF_LEVEL]:
+    _uint_to_base_leaf(number, base, base_bytes, 0, digits)
+  else:
+    level = _LEAF_LEVEL + 1
+    tower = _power_tower(base, level)
+    while number >= tower[level]:
+      level += 1
+      tower = _power_tower(base, level)
+    _uint_to_base_recursive(number, level, 0, base, base_bytes, tower, digits)
+  return EMPTY_BYTE.join(digits)
+
+
+def _uint_to_base_leaf(number, base, base_bytes, width, digits):
+  """Appends the digits of a small number to ``digits``, most significant
+  digit first and left-padded with zero digits up to ``width``."""
+  leaf = []
+  while number:
+    number, remainder = divmod(number, base)
+    leaf.append(base_bytes[remainder])
+  if width > len(leaf):
+    leaf.extend([base_bytes[0]] * (width - len(leaf)))
+  leaf.reverse()
+  digits.extend(leaf)
+
+
+def _uint_to_base_recursive(number, level, padded, base, base_bytes, tower,
+                            digits):
+  """Appends the digits of ``number < base**(2**level)`` to ``digits``.
+
+  If ``padded`` is ``True``, exactly ``2**level`` digits are appended.
+  """
+  if level <= _LEAF_LEVEL:
+    _uint_to_base_leaf(number, base, base_bytes,
+                       (1 << level) if padded else 0, digits)
+    return
+  level -= 1
+  high, low = divmod(number, tower[level])
+  if high or padded:
+    _uint_to_base_recursive(high, level, padded, base, base_bytes, tower,
+                            digits)
+    padded = True
+  _uint_to_base_recursive(low, level, padded, base, base_bytes, tower, digits)
+
+
 def base_to_uint(encoded,
                  base,
                  ord_lookup_table,
-                 powers):
+                 powers=None):  # pylint: disable-msg=W0613
   """
   Decodes bytes from the given base into a big integer.
 
@@ -101,22 +263,40 @@ def base_to_uint(encoded,
   :param ord_lookup_table:
       The ordinal lookup table to use.
   :param powers:
-      Pre-computed tuple of powers of length ``powers_length``.
+      Unused. Powers of ``base`` are computed lazily and cached per base
+      by the conversion engine. Kept for backward compatibility.
+  :returns:
+      Unsigned integer.
   """
-  # Convert to big integer.
-  #    number = 0
-  #    for i, x in enumerate(reversed(encoded)):
-  #        number += _lookup[x] * (base**i)
-  # Above loop divided into precomputed powers section and computed.
-  number = 0
   length = len(encoded)
-  powers_length = len(powers)
-  for i, char in enumerate(encoded[length:-powers_length - 1:-1]):
-    number += ord_lookup_table[char] * powers[i]
-  for i in range(powers_length, length):
-    char = encoded[length - i - 1]
-    number += ord_lookup_table[char] * (base ** i)
-  return number
+  if length <= _LEAF_DIGITS:
+    # Short inputs need no powers at all.
+    number = 0
+    for char in encoded:
+      number = number * base + ord_lookup_table[char]
+    return number
+  tower = _power_tower(base, builtins.integer_bit_length(length))
+  return _base_to_uint_recursive(encoded, 0, length, base, ord_lookup_table,
+                                 tower)
+
+
+def _base_to_uint_recursive(encoded, start, stop, base, ord_lookup_table,
+                            tower):
+  """Decodes ``encoded[start:stop]`` into an unsigned integer."""
+  length = stop - start
+  if length <= _LEAF_DIGITS:
+    number = 0
+    for char in encoded[start:stop]:
+      number = number * base + ord_lookup_table[char]
+    return number
+  # The lower half is the largest power-of-2 number of digits that still
+  # leaves at least one digit for the higher half.
+  level = builtins.integer_bit_length(length - 1) - 1
+  middle = stop - (1 << level)
+  return (_base_to_uint_recursive(encoded, start, middle, base,
+                                  ord_lookup_table, tower) * tower[level] +
+          _base_to_uint_recursive(encoded, middle, stop, base,
+                                  ord_lookup_table, tower))
 
 
 def uint_to_base256(number, encoded, base_zero):
@@ -129,3 +309,404 @@ def uint_to_base256(number, encoded, base_zero):
   if zero_leading:
     raw_bytes = raw_bytes.rjust(len(raw_bytes) + zero_leading, ZERO_BYTE)
   return raw_bytes
+
+
+def _check_batch(items, name):
+  """Raises ``TypeError`` unless every item in the batch is a buffer."""
+  for item in items:
+    if not builtins.is_buffer(item):
+      raise TypeError("%s must be raw bytes: got %r" %
+                      (name, type(item).__name__))
+
+
+def _map_batch(func, items, args, workers, chunk_size=BATCH_CHUNK_SIZE):
+  """
+  Applies ``func(chunk, *args)`` to ``chunk_size`` slices of ``items``
+  in a pool of worker processes and concatenates the resulting lists.
+
+  Runs in the calling process when ``workers`` is falsy or the batch fits
+  into a single slice.
+  """
+  if not workers or workers < 2 or len(items) <= chunk_size:
+    return func(items, *args)
+  tasks = [(func, items[i:i + chunk_size]) + tuple(args)
+           for i in builtins.range(0, len(items), chunk_size)]
+  pool = multiprocessing.Pool(workers)
+  try:
+    results = pool.map(_apply_batch_task, tasks)
+  finally:
+    pool.close()
+    pool.join()
+  converted = []
+  for result in results:
+    converted.extend(result)
+  return converted
+
+
+def _apply_batch_task(task):
+  """Unpacks a task created by :func:`_map_batch` in a worker process."""
+  return task[0](*task[1:])
+
+
+def base_encode_many(raw_bytes_list, base, base_bytes, base_zero,
+                     padding=True, workers=None):
+  """
+  Encodes a sequence of raw byte strings given a base.
+
+  Equivalent to ``[base_encode(x, ...) for x in raw_bytes_list]`` but
+  much faster for short byte strings.
+
+  :param raw_bytes_list:
+      Sequence of raw bytes to encode.
+  :param base:
+      Unsigned integer base.
+  :param base_bytes:
+      The ASCII bytes used in the encoded string. "Character set" or "alphabet".
+  :param base_zero:
+      The ASCII byte used to represent a leading zero byte.
+  :param padding:
+      ``True`` (default) to prefix one ``base_zero`` for every leading
+      zero byte in each raw byte string.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      List of encoded bytes in the same order.
+  """
+  raw_bytes_list = list(raw_bytes_list)
+  _check_batch(raw_bytes_list, "data")
+  return _map_batch(_base_encode_batch, raw_bytes_list,
+                    (base, tuple(base_bytes), base_zero, padding), workers)
+
+
+def _base_encode_batch(raw_bytes_list, base, base_bytes, base_zero, padding):
+  """Encodes a type-checked batch. See :func:`base_encode_many`."""
+  # Two digits are peeled off per division.
+  base_square = base * base
+  digit_pairs = [high + low for high in base_bytes for low in base_bytes]
+  hexlify = binascii.b2a_hex
+  zero_byte = ZERO_BYTE
+  empty_byte = EMPTY_BYTE
+  long_bytes = _LEAF_DIGITS // 2
+  encoded_list = []
+  append = encoded_list.append
+  for raw_bytes in raw_bytes_list:
+    if not builtins.is_bytes(raw_bytes):
+      raw_bytes = builtins.byte_view(raw_bytes)
+    if len(raw_bytes) > long_bytes:
+      # Long inputs are better served by the divide-and-conquer engine.
+      append(base_encode(raw_bytes, base, base_bytes, base_zero, padding))
+      continue
+    if not builtins.is_bytes(raw_bytes):
+      raw_bytes = builtins.buffer_bytes(raw_bytes)
+    number = int(hexlify(raw_bytes), 16) if raw_bytes else 0
+    digits = []
+    while number >= base_square:
+      number, remainder = divmod(number, base_square)
+      digits.append(digit_pairs[remainder])
+    if number >= base:
+      digits.append(digit_pairs[number])
+    elif number:
+      digits.append(base_bytes[number])
+    if padding:
+      zero_leading = len(raw_bytes) - len(raw_bytes.lstrip(zero_byte))
+      if zero_leading:
+        digits.append(base_zero * zero_leading)
+    digits.reverse()
+    append(empty_byte.join(digits))
+  return encoded_list
+
+
+def base_decode_many(encoded_list, base, base_ords, base_zero, workers=None):
+  """
+  Decodes a sequence of encoded byte strings from the given base to base
+  256. Whitespace is ignored.
+
+  Equivalent to ``[base_decode(x, ...) for x in encoded_list]`` but much
+  faster for short encoded strings.
+
+  :param encoded_list:
+      Sequence of encoded bytes.
+  :param base:
+      Unsigned integer base.
+  :param base_ords:
+      The ordinal lookup table to use.
+  :param base_zero:
+      The ASCII byte used to represent a leading zero byte.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      List of raw bytes in the same order.
+  """
+  encoded_list = list(encoded_list)
+  _check_batch(encoded_list, "encoded data")
+  return _map_batch(_base_decode_batch, encoded_list,
+                    (base, base_ords, base_zero), workers)
+
+
+def _base_decode_batch(encoded_list, base, base_ords, base_zero):
+  """Decodes a type-checked batch. See :func:`base_decode_many`."""
+  table = _digit_table(base_ords)
+  invalid_digit = builtins.byte(_INVALID_DIGIT)
+  unhexlify = binascii.a2b_hex
+  zero_byte = ZERO_BYTE
+  empty_byte = EMPTY_BYTE
+  raw_bytes_list = []
+  append = raw_bytes_list.append
+  for encoded in encoded_list:
+    if not builtins.is_bytes(encoded):
+      encoded = builtins.buffer_bytes(encoded)
+    encoded = empty_byte.join(encoded.split())
+    digits = encoded.translate(table)
+    if len(encoded) > _LEAF_DIGITS or invalid_digit in digits:
+      # Long inputs are better served by the divide-and-conquer engine, which
+      # also raises the appropriate error for invalid characters.
+      append(base_decode(encoded, base, base_ords, base_zero))
+      continue
+    number = 0
+    for digit in bytearray(digits):
+      number = number * base + digit
+    if number:
+      hex_number = "%x" % number
+      if len(hex_number) & 1:
+        hex_number = "0" + hex_number
+      raw_bytes = unhexlify(hex_number)
+    else:
+      raw_bytes = empty_byte
+    zero_leading = len(encoded) - len(encoded.lstrip(base_zero))
+    if zero_leading:
+      raw_bytes = zero_byte * zero_leading + raw_bytes
+    append(raw_bytes)
+  return raw_bytes_list
+
+
+def _digit_table(base_ords):
+  """
+  Builds a ``bytes.translate`` table that maps every character to its digit
+  value, so that the digits can be iterated as small integers on all
+  versions of Python. Bytes outside the character set map to
+  ``_INVALID_DIGIT``.
+  """
+  table = bytearray([_INVALID_DIGIT] * 256)
+  for char, value in base_ords.items():
+    table[builtins.byte_ord(char) if builtins.is_bytes(char) else char] = value
+  return bytes(table)
+
+
+def block_digits(base, size=BLOCK_SIZE):
+  """
+  Returns the number of digits a block of raw bytes is encoded into.
+
+  :param base:
+      Unsigned integer base.
+  :param size:
+      Number of raw bytes in the block.
+  :returns:
+      The fewest digits that can represent any ``size`` bytes.
+  """
+  limit = 1 << (size << 3)
+  power = 1
+  digits = 0
+  while power < limit:
+    power *= base
+    digits += 1
+  return digits
+
+
+def _block_table(base):
+  """
+  Returns the cached block-mode tables for a base.
+
+  :returns:
+      2-tuple ``(lengths, sizes)`` where ``lengths`` maps a block size in
+      bytes to its number of digits and ``sizes`` maps the number of digits
+      of a trailing partial block back to its size.
+  """
+  try:
+    return _BLOCK_TABLES[base]
+  except KeyError:
+    lengths = dict((size, block_digits(base, size))
+                   for size in builtins.range(1, BLOCK_SIZE + 1))
+    sizes = dict((digits, size) for size, digits in lengths.items()
+                 if size < BLOCK_SIZE)
+    _BLOCK_TABLES[base] = lengths, sizes
+    return lengths, sizes
+
+
+def base_encode_blocks(raw_bytes, base, base_bytes, workers=None):
+  """
+  Encodes raw bytes block by block given a base. See "Block mode" above.
+
+  :param raw_bytes:
+      Raw bytes or any buffer to encode.
+  :param base:
+      Unsigned integer base.
+  :param base_bytes:
+      The ASCII bytes used in the encoded string. "Character set" or "alphabet".
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      Encoded bytes.
+  """
+  if not builtins.is_buffer(raw_bytes):
+    raise TypeError("data must be raw bytes: got %r" %
+                    type(raw_bytes).__name__)
+  if not builtins.is_bytes(raw_bytes):
+    raw_bytes = builtins.byte_view(raw_bytes)
+  segment_size = BLOCK_SIZE * _BLOCK_SEGMENT_SIZE
+  segments = [raw_bytes[i:i + segment_size]
+              for i in builtins.range(0, len(raw_bytes), segment_size)]
+  if workers and len(segments) > _BLOCK_TASK_SEGMENTS:
+    # Views cannot be sent to worker processes.
+    segments = [builtins.buffer_bytes(segment) for segment in segments]
+  return EMPTY_BYTE.join(_map_batch(_base_encode_block_segments, segments,
+                                    (base, tuple(base_bytes)), workers,
+                                    _BLOCK_TASK_SEGMENTS))
+
+
+def _base_encode_block_segments(segments, base, base_bytes):
+  """Encodes segments of blocks. See :func:`base_encode_blocks`."""
+  base_square = base * base
+  digit_pairs = [high + low for high in base_bytes for low in base_bytes]
+  block_lengths = _block_table(base)[0]
+  empty_byte = EMPTY_BYTE
+  unpack_from = struct.unpack_from
+  encoded_list = []
+  for segment in segments:
+    count, remainder = divmod(len(segment), BLOCK_SIZE)
+    # Digits are produced least significant first, so the blocks are
+    # visited last to first and the whole segment is reversed once at the end.
+    digits = []
+    append = digits.append
+    if remainder:
+      tail = builtins.buffer_bytes(segment[count * BLOCK_SIZE:])
+      _append_block_digits(append, int(binascii.b2a_hex(tail), 16),
+                           block_lengths[remainder], base_square,
+                           digit_pairs, base_bytes)
+    num_digits = block_lengths[BLOCK_SIZE]
+    pair_range = builtins.range(num_digits >> 1)
+    odd = num_digits & 1
+    for word in reversed(unpack_from(">%dQ" % count, segment)):
+      for _ in pair_range:
+        word, remainder = divmod(word, base_square)
+        append(digit_pairs[remainder])
+      if odd:
+        append(base_bytes[word])
+    digits.reverse()
+    encoded_list.append(empty_byte.join(digits))
+  return encoded_list
+
+
+def _append_block_digits(append, word, num_digits, base_square, digit_pairs,
+                         base_bytes):
+  """Appends the digits of one block, least significant first."""
+  for _ in builtins.range(num_digits >> 1):
+    word, remainder = divmod(word, base_square)
+    append(digit_pairs[remainder])
+  if num_digits & 1:
+    append(base_bytes[word])
+
+
+def base_decode_blocks(encoded, base, base_ords, workers=None):
+  """
+  Decodes block-mode encoded bytes given a base. Whitespace is ignored.
+  See "Block mode" above.
+
+  :param encoded:
+      Encoded bytes or any buffer.
+  :param base:
+      Unsigned integer base.
+  :param base_ords:
+      The ordinal lookup table to use.
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      Raw bytes.
+  :raises:
+      ``ValueError`` if the input contains a character outside the
+      character set, a block that does not fit into its size, or a trailing
+      partial block of impossible length.
+  """
+  if not builtins.is_bytes(encoded):
+    if not builtins.is_buffer(encoded):
+      raise TypeError("encoded data must be bytes: got %r" %
+                      type(encoded).__name__)
+    encoded = builtins.buffer_bytes(encoded)
+  encoded = EMPTY_BYTE.join(encoded.split())
+  block_lengths, block_sizes = _block_table(base)
+  full_digits = block_lengths[BLOCK_SIZE]
+  remainder = len(encoded) % full_digits
+  if remainder and remainder not in block_sizes:
+    raise ValueError("Invalid partial block length %d at index %d" %
+                     (remainder, len(encoded) - remainder))
+  segment_size = full_digits * _BLOCK_SEGMENT_SIZE
+  segments = [(i, encoded[i:i + segment_size])
+              for i in builtins.range(0, len(encoded), segment_size)]
+  return EMPTY_BYTE.join(_map_batch(_base_decode_block_segments, segments,
+                                    (base, base_ords), workers,
+                                    _BLOCK_TASK_SEGMENTS))
+
+
+def _base_decode_block_segments(segments, base, base_ords):
+  """Decodes ``(offset, segment)`` pairs. See :func:`base_decode_blocks`."""
+  table = _digit_table(base_ords)
+  invalid_digit = builtins.byte(_INVALID_DIGIT)
+  block_lengths, block_sizes = _block_table(base)
+  full_digits = block_lengths[BLOCK_SIZE]
+  raw_bytes_list = []
+  for offset, segment in segments:
+    digits = segment.translate(table)
+    if invalid_digit in digits:
+      index = digits.index(invalid_digit)
+      raise ValueError("Invalid character %r at index %d" %
+                       (segment[index:index + 1], offset + index))
+    count, remainder = divmod(len(digits), full_digits)
+    raw_bytes = _decode_full_blocks(digits, count, base, full_digits, offset)
+    if remainder:
+      tail = 0
+      for digit in bytearray(digits[count * full_digits:]):
+        tail = tail * base + digit
+      tail_size = block_sizes[remainder]
+      if tail >> (tail_size << 3):
+        raise ValueError("Cannot decode block at index %d" %
+                         (offset + count * full_digits))
+      raw_bytes += integer.uint_to_bytes(tail, fill_size=tail_size)
+    raw_bytes_list.append(raw_bytes)
+  return raw_bytes_list
+
+
+def _decode_full_blocks(digits, count, base, full_digits, offset):
+  """
+  Decodes ``count`` full blocks of digit values all at once.
+
+  Every block is given its own fixed-width lane in one big integer and
+  Horner's rule is applied to all the lanes together: multiplying by the
+  base and adding the next digit of every block cannot carry into the
+  neighbouring lane because a block never exceeds ``base**full_digits``.
+  This trades ``count * full_digits`` small multiplications in Python for
+  ``full_digits`` big ones.
+  """
+  if not count:
+    return EMPTY_BYTE
+  lane = builtins.integer_byte_length(base ** full_digits - 1)
+  spare = lane - BLOCK_SIZE
+  lanes = bytearray(count * lane)
+  number = 0
+  for position in builtins.range(full_digits):
+    lanes[lane - 1::lane] = digits[position:count * full_digits:full_digits]
+    number = number * base + integer.bytes_to_uint(lanes)
+  lanes = integer.uint_to_bytes(number, fill_size=count * lane)
+  # Blocks that decode to 2**64 or more leave bits in the spare bytes.
+  for position in builtins.range(spare):
+    high = lanes[position::lane]
+    nonzero = len(high) - len(high.lstrip(ZERO_BYTE))
+    if nonzero < count:
+      raise ValueError("Cannot decode block at index %d" %
+                       (offset + nonzero * full_digits))
+  raw_bytes = bytearray(count * BLOCK_SIZE)
+  for position in builtins.range(BLOCK_SIZE):
+    raw_bytes[position::BLOCK_SIZE] = lanes[spare + position::lane]
+  return bytes(raw_bytes)
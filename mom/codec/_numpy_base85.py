@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""NumPy-based base85 chunk codecs.
+
+Instead of looping over every 32-bit word in Python, all the words are
+divided at once: each of the five digit planes is one array division,
+one array modulo, and one gather through the character set.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import struct
+
+from mom import _compat
+from mom import builtins
+
+
+__author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
+
+
+try:
+  import numpy
+
+  HAVE_NUMPY = True
+except ImportError:
+  numpy = None
+  HAVE_NUMPY = False
+
+
+ZERO_BYTE = _compat.ZERO_BYTE
+UINT32_MAX = _compat.UINT32_MAX
+
+# Marks characters that are not part of a character set in decoding tables.
+_INVALID_ORD = 0xff
+
+
+if HAVE_NUMPY:
+
+  def _charset_array(base85_bytes):
+    """Returns the character set (an ``array.array("B")``) as a NumPy
+    array of uint8 ordinals."""
+    return numpy.asarray(base85_bytes, dtype=numpy.uint8)
+
+  def b85encode_chunks(raw_bytes, base85_bytes, padding=False):
+    """Base85 encodes processing all 32-bit chunks at once.
+
+    :param raw_bytes:
+        Raw bytes.
+    :param base85_bytes:
+        Character set to use.
+    :param padding:
+        ``True`` if padding should be included; ``False`` (default)
+        otherwise.
+    :returns:
+        Base-85 encoded bytes.
+    """
+    num_words, remainder = divmod(len(raw_bytes), 4)
+    words = numpy.empty(num_words + bool(remainder), dtype=numpy.uint32)
+    # ASCII85 uses a big-endian convention. Reads the buffer in place; only
+    # the trailing partial group is copied.
+    words[:num_words] = numpy.frombuffer(raw_bytes, dtype=">u4",
+                                         count=num_words)
+    if remainder:
+      padding_size = 4 - remainder
+      tail = builtins.buffer_bytes(raw_bytes[-remainder:])
+      words[num_words] = struct.unpack(">L", tail + ZERO_BYTE * padding_size)[0]
+    else:
+      padding_size = 0
+
+    charset = _charset_array(base85_bytes)
+    encoded = numpy.empty((len(words), 5), dtype=numpy.uint8)
+    for i in (4, 3, 2, 1):
+      words, digits = numpy.divmod(words, 85)
+      encoded[:, i] = charset[digits]
+    # Don't need %85. Already < 85.
+    encoded[:, 0] = charset[words]
+
+    encoded = encoded.tobytes()
+    if padding_size and not padding:
+      # Only as much padding added before encoding is removed after encoding.
+      encoded = encoded[:-padding_size]
+    return encoded
+
+  def b85decode_chunks(encoded, base85_bytes, unused_base85_ords=None,
+                       offset=0):
+    """Base-85 decodes processing all 5-character chunks at once.
+
+    :param encoded:
+        Encoded ASCII string.
+    :param base85_bytes:
+        Character set to use.
+    :param offset:
+        Index of ``encoded`` within the whole encoded input. Used only in
+        error messages.
+    :returns:
+        Base-85-decoded raw bytes.
+    :raises:
+        ``OverflowError`` if a chunk contains a character outside the
+        character set or decodes to a value greater than 2**32 - 1.
+    """
+    # We want 5-tuple chunks, so pad with as many base85_ord == 84 characters
+    # as required to satisfy the length.
+    remainder = len(encoded) % 5
+    if remainder:
+      padding_size = 5 - remainder
+      encoded += builtins.byte(base85_bytes[84]) * padding_size
+    else:
+      padding_size = 0
+
+    charset = _charset_array(base85_bytes)
+    ords = numpy.empty(256, dtype=numpy.uint8)
+    ords.fill(_INVALID_ORD)
+    ords[charset] = numpy.arange(85, dtype=numpy.uint8)
+
+    digits = ords[numpy.frombuffer(encoded, dtype=numpy.uint8)].reshape(-1, 5)
+    invalid = (digits == _INVALID_ORD).any(axis=1)
+    words = digits[:, 0].astype(numpy.uint64)
+    for i in (1, 2, 3, 4):
+      words *= 85
+      words += digits[:, i]
+    # Groups of characters that decode to a value greater than 2**32 − 1
+    # (encoded as "s8W-!") will cause a decoding error. Bad byte?
+    invalid |= words > UINT32_MAX
+    if invalid.any():
+      i = int(numpy.argmax(invalid)) * 5
+      raise OverflowError("Cannot decode chunk `%r` at index %d" %
+                          (encoded[i:i + 5], offset + i))
+
+    raw_bytes = words.astype(">u4").tobytes()
+    if padding_size:
+      # Only as much padding added before decoding is removed after decoding.
+      raw_bytes = raw_bytes[:-padding_size]
+    return raw_bytes
@@ -44,12 +44,14 @@ from mom.codec import _base
 __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
 
 
-EMPTY_BYTE = _compat.EMPTY_BYTE
-
 # Follows ASCII order.
 ASCII36_BYTES = (string.DIGITS +
                  string.ASCII_UPPERCASE).encode("ascii")
 # Therefore, b"1" represents b"\0".
+# Decoding is case-insensitive, so lowercase letters map to the same values.
+ASCII36_ORDS = dict((x, i) for i, x in enumerate(ASCII36_BYTES))
+ASCII36_ORDS.update((x, i) for i, x in
+                    enumerate(ASCII36_BYTES.lower()) if x not in ASCII36_ORDS)
 if _compat.HAVE_PYTHON3:
   ASCII36_BYTES = tuple(builtins.byte(x) for x in ASCII36_BYTES)
 
@@ -73,7 +75,7 @@ def b36encode(raw_bytes, base_bytes=ASCII36_BYTES, _padding=True):
   return _base.base_encode(raw_bytes, 36, base_bytes, base_bytes[0], _padding)
 
 
-def b36decode(encoded, base_bytes=ASCII36_BYTES):
+def b36decode(encoded, base_bytes=ASCII36_BYTES, base_ords=ASCII36_ORDS):
   """
   Base-36 decodes a sequence of bytes into raw bytes.
 
@@ -86,9 +88,10 @@ def b36decode(encoded, base_bytes=ASCII36_BYTES):
   :param base_bytes:
       (Internal) The character set to use. Defaults to ``ASCII36_BYTES``
       that uses natural ASCII order.
+  :param base_ords:
+      (Internal) Ordinal-to-character lookup table for the specified
+      character set.
   :returns:
       Raw bytes.
   """
-  # Ignore whitespace.
-  encoded = EMPTY_BYTE.join(encoded.split())
-  return _base.uint_to_base256(int(encoded, 36), encoded, base_bytes[0])
+  return _base.base_decode(encoded, 36, base_ords, base_bytes[0])
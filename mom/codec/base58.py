@@ -64,6 +64,10 @@ Functions
 ---------
 .. autofunction:: b58encode
 .. autofunction:: b58decode
+.. autofunction:: b58encode_many
+.. autofunction:: b58decode_many
+.. autofunction:: b58encode_blocks
+.. autofunction:: b58decode_blocks
 """
 
 from __future__ import absolute_import
@@ -109,13 +113,6 @@ if _compat.HAVE_PYTHON3:
   ASCII58_BYTES = tuple(builtins.byte(x) for x in ASCII58_BYTES)
   ALT58_BYTES = tuple(builtins.byte(x) for x in ALT58_BYTES)
 
-# If you're going to make people type stuff longer than this length
-# I don't know what to tell you. Beyond this length powers
-# are computed, so be careful if you care about computation speed.
-# I think this is a VERY generous range. Decoding bytes fewer than 512
-# will use this pre-computed lookup table, and hence, be faster.
-POW_58 = tuple(58 ** power for power in builtins.range(512))
-
 
 def b58encode(raw_bytes,
               base_bytes=ASCII58_BYTES, _padding=True):
@@ -156,4 +153,111 @@ def b58decode(encoded,
   """
   # Zero byte is represented using the first character in the character set.
   # Adds zero byte prefix padding if required.
-  return _base.base_decode(encoded, 58, base_ords, base_bytes[0], POW_58)
+  return _base.base_decode(encoded, 58, base_ords, base_bytes[0])
+
+
+def b58encode_many(raw_bytes_list,
+                   base_bytes=ASCII58_BYTES, _padding=True, workers=None):
+  """
+  Base58 encodes a sequence of raw byte strings. Zero-byte sequences are
+  preserved by default.
+
+  Much faster than calling :func:`b58encode` for every item when
+  encoding many short byte strings such as identifiers.
+
+  :param raw_bytes_list:
+      Sequence of raw bytes to encode.
+  :param base_bytes:
+      The character set to use. Defaults to ``ASCII58_BYTES``
+      that uses natural ASCII order.
+  :param _padding:
+      (Internal) ``True`` (default) to include prefixed zero-byte sequence
+      padding converted to appropriate representation.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      List of base-58 encoded bytes in the same order.
+  """
+  return _base.base_encode_many(raw_bytes_list, 58, base_bytes,
+                                base_bytes[0], _padding, workers)
+
+
+def b58decode_many(encoded_list,
+                   base_bytes=ASCII58_BYTES,
+                   base_ords=ASCII58_ORDS,
+                   workers=None):
+  """
+  Base-58 decodes a sequence of byte strings into raw bytes. Whitespace
+  is ignored.
+
+  Much faster than calling :func:`b58decode` for every item when
+  decoding many short byte strings such as identifiers.
+
+  :param encoded_list:
+      Sequence of base-58 encoded bytes.
+  :param base_bytes:
+      (Internal) The character set to use. Defaults to ``ASCII58_BYTES``
+      that uses natural ASCII order.
+  :param base_ords:
+      (Internal) Ordinal-to-character lookup table for the specified
+      character set.
+  :param workers:
+      Number of worker processes to spread large batches over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      List of raw bytes in the same order.
+  """
+  return _base.base_decode_many(encoded_list, 58, base_ords, base_bytes[0],
+                                workers)
+
+
+def b58encode_blocks(raw_bytes, base_bytes=ASCII58_BYTES, workers=None):
+  """
+  Base58 encodes raw bytes in block mode: every 8 bytes become 11
+  characters, independently of the rest of the input.
+
+  Runs in linear time and can be applied a chunk at a time, but the output
+  differs from :func:`b58encode` and must be decoded with
+  :func:`b58decode_blocks`. See :mod:`mom.codec._base` for the format.
+
+  :param raw_bytes:
+      Raw bytes to encode.
+  :param base_bytes:
+      The character set to use. Defaults to ``ASCII58_BYTES``
+      that uses natural ASCII order.
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) encodes in the calling process.
+  :returns:
+      Block-mode base-58 encoded bytes.
+  """
+  return _base.base_encode_blocks(raw_bytes, 58, base_bytes, workers)
+
+
+def b58decode_blocks(encoded,
+                    base_bytes=ASCII58_BYTES,
+                    base_ords=ASCII58_ORDS,
+                    workers=None):
+  """
+  Decodes block-mode base-58 encoded bytes into raw bytes. Whitespace
+  is ignored.
+
+  :param encoded:
+      Block-mode base-58 encoded bytes.
+  :param base_bytes:
+      (Internal) The character set to use. Defaults to ``ASCII58_BYTES``
+      that uses natural ASCII order.
+  :param base_ords:
+      (Internal) Ordinal-to-character lookup table for the specified
+      character set.
+  :param workers:
+      Number of worker processes to spread large inputs over. ``None``
+      (default) decodes in the calling process.
+  :returns:
+      Raw bytes.
+  :raises:
+      ``ValueError`` if the input is not valid block-mode base-58.
+  """
+  # pylint: disable-msg=W0613
+  return _base.base_decode_blocks(encoded, 58, base_ords, workers)
@@ -57,6 +57,10 @@ base-85 uses a lot of tricks to reduce computation time and is hence
 generally faster than many other implementations. If computation speed
 is a concern for you, please contribute a C implementation or wait for one.
 
+If NumPy is installed, larger inputs are encoded and decoded with
+vectorized array arithmetic instead of a Python loop over every 32-bit
+group. The pure-Python implementation is used otherwise.
+
 Functions
 ---------
 .. autofunction:: b85encode
@@ -65,6 +69,30 @@ Functions
 .. autofunction:: rfc1924_b85decode
 .. autofunction:: ipv6_b85encode
 .. autofunction:: ipv6_b85decode
+
+Streaming
+---------
+The encoder and decoder objects below convert data piecemeal, carrying a
+partial 4-byte (or 5-character) group over from one call to the next, so
+that arbitrarily large streams can be processed in constant memory::
+
+    encoder = B85Encoder()
+    for chunk in chunks:
+      output.write(encoder.update(chunk))
+    output.write(encoder.finalize())
+
+The concatenated output is identical to that of the one-shot functions.
+
+.. autoclass:: B85Encoder
+   :members:
+.. autoclass:: B85Decoder
+   :members:
+.. autoclass:: RFC1924B85Encoder
+.. autoclass:: RFC1924B85Decoder
+.. autofunction:: b85encode_stream
+.. autofunction:: b85decode_stream
+.. autofunction:: rfc1924_b85encode_stream
+.. autofunction:: rfc1924_b85decode_stream
 """
 
 from __future__ import absolute_import
@@ -80,21 +108,37 @@ except ImportError:  #pragma: no cover
 # pylint: enable-msg=R0801
 
 import array
+import re
 import struct
 
 from mom import _compat
 from mom import builtins
 from mom import string
 
+try:
+  from mom.codec._numpy_base85 import b85decode_chunks as _numpy_b85decode_chunks
+  from mom.codec._numpy_base85 import b85encode_chunks as _numpy_b85encode_chunks
+except ImportError:  # pragma: no cover
+  _numpy_b85decode_chunks = None
+  _numpy_b85encode_chunks = None
+
 
 __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
 
 
 __all__ = [
+    "B85Decoder",
+    "B85Encoder",
+    "RFC1924B85Decoder",
+    "RFC1924B85Encoder",
     "b85encode",
     "b85decode",
+    "b85decode_stream",
+    "b85encode_stream",
     "rfc1924_b85encode",
     "rfc1924_b85decode",
+    "rfc1924_b85decode_stream",
+    "rfc1924_b85encode_stream",
     "ASCII85_PREFIX",
     "ASCII85_SUFFIX",
     "ipv6_b85encode",
@@ -110,6 +154,18 @@ EMPTY_BYTE = _compat.EMPTY_BYTE
 
 EXCLAMATION_CHUNK = b("!!!!!")
 ZERO_GROUP_CHAR = b("z")
+ZERO_GROUP = ZERO_BYTE * 4
+ZERO_GROUP_PATTERN = re.compile(re.escape(ZERO_GROUP))
+# Characters ignored when decoding; the same set ``bytes.split()`` splits on.
+WHITESPACE_BYTES = b(" \t\n\r\x0b\x0c")
+
+# Inputs shorter than this many bytes are faster to convert in pure Python
+# than to hand over to NumPy.
+NUMPY_MIN_BYTES = 256
+
+# Number of raw bytes read at a time by the streaming helpers. A multiple
+# of 4 so that no partial groups need to be carried between reads.
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
 
 # Use this if you want the base85 codec to encode/decode including
 # ASCII85 prefixes/suffixes.
@@ -207,11 +263,101 @@ def _check_compact_char_occurrence(encoded, zero_char, chunk_size=5):
       counter += 1
 
 
-def _b85encode_chunks(raw_bytes,
-                      base85_bytes,
-                      padding=False,
-                      pow_85=POW_85,
-                      zero_byte=ZERO_BYTE):
+def _b85encode_chunks(raw_bytes, base85_bytes, padding=False):
+  """Base85 encodes processing 32-bit chunks at a time.
+
+  Uses the NumPy-vectorized implementation for large inputs when available.
+
+  :param raw_bytes:
+      Raw bytes.
+  :param base85_bytes:
+      Character set to use.
+  :param padding:
+      ``True`` if padding should be included; ``False`` (default)
+      otherwise.
+  :returns:
+      Base-85 encoded bytes.
+  """
+  if _numpy_b85encode_chunks and len(raw_bytes) >= NUMPY_MIN_BYTES:
+    return _numpy_b85encode_chunks(raw_bytes, base85_bytes, padding)
+  return _pure_b85encode_chunks(raw_bytes, base85_bytes, padding)
+
+
+def _b85decode_chunks(encoded, base85_bytes, base85_ords, offset=0):
+  """Base-85 decodes.
+
+  Uses the NumPy-vectorized implementation for large inputs when available.
+
+  :param encoded:
+      Encoded ASCII string.
+  :param base85_bytes:
+      Character set to use.
+  :param base85_ords:
+      A function to convert a base85 character to its ordinal
+      value. You should not need to use this.
+  :param offset:
+      Index of ``encoded`` within the whole encoded input. Used only in
+      error messages.
+  :returns:
+      Base-85-decoded raw bytes.
+  """
+  if _numpy_b85decode_chunks and len(encoded) >= NUMPY_MIN_BYTES:
+    return _numpy_b85decode_chunks(encoded, base85_bytes, base85_ords, offset)
+  return _pure_b85decode_chunks(encoded, base85_bytes, base85_ords, offset)
+
+
+def _b85decode_compact(encoded, base85_bytes, base85_ords, compact_char,
+                       offset=0):
+  """Base-85 decodes expanding compact zero-groups on the way.
+
+  Runs of ``compact_char`` are located in a single scan; the stretches of
+  ordinary groups between them are decoded in place and each compact
+  character contributes four zero bytes directly. Unlike replacing every
+  "z" with "!!!!!" first, this neither expands the encoded input nor
+  decodes the zero groups, and a misplaced compact character is reported
+  by the same scan.
+
+  :param encoded:
+      Whitespace-free encoded ASCII string.
+  :param base85_bytes:
+      Character set to use.
+  :param base85_ords:
+      A function to convert a base85 character to its ordinal
+      value. You should not need to use this.
+  :param compact_char:
+      Character used to represent compact groups.
+  :param offset:
+      Index of ``encoded`` within the whole encoded input. Used only in
+      error messages.
+  :returns:
+      Base-85-decoded raw bytes.
+  :raises:
+      ``ValueError`` if a compact character occurs in the middle of a
+      chunk. ``OverflowError`` if a chunk cannot be decoded.
+  """
+  decoded = []
+  start = 0
+  for match in re.finditer(re.escape(compact_char) + b("+"), encoded):
+    index = match.start()
+    if (index - start) % 5:
+      raise ValueError("zero char `%r` occurs in the middle of a chunk "
+                       "at index %d" % (compact_char, offset + index))
+    if index > start:
+      decoded.append(_b85decode_chunks(encoded[start:index], base85_bytes,
+                                       base85_ords, offset + start))
+    decoded.append(ZERO_GROUP * (match.end() - index))
+    start = match.end()
+  if start < len(encoded):
+    decoded.append(_b85decode_chunks(encoded[start:], base85_bytes,
+                                     base85_ords, offset + start))
+  return EMPTY_BYTE.join(decoded)
+
+
+def _pure_b85encode_chunks(raw_bytes,
+                           base85_bytes,
+                           padding=False,
+                           pow_85=POW_85,
+                           zero_byte=ZERO_BYTE):
   """Base85 encodes processing 32-bit chunks at a time.
 
   :param raw_bytes:
@@ -235,21 +381,24 @@ def _b85encode_chunks(raw_bytes,
   # Ensures length by appending additional padding zero bytes if required.
   # ceil_div(length, 4).
   num_uint32, remainder = divmod(len(raw_bytes), 4)
+  # ASCII85 uses a big-endian convention.
+  # See: http://en.wikipedia.org/wiki/Ascii85
+  # Reads the buffer in place; only the trailing partial group is copied.
+  uint32s = struct.unpack_from(">%dL" % num_uint32, raw_bytes)
   if remainder:
     # If we have a remainder, upto 3 padding bytes are added,
     # which means in the encoded output sans-padding, the final 5-tuple
     # chunk will have at least 2 characters.
     padding_size = 4 - remainder
-    raw_bytes += zero_byte * padding_size
+    tail = builtins.buffer_bytes(raw_bytes[-remainder:])
+    uint32s += struct.unpack(">L", tail + zero_byte * padding_size)
     num_uint32 += 1
   else:
     padding_size = 0
 
   encoded = array.array("B", [0] * num_uint32 * 5)
-  # ASCII85 uses a big-endian convention.
-  # See: http://en.wikipedia.org/wiki/Ascii85
   i = 0
-  for uint32 in struct.unpack(">" + "L" * num_uint32, raw_bytes):
+  for uint32 in uint32s:
   #        chars = list(builtins.range(5))
   #        for i in reversed(chars):
   #            x, mod = divmod(x, 85)
@@ -267,13 +416,68 @@ def _b85encode_chunks(raw_bytes,
     # Only as much padding added before encoding is removed after encoding.
     encoded = encoded[:-padding_size]
 
-  # In Python 3, this method is deprecated, but as long as we are
-  # supporting Python 2.5, we need to use this. Python 3.x names it
-  # ``tobytes()``.
-  return encoded.tostring()
+  # Python 2.x calls it ``tostring()``, Python 3.x ``tobytes()``.
+  return _compat.array_tobytes(encoded)
+
+
+def _b85encode_compact(raw_bytes,
+                       base85_bytes,
+                       compact_char,
+                       padding=False,
+                       zero_group=ZERO_GROUP,
+                       zero_group_pattern=ZERO_GROUP_PATTERN):
+  """Base85 encodes like :func:`_b85encode_chunks` but represents every
+  4-byte aligned zero-group as ``compact_char``.
+
+  The zero-groups are located in the raw bytes rather than by searching
+  the encoded output for "!!!!!", which could straddle two groups.
+
+  :param raw_bytes:
+      Raw bytes.
+  :param base85_bytes:
+      Character set to use.
+  :param compact_char:
+      Character used to represent compact groups.
+  :param padding:
+      ``True`` if padding should be included; ``False`` (default)
+      otherwise.
+  :param zero_group:
+      Four zero bytes.
+  :param zero_group_pattern:
+      Compiled regular expression matching ``zero_group``.
+  :returns:
+      Base-85 encoded bytes.
+  """
+  remainder = len(raw_bytes) % 4
+  if padding and remainder:
+    # The padded final group is a full group and may be compacted too.
+    raw_bytes = (builtins.buffer_bytes(raw_bytes) +
+                 ZERO_BYTE * (4 - remainder))
+  # Regular expressions search any buffer in place, unlike memoryview,
+  # which has no find().
+  search = zero_group_pattern.search
+  encoded = []
+  start = 0
+  match = search(raw_bytes)
+  while match:
+    index = match.start()
+    # Round up to the next group boundary.
+    aligned = index + (-index % 4)
+    if raw_bytes[aligned:aligned + 4] == zero_group:
+      if aligned > start:
+        encoded.append(_b85encode_chunks(raw_bytes[start:aligned],
+                                         base85_bytes))
+      encoded.append(compact_char)
+      start = aligned + 4
+      match = search(raw_bytes, start)
+    else:
+      match = search(raw_bytes, index + 1)
+  if start < len(raw_bytes):
+    encoded.append(_b85encode_chunks(raw_bytes[start:], base85_bytes))
+  return EMPTY_BYTE.join(encoded)
 
 
-def _b85decode_chunks(encoded, base85_bytes, base85_ords):
+def _pure_b85decode_chunks(encoded, base85_bytes, base85_ords, offset=0):
   """Base-85 decodes.
 
   :param encoded:
@@ -283,6 +487,9 @@ def _b85decode_chunks(encoded, base85_bytes, base85_ords):
   :param base85_ords:
       A function to convert a base85 character to its ordinal
       value. You should not need to use this.
+  :param offset:
+      Index of ``encoded`` within the whole encoded input. Used only in
+      error messages.
   :returns:
       Base-85-decoded raw bytes.
   """
@@ -326,12 +533,14 @@ def _b85decode_chunks(encoded, base85_bytes, base85_ords):
       # Groups of characters that decode to a value greater than 2**32 − 1
       # (encoded as "s8W-!") will cause a decoding error. Bad byte?
       if uint32_value > UINT32_MAX:  # 2**32 - 1
-        raise OverflowError("Cannot decode chunk `%r`" % chunk)
+        raise OverflowError("Cannot decode chunk `%r` at index %d" %
+                            (chunk, offset + i))
 
       uint32s[j] = uint32_value
       j += 1
   except KeyError:
-    raise OverflowError("Cannot decode chunk `%r`" % chunk)
+    raise OverflowError("Cannot decode chunk `%r` at index %d" %
+                        (chunk, offset + i))
 
   raw_bytes = struct.pack(">" + "L" * num_uint32s, *uint32s)
   if padding_size:
@@ -390,13 +599,17 @@ def b85encode(raw_bytes,
     raise TypeError("compat character must be raw byte: got %r" %
                     type(_compact_char).__name__)
   if not builtins.is_bytes(raw_bytes):
-    raise TypeError("data must be raw bytes: got %r" %
-                    type(raw_bytes).__name__)
+    if not builtins.is_buffer(raw_bytes):
+      raise TypeError("data must be raw bytes: got %r" %
+                      type(raw_bytes).__name__)
+    raw_bytes = builtins.byte_view(raw_bytes)
 
   # Encode into ASCII85 characters.
-  encoded = _b85encode_chunks(raw_bytes, _base85_bytes, _padding)
-  encoded = (encoded.replace(EXCLAMATION_CHUNK, _compact_char)
-             if _compact_zero else encoded)
+  if _compact_zero:
+    encoded = _b85encode_compact(raw_bytes, _base85_bytes, _compact_char,
+                                 _padding)
+  else:
+    encoded = _b85encode_chunks(raw_bytes, _base85_bytes, _padding)
   return prefix + encoded + suffix
 
 
@@ -438,24 +651,29 @@ def b85decode(encoded,
     raise TypeError("compat character must be raw byte: got %r" %
                     type(_compact_char).__name__)
   if not builtins.is_bytes(encoded):
-    raise TypeError("Encoded sequence must be bytes: got %r" %
-                    type(encoded).__name__)
+    if not builtins.is_buffer(encoded):
+      raise TypeError("Encoded sequence must be bytes: got %r" %
+                      type(encoded).__name__)
+    encoded = builtins.buffer_bytes(encoded)
 
-  # ASCII-85 ignores whitespace.
-  encoded = EMPTY_BYTE.join(encoded.split())
+  # ASCII-85 ignores whitespace. Error positions refer to the input with
+  # whitespace removed.
+  encoded = encoded.translate(None, WHITESPACE_BYTES)
 
   # Strip the prefix and suffix.
+  offset = 0
   if prefix and encoded.startswith(prefix):
-    encoded = encoded[len(prefix):]
-  if suffix and encoded.endswith(suffix):
-    encoded = encoded[:-len(suffix)]
+    offset = len(prefix)
+  stop = len(encoded)
+  if suffix and encoded.endswith(suffix) and stop - len(suffix) >= offset:
+    stop -= len(suffix)
+  if offset or stop < len(encoded):
+    encoded = encoded[offset:stop]
 
-  # Replace all the "z" occurrences with "!!!!!"
   if _uncompact_zero:
-    _check_compact_char_occurrence(encoded, _compact_char)
-    encoded = encoded.replace(_compact_char, EXCLAMATION_CHUNK)
-
-  return _b85decode_chunks(encoded, _base85_bytes, _base85_ords)
+    return _b85decode_compact(encoded, _base85_bytes, _base85_ords,
+                              _compact_char, offset)
+  return _b85decode_chunks(encoded, _base85_bytes, _base85_ords, offset)
 
 
 def rfc1924_b85encode(raw_bytes,
@@ -484,8 +702,10 @@ def rfc1924_b85encode(raw_bytes,
       RFC1924 base85 encoded string.
   """
   if not builtins.is_bytes(raw_bytes):
-    raise TypeError("data must be raw bytes: got %r" %
-                    type(raw_bytes).__name__)
+    if not builtins.is_buffer(raw_bytes):
+      raise TypeError("data must be raw bytes: got %r" %
+                      type(raw_bytes).__name__)
+    raw_bytes = builtins.byte_view(raw_bytes)
   return _b85encode_chunks(raw_bytes, RFC1924_BYTES, _padding)
 
 
@@ -503,13 +723,358 @@ def rfc1924_b85decode(encoded):
       Decoded bytes.
   """
   if not builtins.is_bytes(encoded):
-    raise TypeError("Encoded sequence must be bytes: got %r" %
-                    type(encoded).__name__)
-    # Ignore whitespace.
+    if not builtins.is_buffer(encoded):
+      raise TypeError("Encoded sequence must be bytes: got %r" %
+                      type(encoded).__name__)
+    encoded = builtins.buffer_bytes(encoded)
+  # Ignore whitespace.
   encoded = EMPTY_BYTE.join(encoded.split())
   return _b85decode_chunks(encoded, RFC1924_BYTES, RFC1924_ORDS)
 
 
+class B85Encoder(object):
+  """Incremental ASCII-85 encoder.
+
+  Feed raw bytes with :meth:`update` as they become available and call
+  :meth:`finalize` once at the end. Only the (at most 3) bytes of a
+  trailing partial group are buffered between calls.
+
+  :param prefix:
+      The prefix used by the encoded text. None by default.
+  :param suffix:
+      The suffix used by the encoded text. None by default.
+  :param _base85_bytes:
+      (Internal) Character set to use.
+  :param _compact_zero:
+      (Internal) Encodes a zero-group (\x00\x00\x00\x00) as "z" instead of
+      "!!!!!" if this is ``True`` (default).
+  :param _compact_char:
+      (Internal) Character used to represent compact groups ("z" default)
+  """
+
+  def __init__(self,
+               prefix=None,
+               suffix=None,
+               _base85_bytes=ASCII85_BYTES,
+               _compact_zero=True,
+               _compact_char=ZERO_GROUP_CHAR):
+    prefix = prefix or EMPTY_BYTE
+    suffix = suffix or EMPTY_BYTE
+    if not (builtins.is_bytes(prefix) and builtins.is_bytes(suffix)):
+      raise TypeError("Prefix/suffix must be bytes: got prefix %r, %r" %
+                      (type(prefix).__name__, type(suffix).__name__))
+    if not builtins.is_bytes(_compact_char):
+      raise TypeError("compat character must be raw byte: got %r" %
+                      type(_compact_char).__name__)
+    self._prefix = prefix
+    self._suffix = suffix
+    self._base85_bytes = _base85_bytes
+    self._compact_char = _compact_char if _compact_zero else None
+    self._pending = EMPTY_BYTE
+    self._finalized = False
+
+  def _encode(self, raw_bytes):
+    """Encodes raw bytes without padding."""
+    if not raw_bytes:
+      return EMPTY_BYTE
+    if self._compact_char:
+      return _b85encode_compact(raw_bytes, self._base85_bytes,
+                                self._compact_char)
+    return _b85encode_chunks(raw_bytes, self._base85_bytes)
+
+  def _take_prefix(self):
+    """Returns the prefix the first time it is called; empty bytes after."""
+    prefix, self._prefix = self._prefix, EMPTY_BYTE
+    return prefix
+
+  def update(self, raw_bytes):
+    """Encodes the next piece of the input.
+
+    :param raw_bytes:
+        Raw bytes.
+    :returns:
+        ASCII-85 encoded bytes for all the complete groups available so far.
+    """
+    if self._finalized:
+      raise ValueError("encoder has already been finalized")
+    if not builtins.is_bytes(raw_bytes):
+      if not builtins.is_buffer(raw_bytes):
+        raise TypeError("data must be raw bytes: got %r" %
+                        type(raw_bytes).__name__)
+      raw_bytes = builtins.byte_view(raw_bytes)
+    encoded = self._take_prefix()
+    if self._pending:
+      # Completes the pending group without copying the rest of the input.
+      fill = 4 - len(self._pending)
+      group = self._pending + builtins.buffer_bytes(raw_bytes[:fill])
+      raw_bytes = raw_bytes[fill:]
+      if len(group) < 4:
+        self._pending = group
+        return encoded
+      self._pending = EMPTY_BYTE
+      encoded += self._encode(group)
+    cut = len(raw_bytes) - (len(raw_bytes) % 4)
+    # The caller may reuse its buffer, so the remainder is copied.
+    self._pending = builtins.buffer_bytes(raw_bytes[cut:])
+    return encoded + self._encode(raw_bytes[:cut])
+
+  def finalize(self):
+    """Encodes the trailing partial group, if any.
+
+    The encoder cannot be used after it has been finalized.
+
+    :returns:
+        The remaining ASCII-85 encoded bytes, followed by the suffix.
+    """
+    if self._finalized:
+      raise ValueError("encoder has already been finalized")
+    self._finalized = True
+    pending, self._pending = self._pending, EMPTY_BYTE
+    return self._take_prefix() + self._encode(pending) + self._suffix
+
+
+class B85Decoder(object):
+  """Incremental ASCII-85 decoder.
+
+  Feed encoded bytes with :meth:`update` as they become available and call
+  :meth:`finalize` once at the end. Whitespace is ignored. Only a trailing
+  partial group (and as many characters as could make up the suffix) is
+  buffered between calls.
+
+  :param prefix:
+      The prefix used by the encoded text. None by default.
+  :param suffix:
+      The suffix used by the encoded text. None by default.
+  :param _base85_bytes:
+      (Internal) Character set to use.
+  :param _base85_ords:
+      (Internal) A function to convert a base85 character to its ordinal
+      value. You should not need to use this.
+  :param _uncompact_zero:
+      (Internal) Treats "z" (a zero-group (\x00\x00\x00\x00)) as a "!!!!!"
+      if ``True`` (default).
+  :param _compact_char:
+      (Internal) Character used to represent compact groups ("z" default)
+  """
+
+  def __init__(self,
+               prefix=None,
+               suffix=None,
+               _base85_bytes=ASCII85_BYTES,
+               _base85_ords=ASCII85_ORDS,
+               _uncompact_zero=True,
+               _compact_char=ZERO_GROUP_CHAR):
+    prefix = prefix or EMPTY_BYTE
+    suffix = suffix or EMPTY_BYTE
+    if not (builtins.is_bytes(prefix) and builtins.is_bytes(suffix)):
+      raise TypeError("Prefix/suffix must be bytes: got prefix %r, %r" %
+                      (type(prefix).__name__, type(suffix).__name__))
+    if not builtins.is_bytes(_compact_char):
+      raise TypeError("compat character must be raw byte: got %r" %
+                      type(_compact_char).__name__)
+    self._prefix = prefix
+    self._suffix = suffix
+    self._base85_bytes = _base85_bytes
+    self._base85_ords = _base85_ords
+    self._compact_char = _compact_char if _uncompact_zero else None
+    self._pending = EMPTY_BYTE
+    self._finalized = False
+
+  def _decode(self, encoded):
+    """Decodes whitespace-free encoded bytes starting at a group boundary."""
+    if not encoded:
+      return EMPTY_BYTE
+    if self._compact_char:
+      return _b85decode_compact(encoded, self._base85_bytes,
+                                self._base85_ords, self._compact_char)
+    return _b85decode_chunks(encoded, self._base85_bytes, self._base85_ords)
+
+  def _strip_prefix(self, encoded, final=False):
+    """Strips the prefix off the start of the stream once enough of it has
+    been seen to tell whether it is there."""
+    prefix = self._prefix
+    if not prefix:
+      return encoded
+    if not final and len(encoded) < len(prefix) and prefix.startswith(encoded):
+      return None
+    self._prefix = EMPTY_BYTE
+    if encoded.startswith(prefix):
+      encoded = encoded[len(prefix):]
+    return encoded
+
+  def update(self, encoded):
+    """Decodes the next piece of the input.
+
+    :param encoded:
+        Encoded bytes.
+    :returns:
+        Raw bytes for all the complete groups available so far.
+    """
+    if self._finalized:
+      raise ValueError("decoder has already been finalized")
+    if not builtins.is_bytes(encoded):
+      if not builtins.is_buffer(encoded):
+        raise TypeError("Encoded sequence must be bytes: got %r" %
+                        type(encoded).__name__)
+      encoded = builtins.buffer_bytes(encoded)
+    # ASCII-85 ignores whitespace.
+    encoded = self._pending + EMPTY_BYTE.join(encoded.split())
+    stripped = self._strip_prefix(encoded)
+    if stripped is None:
+      self._pending = encoded
+      return EMPTY_BYTE
+    encoded = stripped
+
+    # The last few characters could be the suffix; hold on to them.
+    usable = len(encoded) - len(self._suffix)
+    # Complete groups end either on a multiple of 5 characters after the
+    # last compact character or on the compact character itself.
+    group_start = 0
+    if self._compact_char:
+      group_start = encoded.rfind(self._compact_char, 0, max(usable, 0)) + 1
+    cut = max(usable - (usable - group_start) % 5, group_start)
+    self._pending = encoded[cut:]
+    return self._decode(encoded[:cut])
+
+  def finalize(self):
+    """Decodes the trailing partial group, if any.
+
+    The decoder cannot be used after it has been finalized.
+
+    :returns:
+        The remaining raw bytes.
+    """
+    if self._finalized:
+      raise ValueError("decoder has already been finalized")
+    self._finalized = True
+    encoded, self._pending = self._pending, EMPTY_BYTE
+    encoded = self._strip_prefix(encoded, final=True)
+    suffix = self._suffix
+    if suffix and encoded.endswith(suffix):
+      encoded = encoded[:-len(suffix)]
+    return self._decode(encoded)
+
+
+class RFC1924B85Encoder(B85Encoder):
+  """Incremental base85 encoder using the RFC1924 character set.
+
+  See :func:`rfc1924_b85encode`.
+  """
+
+  def __init__(self):
+    B85Encoder.__init__(self,
+                        _base85_bytes=RFC1924_BYTES,
+                        _compact_zero=False)
+
+
+class RFC1924B85Decoder(B85Decoder):
+  """Incremental base85 decoder using the RFC1924 character set.
+
+  See :func:`rfc1924_b85decode`.
+  """
+
+  def __init__(self):
+    B85Decoder.__init__(self,
+                        _base85_bytes=RFC1924_BYTES,
+                        _base85_ords=RFC1924_ORDS,
+                        _uncompact_zero=False)
+
+
+def _stream(coder, stream, chunk_size):
+  """Feeds a file-like object through an incremental encoder or decoder.
+
+  :param coder:
+      An encoder or decoder object.
+  :param stream:
+      File-like object with a ``read(size)`` method.
+  :param chunk_size:
+      Number of bytes to read at a time.
+  :returns:
+      Generator of output chunks. Empty chunks are not yielded.
+  """
+  while True:
+    chunk = stream.read(chunk_size)
+    if not chunk:
+      break
+    output = coder.update(chunk)
+    if output:
+      yield output
+  output = coder.finalize()
+  if output:
+    yield output
+
+
+def b85encode_stream(stream,
+                     prefix=None,
+                     suffix=None,
+                     chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+  """ASCII-85 encodes a file-like object a chunk at a time.
+
+  Memory use is bounded by ``chunk_size`` irrespective of the size of the
+  stream. Joining the generated chunks gives the same result as
+  :func:`b85encode` on the entire contents.
+
+  :param stream:
+      File-like object opened in binary mode.
+  :param prefix:
+      The prefix used by the encoded text. None by default.
+  :param suffix:
+      The suffix used by the encoded text. None by default.
+  :param chunk_size:
+      Number of raw bytes read at a time.
+  :returns:
+      Generator of ASCII-85 encoded bytes.
+  """
+  return _stream(B85Encoder(prefix, suffix), stream, chunk_size)
+
+
+def b85decode_stream(stream,
+                     prefix=None,
+                     suffix=None,
+                     chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+  """Decodes an ASCII-85 encoded file-like object a chunk at a time.
+
+  :param stream:
+      File-like object opened in binary mode.
+  :param prefix:
+      The prefix used by the encoded text. None by default.
+  :param suffix:
+      The suffix used by the encoded text. None by default.
+  :param chunk_size:
+      Number of encoded bytes read at a time.
+  :returns:
+      Generator of raw bytes.
+  """
+  return _stream(B85Decoder(prefix, suffix), stream, chunk_size)
+
+
+def rfc1924_b85encode_stream(stream, chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+  """Base85 encodes a file-like object a chunk at a time using the RFC1924
+  character set.
+
+  :param stream:
+      File-like object opened in binary mode.
+  :param chunk_size:
+      Number of raw bytes read at a time.
+  :returns:
+      Generator of RFC1924 base85 encoded bytes.
+  """
+  return _stream(RFC1924B85Encoder(), stream, chunk_size)
+
+
+def rfc1924_b85decode_stream(stream, chunk_size=DEFAULT_STREAM_CHUNK_SIZE):
+  """Decodes an RFC1924 base85 encoded file-like object a chunk at a time.
+
+  :param stream:
+      File-like object opened in binary mode.
+  :param chunk_size:
+      Number of encoded bytes read at a time.
+  :returns:
+      Generator of raw bytes.
+  """
+  return _stream(RFC1924B85Decoder(), stream, chunk_size)
+
+
 def ipv6_b85encode(uint128,
                    _base85_bytes=RFC1924_BYTES):
   """Encodes a 128-bit unsigned integer using the RFC 1924 base-85 encoding.
@@ -575,8 +1140,10 @@ def ipv6_b85decode(encoded,
       A 128-bit unsigned integer.
   """
   if not builtins.is_bytes(encoded):
-    raise TypeError("Encoded sequence must be bytes: got %r" %
-                    type(encoded).__name__)
+    if not builtins.is_buffer(encoded):
+      raise TypeError("Encoded sequence must be bytes: got %r" %
+                      type(encoded).__name__)
+    encoded = builtins.buffer_bytes(encoded)
 
   # Ignore whitespace.
   encoded = EMPTY_BYTE.join(encoded.split())
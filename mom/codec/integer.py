@@ -30,6 +30,17 @@ where ``g`` is the decoder and ``f`` is a encoder.
 
 .. autofunction:: bytes_to_uint
 .. autofunction:: uint_to_bytes
+.. autofunction:: bytes_to_int
+.. autofunction:: int_to_bytes
+
+Fixed-width fields
+------------------
+Binary records often hold many unsigned integers of the same width side
+by side (identifiers, hashes, RSA values). These convert a whole column
+of them in one call.
+
+.. autofunction:: unpack_uints
+.. autofunction:: pack_uints
 """
 
 # This module contains only the implementations that were bench-marked
@@ -59,32 +70,80 @@ __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
 
 
 __all__ = [
+    "bytes_to_int",
     "bytes_to_uint",
+    "int_to_bytes",
+    "pack_uints",
     "uint_to_bytes",
+    "unpack_uints",
     ]
 
 
 ZERO_BYTE = _compat.ZERO_BYTE
 EMPTY_BYTE = _compat.EMPTY_BYTE
 
+# Field widths that struct converts natively.
+_STRUCT_FORMATS = {1: "B", 2: "H", 4: "L", 8: "Q"}
+
+# pack_uints converts this many fields at a time before copying them into
+# the output buffer.
+_PACK_CHUNK_SIZE = 4096
+
 
-def bytes_to_uint(raw_bytes):
+def bytes_to_uint(raw_bytes, little_endian=False):
   """
   Converts a series of bytes into an unsigned integer.
 
   :param raw_bytes:
-      Raw bytes (base-256 representation).
+      Raw bytes (base-256 representation) or any other buffer.
+  :param little_endian:
+      ``True`` if the least significant byte comes first; ``False``
+      (default) for big-endian.
   :returns:
-      Unsigned integer.
+      Unsigned integer. 0 if ``raw_bytes`` is empty.
   """
-  if not builtins.is_bytes(raw_bytes):
+  if not builtins.is_buffer(raw_bytes):
     raise TypeError("argument must be raw bytes: got %r" %
                     type(raw_bytes).__name__)
-    # binascii.b2a_hex is written in C as is int.
+  if _compat.HAVE_PYTHON3:
+    if not builtins.is_bytes(raw_bytes):
+      raw_bytes = builtins.byte_view(raw_bytes)
+    return int.from_bytes(raw_bytes, "little" if little_endian else "big")
+  if not raw_bytes:
+    return 0
+  if little_endian:
+    raw_bytes = builtins.buffer_bytes(raw_bytes)[::-1]
+  # binascii.b2a_hex is written in C as is int.
   return int(binascii.b2a_hex(raw_bytes), 16)
 
 
-def uint_to_bytes(number, fill_size=0, chunk_size=0, overflow=False):
+def bytes_to_int(raw_bytes, little_endian=False):
+  """
+  Converts a series of bytes in two's complement into a signed integer.
+
+  :param raw_bytes:
+      Raw bytes (base-256 two's complement representation) or any other
+      buffer.
+  :param little_endian:
+      ``True`` if the least significant byte comes first; ``False``
+      (default) for big-endian.
+  :returns:
+      Signed integer. 0 if ``raw_bytes`` is empty.
+  """
+  if _compat.HAVE_PYTHON3 and builtins.is_buffer(raw_bytes):
+    if not builtins.is_bytes(raw_bytes):
+      raw_bytes = builtins.byte_view(raw_bytes)
+    return int.from_bytes(raw_bytes, "little" if little_endian else "big",
+                          signed=True)
+  number = bytes_to_uint(raw_bytes, little_endian)
+  sign_bit = 1 << (len(raw_bytes) * 8 - 1) if raw_bytes else 0
+  if number & sign_bit:
+    number -= sign_bit << 1
+  return number
+
+
+def uint_to_bytes(number, fill_size=0, chunk_size=0, overflow=False,
+                  little_endian=False):
   """
   Convert an unsigned integer to bytes (base-256 representation).
 
@@ -97,6 +156,9 @@ def uint_to_bytes(number, fill_size=0, chunk_size=0, overflow=False):
   size of the number in bytes is either the fill size or an integral
   multiple of the chunk size.
 
+  The bytes are produced by a single conversion into a buffer of the final
+  size, so the cost is linear in the size of the number.
+
   .. NOTE:
       You cannot specify both the fill size and the chunk size.
 
@@ -118,6 +180,9 @@ def uint_to_bytes(number, fill_size=0, chunk_size=0, overflow=False):
       will be raised when the fill_size is shorter than the length
       of the generated byte sequence. Instead the byte sequence will
       be returned as is.
+  :param little_endian:
+      ``True`` to put the least significant byte first (padding then goes
+      at the end); ``False`` (default) for big-endian.
   :returns:
       Raw bytes (base-256 representation).
   :raises:
@@ -128,38 +193,236 @@ def uint_to_bytes(number, fill_size=0, chunk_size=0, overflow=False):
   """
   if number < 0:
     raise ValueError("Number must be an unsigned integer: %d" % number)
+  size = _padded_size(builtins.integer_byte_length(number) or 1,
+                      fill_size, chunk_size, overflow)
+  return _int_to_bytes(number, size, little_endian, False)
+
 
+def int_to_bytes(number, fill_size=0, chunk_size=0, overflow=False,
+                 little_endian=False):
+  """
+  Convert a signed integer to bytes (base-256 two's complement
+  representation).
+
+  Uses the fewest bytes that hold the number and its sign unless a fill
+  size or a chunk size is specified, in which case the bytes are
+  sign-extended (with zero bytes for positive numbers and 0xff bytes for
+  negative ones) exactly like :func:`uint_to_bytes` pads with zero bytes.
+
+  :param number:
+      Integer value.
+  :param fill_size:
+      See :func:`uint_to_bytes`.
+  :param chunk_size:
+      See :func:`uint_to_bytes`.
+  :param overflow:
+      See :func:`uint_to_bytes`.
+  :param little_endian:
+      ``True`` to put the least significant byte first; ``False``
+      (default) for big-endian.
+  :returns:
+      Raw bytes (base-256 two's complement representation).
+  :raises:
+      ``OverflowError`` when a fill size is given, ``overflow`` is
+      ``False``, and the number does not fit.
+  """
+  magnitude = ~number if number < 0 else number
+  # One extra bit for the sign.
+  length = (builtins.integer_bit_length(magnitude) >> 3) + 1
+  size = _padded_size(length, fill_size, chunk_size, overflow)
+  return _int_to_bytes(number, size, little_endian, True)
+
+
+def _padded_size(length, fill_size, chunk_size, overflow):
+  """Returns the number of bytes to produce for a number that takes up
+  ``length`` bytes. See :func:`uint_to_bytes`."""
   if fill_size and chunk_size:
     raise ValueError("You can either fill or pad chunks, but not both")
 
   # Ensure these are integers.
-  _ = number & 1 and chunk_size & 1 and fill_size & 1
-
-  raw_bytes = EMPTY_BYTE
-
-  # Pack the integer one machine word at a time into bytes.
-  num = number
-  word_bits, _, max_uint, pack_type = _compat.get_word_alignment(num)
-  pack_format = ">%s" % pack_type
-  while num > 0:
-    raw_bytes = struct.pack(pack_format, num & max_uint) + raw_bytes
-    num >>= word_bits
-    # Obtain the index of the first non-zero byte.
-  zero_leading = builtins.bytes_leading(raw_bytes)
-  if number == 0:
-    raw_bytes = ZERO_BYTE
-    # De-padding.
-  raw_bytes = raw_bytes[zero_leading:]
-
-  length = len(raw_bytes)
+  _ = chunk_size & 1 and fill_size & 1
+
   if fill_size > 0:
-    if not overflow and length > fill_size:
-      raise OverflowError("Need %d bytes for number, but fill size is %d" %
-                          (length, fill_size))
-    raw_bytes = raw_bytes.rjust(fill_size, ZERO_BYTE)
+    if length > fill_size:
+      if not overflow:
+        raise OverflowError("Need %d bytes for number, but fill size is %d" %
+                            (length, fill_size))
+      return length
+    return fill_size
   elif chunk_size > 0:
     remainder = length % chunk_size
     if remainder:
-      padding_size = chunk_size - remainder
-      raw_bytes = raw_bytes.rjust(length + padding_size, ZERO_BYTE)
-  return raw_bytes
+      return length + chunk_size - remainder
+  return length
+
+
+if _compat.HAVE_PYTHON3:
+
+  def _int_to_bytes(number, size, little_endian, signed):
+    """Converts an integer that fits into exactly ``size`` bytes."""
+    return number.to_bytes(size, "little" if little_endian else "big",
+                           signed=signed)
+else:
+
+  def _int_to_bytes(number, size, little_endian, signed):
+    """Converts an integer that fits into exactly ``size`` bytes."""
+    if signed and number < 0:
+      number += 1 << (size * 8)
+    # Hex formatting is linear in the size of the number and the result is
+    # already padded to the final size.
+    raw_bytes = binascii.a2b_hex("%0*x" % (size * 2, number))
+    if little_endian:
+      return raw_bytes[::-1]
+    return raw_bytes
+
+
+def unpack_uints(buf, width, offset=0, count=None, little_endian=False):
+  """
+  Converts consecutive fixed-width fields of a buffer into unsigned
+  integers.
+
+  The buffer is read in place; no part of it is copied.
+
+  :param buf:
+      Bytes or any other buffer.
+  :param width:
+      Size of every field in bytes.
+  :param offset:
+      Index of the first field in ``buf``.
+  :param count:
+      Number of fields to convert. ``None`` (default) converts as many
+      whole fields as there are after ``offset``.
+  :param little_endian:
+      ``True`` if fields store the least significant byte first; ``False``
+      (default) for big-endian.
+  :returns:
+      List of unsigned integers.
+  """
+  if not builtins.is_buffer(buf):
+    raise TypeError("argument must be a buffer: got %r" % type(buf).__name__)
+  _check_field_width(width)
+  view = builtins.byte_view(buf)
+  if not 0 <= offset <= len(view):
+    raise ValueError("offset %d is out of range for a buffer of %d bytes" %
+                     (offset, len(view)))
+  available = (len(view) - offset) // width
+  if count is None:
+    count = available
+  elif not 0 <= count <= available:
+    raise ValueError("buffer holds %d %d-byte fields after offset %d: "
+                     "got count %d" % (available, width, offset, count))
+  pack_type = _STRUCT_FORMATS.get(width)
+  if pack_type:
+    return list(struct.unpack_from(
+        "%s%d%s" % ("<" if little_endian else ">", count, pack_type),
+        view, offset))
+  return _unpack_fields(view, width, offset, count, little_endian)
+
+
+def pack_uints(ints, width, out=None, offset=0, little_endian=False):
+  """
+  Writes unsigned integers into consecutive fixed-width fields of a
+  buffer, zero-padding each one to ``width`` bytes.
+
+  :param ints:
+      Iterable of unsigned integers.
+  :param width:
+      Size of every field in bytes.
+  :param out:
+      Writable buffer (a ``bytearray`` for example) to write into. ``None``
+      (default) allocates a new ``bytearray`` that is just large enough.
+  :param offset:
+      Index in ``out`` of the first field.
+  :param little_endian:
+      ``True`` to store the least significant byte first; ``False``
+      (default) for big-endian.
+  :returns:
+      ``out``, or the new ``bytearray``.
+  :raises:
+      ``ValueError`` for negative integers or when ``out`` is too small;
+      ``OverflowError`` when an integer does not fit into ``width`` bytes.
+  """
+  _check_field_width(width)
+  ints = list(ints)
+  size = len(ints) * width
+  if out is None:
+    out = bytearray(offset + size)
+  elif not 0 <= offset <= len(out) - size:
+    raise ValueError("%d %d-byte fields do not fit into a buffer of %d "
+                     "bytes at offset %d" % (len(ints), width, len(out),
+                                             offset))
+  if not ints:
+    return out
+  if min(ints) < 0 or max(ints) >> (width << 3):
+    _raise_field_error(ints, width)
+  pack_type = _STRUCT_FORMATS.get(width)
+  if pack_type:
+    struct.pack_into(
+        "%s%d%s" % ("<" if little_endian else ">", len(ints), pack_type),
+        out, offset, *ints)
+    return out
+  for start in builtins.range(0, len(ints), _PACK_CHUNK_SIZE):
+    raw_bytes = _pack_fields(ints[start:start + _PACK_CHUNK_SIZE], width,
+                             little_endian)
+    out[offset:offset + len(raw_bytes)] = raw_bytes
+    offset += len(raw_bytes)
+  return out
+
+
+def _check_field_width(width):
+  """Raises ``ValueError`` unless the field width is a positive integer."""
+  if width < 1:
+    raise ValueError("width must be positive: got %r" % width)
+  # Ensure this is an integer.
+  _ = width & 1
+
+
+def _raise_field_error(ints, width):
+  """Raises the error for the first integer that does not fit a field."""
+  for index, number in enumerate(ints):
+    if number < 0:
+      raise ValueError("Number must be an unsigned integer: %d at index %d" %
+                       (number, index))
+    if number >> (width << 3):
+      raise OverflowError("Need %d bytes for number at index %d, but width "
+                          "is %d" % (builtins.integer_byte_length(number),
+                                     index, width))
+
+
+if _compat.HAVE_PYTHON3:
+
+  def _unpack_fields(view, width, offset, count, little_endian):
+    """Converts fields of any width. See :func:`unpack_uints`."""
+    from_bytes = int.from_bytes
+    byteorder = "little" if little_endian else "big"
+    # Slices of a memoryview are views, not copies.
+    return [from_bytes(view[i:i + width], byteorder)
+            for i in builtins.range(offset, offset + count * width, width)]
+
+  def _pack_fields(ints, width, little_endian):
+    """Converts in-range integers of any width. See :func:`pack_uints`."""
+    to_bytes = int.to_bytes
+    byteorder = "little" if little_endian else "big"
+    return EMPTY_BYTE.join([to_bytes(number, width, byteorder)
+                            for number in ints])
+else:
+
+  def _unpack_fields(view, width, offset, count, little_endian):
+    """Converts fields of any width. See :func:`unpack_uints`."""
+    hex_digits = binascii.b2a_hex(view[offset:offset + count * width])
+    step = width * 2
+    if little_endian:
+      return [int(binascii.b2a_hex(binascii.a2b_hex(
+          hex_digits[i:i + step])[::-1]), 16)
+              for i in builtins.range(0, len(hex_digits), step)]
+    return [int(hex_digits[i:i + step], 16)
+            for i in builtins.range(0, len(hex_digits), step)]
+
+  def _pack_fields(ints, width, little_endian):
+    """Converts in-range integers of any width. See :func:`pack_uints`."""
+    step = width * 2
+    if little_endian:
+      return EMPTY_BYTE.join([binascii.a2b_hex("%0*x" % (step, number))[::-1]
+                              for number in ints])
+    return binascii.a2b_hex("".join(["%0*x" % (step, number)
+                                     for number in ints]))
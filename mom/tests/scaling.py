@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Size-scaling benchmarks for the codecs in :mod:`mom.codec`.
+
+Every codec is timed on random inputs whose sizes grow geometrically. For
+each size the best time per call, the throughput, and the peak memory
+allocated by one call are recorded. A straight line is then fitted through
+``log(time)`` against ``log(size)`` for the larger sizes: its slope is the
+empirical complexity exponent (about 1.0 for a linear codec, 2.0 for a
+quadratic one).
+
+Results are plain dictionaries that can be dumped to JSON and compared
+against a baseline from an earlier run with :func:`compare`. See
+``run_codec_benchmarks.py`` for the command-line front end.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+
+import math
+import os
+import platform
+import sys
+import timeit
+
+try:
+  import tracemalloc
+except ImportError:
+  tracemalloc = None
+
+from mom import codec
+
+
+__author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
+
+
+# Default sweep: 16 B, 64 B, ..., 16 MB.
+MIN_SIZE = 16
+MAX_SIZE = 16 << 20
+GROWTH_FACTOR = 4
+
+# Each timing is repeated until it has taken at least this long in total.
+MIN_TIME = 0.1
+REPEAT = 3
+
+# A codec's sweep stops after the first size for which a single call takes
+# longer than this many seconds. Keeps superlinear codecs from running for
+# hours at the top of the range.
+MAX_SECONDS = 2.0
+
+# Only sizes at least this large are used to fit the exponent; smaller ones
+# are dominated by per-call overhead.
+FIT_MIN_SIZE = 4096
+
+# Default regression gates. See compare().
+SLOWDOWN_THRESHOLD = 0.25
+EXPONENT_THRESHOLD = 0.2
+
+
+def _base85_rfc1924_encode(raw_bytes):
+  """RFC1924 base85 encoding."""
+  return codec.base85_encode(raw_bytes, codec.B85_RFC1924)
+
+
+def _base85_rfc1924_decode(encoded):
+  """RFC1924 base85 decoding."""
+  return codec.base85_decode(encoded, codec.B85_RFC1924)
+
+
+# name: (encoder, decoder)
+CODECS = [
+    ("base85", codec.base85_encode, codec.base85_decode),
+    ("base85-rfc1924", _base85_rfc1924_encode, _base85_rfc1924_decode),
+    ("base64", codec.base64_encode, codec.base64_decode),
+    ("base64-urlsafe", codec.base64_urlsafe_encode,
+     codec.base64_urlsafe_decode),
+    ("base62", codec.base62_encode, codec.base62_decode),
+    ("base62-blocks", codec.base62_encode_blocks, codec.base62_decode_blocks),
+    ("base58", codec.base58_encode, codec.base58_decode),
+    ("base58-blocks", codec.base58_encode_blocks, codec.base58_decode_blocks),
+    ("base36", codec.base36_encode, codec.base36_decode),
+    ("hex", codec.hex_encode, codec.hex_decode),
+    ("decimal", codec.decimal_encode, codec.decimal_decode),
+    ("bin", codec.bin_encode, codec.bin_decode),
+    ]
+
+
+def geometric_sizes(min_size=MIN_SIZE, max_size=MAX_SIZE,
+                    factor=GROWTH_FACTOR):
+  """
+  Returns input sizes growing geometrically.
+
+  :param min_size:
+      Smallest size in bytes.
+  :param max_size:
+      Largest size in bytes (inclusive).
+  :param factor:
+      Ratio between consecutive sizes.
+  :returns:
+      List of sizes.
+  """
+  if min_size < 1 or factor < 2:
+    raise ValueError("need min_size >= 1 and factor >= 2: got %r, %r" %
+                     (min_size, factor))
+  sizes = []
+  size = min_size
+  while size <= max_size:
+    sizes.append(size)
+    size *= factor
+  return sizes
+
+
+def time_call(func, arg, min_time=MIN_TIME, repeat=REPEAT,
+              timer=timeit.default_timer):
+  """
+  Measures the best time of one call of ``func(arg)``.
+
+  :param func:
+      Function to time.
+  :param arg:
+      Its only argument.
+  :param min_time:
+      Every measurement runs the call as many times as needed to take at
+      least this many seconds.
+  :param repeat:
+      Number of measurements; the best one is used.
+  :returns:
+      Seconds per call.
+  """
+  start = timer()
+  func(arg)
+  elapsed = timer() - start
+  if elapsed >= min_time:
+    # Slow calls are not worth repeating.
+    return elapsed
+  number = max(1, int(min_time / max(elapsed, 1e-9)))
+  best = elapsed
+  for _ in range(repeat):
+    start = timer()
+    for _ in range(number):
+      func(arg)
+    best = min(best, (timer() - start) / number)
+  return best
+
+
+def peak_allocation(func, arg):
+  """
+  Measures the peak memory allocated by one call of ``func(arg)``.
+
+  :returns:
+      Bytes, or ``None`` when ``tracemalloc`` is unavailable.
+  """
+  if tracemalloc is None:
+    return None
+  tracemalloc.start()
+  try:
+    func(arg)
+    return tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+
+def fit_exponent(sizes, seconds, min_size=FIT_MIN_SIZE):
+  """
+  Fits ``seconds = c * size ** k`` by least squares in log-log space.
+
+  :param sizes:
+      Input sizes.
+  :param seconds:
+      Time per call for each size.
+  :param min_size:
+      Sizes below this are ignored as long as at least two points remain.
+  :returns:
+      The exponent ``k``, or ``None`` with fewer than two points.
+  """
+  points = [(size, secs) for size, secs in zip(sizes, seconds)
+            if size >= min_size and secs > 0]
+  if len(points) < 2:
+    points = [(size, secs) for size, secs in zip(sizes, seconds) if secs > 0]
+  if len(points) < 2:
+    return None
+  xs = [math.log(size) for size, _ in points]
+  ys = [math.log(secs) for _, secs in points]
+  mean_x = sum(xs) / len(xs)
+  mean_y = sum(ys) / len(ys)
+  variance = sum((x - mean_x) ** 2 for x in xs)
+  if not variance:
+    return None
+  covariance = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+  return covariance / variance
+
+
+def sweep(func, inputs, sizes, min_time=MIN_TIME, max_seconds=MAX_SECONDS,
+          measure_memory=True):
+  """
+  Times one operation over increasing input sizes.
+
+  :param func:
+      Encoder or decoder.
+  :param inputs:
+      Function that returns the argument for a given size.
+  :param sizes:
+      Sizes in bytes of raw data; throughput is reported against these.
+  :param max_seconds:
+      The sweep stops after the first size that takes longer than this.
+  :returns:
+      Dictionary with ``sizes``, ``seconds``, ``mb_per_s``, ``peak_bytes``,
+      and ``exponent``.
+  """
+  result = {
+      "sizes": [],
+      "seconds": [],
+      "mb_per_s": [],
+      "peak_bytes": [],
+      }
+  for size in sizes:
+    arg = inputs(size)
+    secs = time_call(func, arg, min_time)
+    result["sizes"].append(size)
+    result["seconds"].append(secs)
+    result["mb_per_s"].append(size / (1 << 20) / secs if secs else None)
+    result["peak_bytes"].append(peak_allocation(func, arg)
+                                if measure_memory else None)
+    if secs > max_seconds:
+      break
+  result["exponent"] = fit_exponent(result["sizes"], result["seconds"])
+  return result
+
+
+def run(codecs=None, sizes=None, min_time=MIN_TIME, max_seconds=MAX_SECONDS,
+        measure_memory=True, progress=None):
+  """
+  Benchmarks encoding and decoding for the given codecs.
+
+  :param codecs:
+      List of ``(name, encoder, decoder)``. Defaults to :data:`CODECS`.
+  :param sizes:
+      Raw input sizes. Defaults to :func:`geometric_sizes`.
+  :param progress:
+      Optional callable receiving ``(codec name, operation, result)`` as
+      each sweep finishes.
+  :returns:
+      A JSON-serializable dictionary of results.
+  """
+  if codecs is None:
+    codecs = CODECS
+  if sizes is None:
+    sizes = geometric_sizes()
+  _allow_long_int_strings()
+  # The same random data is shared by all the codecs.
+  data = os.urandom(max(sizes))
+  results = {}
+  for name, encode, decode in codecs:
+    encoded_cache = {}
+
+    def encoded_input(size, encode=encode, cache=encoded_cache):
+      if size not in cache:
+        cache.clear()
+        cache[size] = encode(data[:size])
+      return cache[size]
+
+    ops = {}
+    for operation, func, inputs in (
+        ("encode", encode, lambda size: data[:size]),
+        ("decode", decode, encoded_input)):
+      ops[operation] = sweep(func, inputs, sizes, min_time, max_seconds,
+                             measure_memory)
+      if progress:
+        progress(name, operation, ops[operation])
+    results[name] = ops
+  return {
+      "python": sys.version.split()[0],
+      "implementation": platform.python_implementation(),
+      "machine": platform.machine(),
+      "results": results,
+      }
+
+
+def compare(results, baseline, threshold=SLOWDOWN_THRESHOLD,
+            exponent_threshold=EXPONENT_THRESHOLD):
+  """
+  Compares benchmark results against a baseline.
+
+  Only codecs, operations, and sizes present in both are compared.
+
+  :param results:
+      Results returned by :func:`run`.
+  :param baseline:
+      Results of an earlier run.
+  :param threshold:
+      Largest accepted relative slowdown at any size; ``0.25`` allows a
+      call to take 25% longer than in the baseline.
+  :param exponent_threshold:
+      Largest accepted growth of the fitted complexity exponent.
+  :returns:
+      List of human-readable descriptions of regressions. Empty if there
+      are none.
+  """
+  regressions = []
+  base_results = baseline.get("results", {})
+  for name in sorted(results.get("results", {})):
+    if name not in base_results:
+      continue
+    for operation in sorted(results["results"][name]):
+      current = results["results"][name][operation]
+      previous = base_results[name].get(operation)
+      if not previous:
+        continue
+      previous_seconds = dict(zip(previous["sizes"], previous["seconds"]))
+      for size, secs in zip(current["sizes"], current["seconds"]):
+        before = previous_seconds.get(size)
+        if before and secs > before * (1 + threshold):
+          regressions.append(
+              "%s %s at %d bytes: %.3g s -> %.3g s (%+.0f%%)" %
+              (name, operation, size, before, secs,
+               (secs / before - 1) * 100))
+      exponent, before = current.get("exponent"), previous.get("exponent")
+      if (exponent is not None and before is not None and
+          exponent > before + exponent_threshold):
+        regressions.append("%s %s complexity exponent: %.2f -> %.2f" %
+                           (name, operation, before, exponent))
+  return regressions
+
+
+def _allow_long_int_strings():
+  """Lifts the limit on int/str conversions of newer Pythons, which would
+  otherwise stop the decimal codec at a few kilobytes."""
+  set_max_digits = getattr(sys, "set_int_max_str_digits", None)
+  if set_max_digits:
+    set_max_digits(0)
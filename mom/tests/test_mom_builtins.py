@@ -18,6 +18,7 @@
 
 from __future__ import absolute_import
 
+import array
 import unittest2
 import math
 import struct
@@ -28,6 +29,11 @@ from mom import builtins
 from mom.security import random
 from mom.tests import constants
 
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
 
 __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
 
@@ -72,6 +78,14 @@ class Test_bytes_leading_and_trailing(unittest2.TestCase):
     self.assertEqual(builtins.bytes_trailing(b("\xff\x00\x00\x00")), 3)
     self.assertEqual(builtins.bytes_trailing(b("")), 0)
 
+  def test_buffers(self):
+    self.assertEqual(builtins.bytes_leading(bytearray(b("\x00\x00\xff"))), 2)
+    self.assertEqual(builtins.bytes_trailing(bytearray(b("\xff\x00"))), 1)
+    self.assertEqual(
+      builtins.bytes_leading(array.array("B", [0, 0, 0, 1])), 3)
+    self.assertEqual(
+      builtins.bytes_trailing(array.array("B", [1, 0, 0, 0])), 3)
+
   def test_TypeError_when_bad_type(self):
     self.assertRaises(TypeError, builtins.bytes_trailing, constants.UNICODE_STRING)
     self.assertRaises(TypeError, builtins.bytes_trailing, 1)
@@ -261,6 +275,14 @@ class Test_integer_bit_count(unittest2.TestCase):
     self.assertRaises(TypeError, builtins.integer_bit_count, {})
     self.assertRaises(TypeError, builtins.integer_bit_count, object)
     self.assertRaises(TypeError, builtins.integer_bit_count, [])
+    self.assertRaises(TypeError, builtins.integer_bit_count, 2.0)
+    self.assertRaises(TypeError, builtins.integer_bit_count, None)
+
+  def test_correctness_against_alternative(self):
+    for num in (0, 1, -1, 0xf0f0, 1 << 4096, (1 << 4099) - 1,
+                random.generate_random_uint_atmost(8192)):
+      self.assertEqual(builtins.integer_bit_count(num),
+                       _alt_builtins.integer_bit_count_clearing(num))
 
 
 class Test_integer_bit_length(unittest2.TestCase):
@@ -268,6 +290,7 @@ class Test_integer_bit_length(unittest2.TestCase):
     self.assertEqual(builtins.integer_bit_length(0), 0)
     self.assertEqual(_alt_builtins.integer_bit_length_shift_counting(0), 0)
     self.assertEqual(_alt_builtins.integer_bit_length_word_aligned(0), 0)
+    self.assertEqual(_alt_builtins.integer_bit_length_hex(0), 0)
 
   def test_bit_length_correct(self):
     numbers = [
@@ -285,6 +308,7 @@ class Test_integer_bit_length(unittest2.TestCase):
       self.assertEqual(builtins.integer_bit_length(num), length)
       self.assertEqual(_alt_builtins.integer_bit_length_shift_counting(num), length)
       self.assertEqual(_alt_builtins.integer_bit_length_word_aligned(num), length)
+      self.assertEqual(_alt_builtins.integer_bit_length_hex(num), length)
 
     self.assertEqual(builtins.integer_bit_length(1023), 10)
     self.assertEqual(builtins.integer_bit_length(1024), 11)
@@ -377,6 +401,38 @@ class Test_is_bytes(unittest2.TestCase):
     self.assertFalse(builtins.is_bytes(object))
 
 
+class Test_is_buffer(unittest2.TestCase):
+  def test_accepts_buffers(self):
+    self.assertTrue(builtins.is_buffer(RANDOM_BYTES))
+    self.assertTrue(builtins.is_buffer(bytearray(RANDOM_BYTES)))
+    self.assertTrue(builtins.is_buffer(array.array("B", [1, 2, 3])))
+    self.assertTrue(builtins.is_buffer(array.array("L", [1, 2, 3])))
+
+  def test_rejects_non_buffers(self):
+    self.assertFalse(builtins.is_buffer(constants.UNICODE_STRING))
+    self.assertFalse(builtins.is_buffer(False))
+    self.assertFalse(builtins.is_buffer(5))
+    self.assertFalse(builtins.is_buffer(None))
+    self.assertFalse(builtins.is_buffer([]))
+    self.assertFalse(builtins.is_buffer(()))
+    self.assertFalse(builtins.is_buffer(object))
+
+
+class Test_byte_view(unittest2.TestCase):
+  def test_views_raw_bytes(self):
+    values = array.array("L", [1, 2, 3])
+    view = builtins.byte_view(values)
+    self.assertEqual(len(view), len(values) * values.itemsize)
+    self.assertEqual(builtins.buffer_bytes(view),
+                     _compat.array_tobytes(values))
+
+  def test_does_not_copy(self):
+    raw = bytearray(b("abcd"))
+    view = builtins.byte_view(raw)
+    raw[0:1] = b("x")
+    self.assertEqual(builtins.buffer_bytes(view), b("xbcd"))
+
+
 class Test_is_unicode(unittest2.TestCase):
   def test_accepts_unicode(self):
     self.assertTrue(builtins.is_unicode(constants.UNICODE_STRING))
@@ -537,3 +593,62 @@ class Test_get_machine_alignment(unittest2.TestCase):
 
 if __name__ == "__main__":
   unittest2.main()
+
+
+class Test_bit_length_many(unittest2.TestCase):
+  def setUp(self):
+    self.numbers = [0, 1, -1, 255, -256, 1 << 63, (1 << 64) - 1, 1 << 4096]
+
+  def test_sequences(self):
+    expected = [builtins.integer_bit_length(num) for num in self.numbers]
+    self.assertEqual(builtins.bit_length_many(self.numbers), expected)
+    self.assertEqual(builtins.bit_length_many(iter(self.numbers)), expected)
+    self.assertEqual(builtins.bit_length_many([]), [])
+    self.assertEqual(builtins.bit_length_many(array.array("l", [5, -9])),
+                     [3, 4])
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, builtins.bit_length_many, [1, 2.0])
+    self.assertRaises(TypeError, builtins.bit_length_many, [None])
+
+  @unittest2.skipUnless(numpy, "requires numpy")
+  def test_numpy_arrays(self):
+    for dtype in ("int8", "uint8", "int16", "int32", "int64", "uint64"):
+      info = numpy.iinfo(dtype)
+      values = [info.min, info.min + 1, -1, 0, 1, info.max // 3, info.max]
+      values = [value for value in values if info.min <= value]
+      lengths = builtins.bit_length_many(numpy.array(values, dtype=dtype))
+      self.assertTrue(isinstance(lengths, numpy.ndarray))
+      self.assertEqual(lengths.tolist(),
+                       [builtins.integer_bit_length(value)
+                        for value in values], dtype)
+    self.assertEqual(builtins.bit_length_many(array.array("l", [5, -9])),
+                     [3, 4])
+    self.assertRaises(TypeError, builtins.bit_length_many,
+                      numpy.array([1.0]))
+
+
+class Test_popcount_many(unittest2.TestCase):
+  def setUp(self):
+    self.numbers = [0, 1, -1, 255, -255, 1 << 63, (1 << 64) - 1, 1 << 4096]
+
+  def test_sequences(self):
+    expected = [builtins.integer_bit_count(num) for num in self.numbers]
+    self.assertEqual(builtins.popcount_many(self.numbers), expected)
+    self.assertEqual(builtins.popcount_many(array.array("L", [7, 0])),
+                     [3, 0])
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, builtins.popcount_many, [1, 2.0])
+
+  @unittest2.skipUnless(numpy, "requires numpy")
+  def test_numpy_arrays(self):
+    for dtype in ("int8", "uint8", "int16", "int32", "int64", "uint64"):
+      info = numpy.iinfo(dtype)
+      values = [info.min, info.min + 1, -1, 0, 1, info.max // 3, info.max]
+      values = [value for value in values if info.min <= value]
+      counts = builtins.popcount_many(numpy.array(values, dtype=dtype))
+      self.assertTrue(isinstance(counts, numpy.ndarray))
+      self.assertEqual(counts.tolist(),
+                       [builtins.integer_bit_count(value)
+                        for value in values], dtype)
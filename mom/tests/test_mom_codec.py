@@ -18,8 +18,15 @@
 
 from __future__ import absolute_import
 
+import array
+import io
+import mmap
+import os
+import shutil
+import tempfile
 import unittest2
 
+from mom import _compat
 from mom import builtins
 from mom.tests import constants
 from mom.security import random
@@ -229,3 +236,170 @@ class Test_bin_codec(unittest2.TestCase):
 
     self.assertRaises(TypeError, codec.bin_decode, constants.UNICODE_STRING)
     self.assertRaises(TypeError, codec.bin_decode, None)
+
+
+try:
+  import tracemalloc
+except ImportError:  # pragma: no cover
+  tracemalloc = None
+
+BUFFER_ENCODERS = (
+  codec.base36_encode,
+  codec.base58_encode,
+  codec.base62_encode,
+  codec.base64_encode,
+  codec.base64_urlsafe_encode,
+  codec.base85_encode,
+  codec.bin_encode,
+  codec.decimal_encode,
+  codec.hex_encode,
+  )
+
+BUFFER_CODECS = (
+  (codec.base36_encode, codec.base36_decode),
+  (codec.base58_encode, codec.base58_decode),
+  (codec.base62_encode, codec.base62_decode),
+  (codec.base64_encode, codec.base64_decode),
+  (codec.base64_urlsafe_encode, codec.base64_urlsafe_decode),
+  (codec.base85_encode, codec.base85_decode),
+  (codec.bin_encode, codec.bin_decode),
+  (codec.decimal_encode, codec.decimal_decode),
+  (codec.hex_encode, codec.hex_decode),
+  )
+
+
+def _buffers(raw_bytes):
+  """Returns ``raw_bytes`` wrapped in several types of buffers."""
+  mapped = mmap.mmap(-1, len(raw_bytes))
+  mapped.write(raw_bytes)
+  return [bytearray(raw_bytes),
+          memoryview(raw_bytes),
+          array.array("B", raw_bytes),
+          mapped]
+
+
+class Test_buffer_protocol_input(unittest2.TestCase):
+  def test_encoders_accept_buffers(self):
+    raw_bytes = ZERO_BYTES + RANDOM_BYTES_2048
+    for encode in BUFFER_ENCODERS:
+      expected = encode(raw_bytes)
+      for buf in _buffers(raw_bytes):
+        self.assertEqual(encode(buf), expected)
+
+  def test_decoders_accept_buffers(self):
+    for encode, decode in BUFFER_CODECS:
+      encoded = encode(ONE_ZERO_BYTE + RANDOM_BYTES_1024)
+      for buf in _buffers(encoded):
+        self.assertEqual(decode(buf), ONE_ZERO_BYTE + RANDOM_BYTES_1024)
+
+  def test_multibyte_items_are_viewed_as_raw_bytes(self):
+    values = array.array("L", [0, 1, 2, 3])
+    raw_bytes = _compat.array_tobytes(values)
+    for encode in BUFFER_ENCODERS:
+      self.assertEqual(encode(values), encode(raw_bytes))
+
+  @unittest2.skipUnless(tracemalloc, "requires tracemalloc")
+  def test_encoding_does_not_copy_input(self):
+    raw_bytes = RANDOM_BYTES_4093 * 16
+    buf = bytearray(raw_bytes)
+    for encode in (codec.base64_encode, codec.hex_encode,
+                   codec.base85_encode):
+      peaks = []
+      for data in (raw_bytes, memoryview(buf)):
+        tracemalloc.start()
+        try:
+          encode(data)
+          peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+          tracemalloc.stop()
+      # Encoding a view must not cost a copy of the input more than
+      # encoding bytes does.
+      self.assertTrue(peaks[1] < peaks[0] + len(raw_bytes) // 4,
+                      encode.__name__)
+
+
+FILE_CODECS = [
+    ("base64", codec.base64_encode),
+    ("hex", codec.hex_encode),
+    ("base85", codec.base85_encode),
+    ("RFC1924", lambda raw: codec.base85_encode(raw, codec.B85_RFC1924)),
+    ("base58-blocks", codec.base58_encode_blocks),
+    ("base62-blocks", codec.base62_encode_blocks),
+    ]
+
+
+class Test_file_codec(unittest2.TestCase):
+  def setUp(self):
+    self.tempdir = tempfile.mkdtemp()
+    self.raw = (RANDOM_BYTES_4093 + ZERO_BYTES * 8) * 4
+
+  def tearDown(self):
+    shutil.rmtree(self.tempdir)
+
+  def _path(self, name, content=None):
+    path = os.path.join(self.tempdir, name)
+    if content is not None:
+      with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+  def test_encodes_mapped_files_like_whole_input(self):
+    src = self._path("raw", self.raw)
+    for name, encode in FILE_CODECS:
+      for chunk_size in (1, 7, 1000, codec.FILE_CHUNK_SIZE):
+        dst = io.BytesIO()
+        codec.encode_file(src, dst, name, chunk_size=chunk_size)
+        self.assertEqual(dst.getvalue(), encode(self.raw), (name, chunk_size))
+
+  def test_round_trip_through_paths(self):
+    src = self._path("raw", self.raw)
+    encoded = self._path("encoded")
+    decoded = self._path("decoded")
+    for name, _ in FILE_CODECS:
+      codec.encode_file(src, encoded, name, chunk_size=999)
+      codec.decode_file(encoded, decoded, name, chunk_size=999)
+      with open(decoded, "rb") as f:
+        self.assertEqual(f.read(), self.raw, name)
+
+  def test_unmappable_streams(self):
+    for name, encode in FILE_CODECS:
+      dst = io.BytesIO()
+      codec.encode_file(io.BytesIO(self.raw), dst, name, chunk_size=1001)
+      self.assertEqual(dst.getvalue(), encode(self.raw), name)
+      dst = io.BytesIO()
+      codec.decode_file(io.BytesIO(encode(self.raw)), dst, name,
+                        chunk_size=1001)
+      self.assertEqual(dst.getvalue(), self.raw, name)
+
+  def test_decoding_ignores_line_breaks(self):
+    encoded = codec.base64_encode(self.raw)
+    wrapped = b("\n").join(encoded[i:i + 76]
+                            for i in builtins.range(0, len(encoded), 76))
+    src = self._path("wrapped", wrapped + b("\r\n"))
+    for chunk_size in (5, 77, 4096):
+      dst = io.BytesIO()
+      codec.decode_file(src, dst, "base64", chunk_size=chunk_size)
+      self.assertEqual(dst.getvalue(), self.raw, chunk_size)
+
+  def test_empty_file(self):
+    src = self._path("empty", b(""))
+    for name, _ in FILE_CODECS:
+      dst = io.BytesIO()
+      codec.encode_file(src, dst, name)
+      self.assertEqual(dst.getvalue(), b(""))
+      codec.decode_file(src, dst, name)
+      self.assertEqual(dst.getvalue(), b(""))
+
+  def test_codec_names_are_case_insensitive(self):
+    dst = io.BytesIO()
+    codec.encode_file(io.BytesIO(self.raw), dst, "ASCII85")
+    self.assertEqual(dst.getvalue(), codec.base85_encode(self.raw))
+    dst = io.BytesIO()
+    codec.encode_file(io.BytesIO(self.raw), dst, "Hex")
+    self.assertEqual(dst.getvalue(), codec.hex_encode(self.raw))
+
+  def test_ValueError_when_bad_arguments(self):
+    self.assertRaises(ValueError, codec.encode_file,
+                      io.BytesIO(self.raw), io.BytesIO(), "base58")
+    self.assertRaises(ValueError, codec.decode_file,
+                      io.BytesIO(self.raw), io.BytesIO(), "base64", 0)
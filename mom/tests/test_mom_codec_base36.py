@@ -36,6 +36,9 @@ ZERO_BYTE = _compat.ZERO_BYTE
 
 
 RANDOM_BYTES = random.generate_random_bytes(384)
+# Encodes to well over 4300 digits, which int(encoded, 36) would refuse
+# to parse on newer Python versions.
+LARGE_RANDOM_BYTES = ZERO_BYTE * 3 + random.generate_random_bytes(4099)
 ZERO_BYTES_4 = ZERO_BYTE * 4
 RAW_DATA = b("""\
 \x00\x00\xa4\x97\xf2\x10\xfc\x9c]\x02\xfc}\xc7\xbd!\x1c\xb0\xc7M\xa0\xae\x16\
@@ -108,3 +111,8 @@ class Test_base36_codec(unittest2.TestCase):
       raw_bytes = integer.uint_to_bytes(number)
       self.assertEqual(base36.b36encode(raw_bytes), encoded)
       self.assertEqual(base36.b36decode(encoded), raw_bytes)
+
+  def test_large_input(self):
+    encoded = base36.b36encode(LARGE_RANDOM_BYTES)
+    self.assertEqual(base36.b36decode(encoded), LARGE_RANDOM_BYTES)
+    self.assertEqual(base36.b36decode(encoded.lower()), LARGE_RANDOM_BYTES)
@@ -38,6 +38,8 @@ ZERO_BYTE = _compat.ZERO_BYTE
 
 
 RANDOM_BYTES = random.generate_random_bytes(384)
+# Long enough to go through the divide-and-conquer conversion engine.
+LARGE_RANDOM_BYTES = ZERO_BYTE * 3 + random.generate_random_bytes(4099)
 
 ZERO_BYTES_4 = ZERO_BYTE * 4
 #raw_data = hex_decode(b("005cc87f4a3fdfe3a2346b6953267ca867282630d3f9b78e64"))
@@ -127,3 +129,105 @@ class Test_base58_codec(unittest2.TestCase):
     self.assertRaises(TypeError, _alt_base.b58encode_naive, constants.UNICODE_STRING)
     self.assertRaises(TypeError, base58.b58decode, constants.UNICODE_STRING)
     self.assertRaises(TypeError, _alt_base.b58decode_naive, constants.UNICODE_STRING)
+
+  def test_large_input(self):
+    encoded = base58.b58encode(LARGE_RANDOM_BYTES)
+    self.assertEqual(encoded, _alt_base.b58encode_naive(LARGE_RANDOM_BYTES))
+    self.assertEqual(base58.b58decode(encoded), LARGE_RANDOM_BYTES)
+
+  def test_decode_lengths_around_power_table_boundaries(self):
+    for length in (63, 64, 65, 511, 512, 513):
+      encoded = b("2") + base58.ASCII58_BYTES[-1] * (length - 1)
+      self.assertEqual(base58.b58decode(encoded),
+                       _alt_base.b58decode_naive(encoded))
+
+
+class Test_base58_many(unittest2.TestCase):
+  def setUp(self):
+    self.raw_list = [RAW_DATA, PADDING_RAW, ZERO_BYTE, ZERO_BYTE * 3,
+                     RANDOM_BYTES[:16], RANDOM_BYTES, LARGE_RANDOM_BYTES]
+    self.encoded_list = [base58.b58encode(x) for x in self.raw_list]
+
+  def test_matches_single_item_codec(self):
+    self.assertEqual(base58.b58encode_many(self.raw_list), self.encoded_list)
+    self.assertEqual(base58.b58decode_many(self.encoded_list), self.raw_list)
+    self.assertEqual(codec.base58_encode_many(self.raw_list),
+                     self.encoded_list)
+    self.assertEqual(codec.base58_decode_many(self.encoded_list),
+                     self.raw_list)
+
+  def test_empty(self):
+    self.assertEqual(base58.b58encode_many([]), [])
+    self.assertEqual(base58.b58decode_many([]), [])
+    self.assertEqual(base58.b58encode_many([b("")]), [b("")])
+    self.assertEqual(base58.b58decode_many([b("")]), [b("")])
+
+  def test_ignores_whitespace(self):
+    self.assertEqual(base58.b58decode_many([ENCODED_WITH_WHITESPACE]),
+                     [RAW_DATA])
+
+  def test_workers(self):
+    raw_list = self.raw_list[:-1] * 1000
+    encoded_list = self.encoded_list[:-1] * 1000
+    self.assertEqual(base58.b58encode_many(raw_list, workers=2), encoded_list)
+    self.assertEqual(base58.b58decode_many(encoded_list, workers=2), raw_list)
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, base58.b58encode_many,
+                      [RAW_DATA, constants.UNICODE_STRING])
+    self.assertRaises(TypeError, base58.b58decode_many,
+                      [ENCODED, constants.UNICODE_STRING])
+
+
+class Test_base58_blocks(unittest2.TestCase):
+  def test_codec_identity(self):
+    for length in builtins.range(0, 42):
+      raw_bytes = LARGE_RANDOM_BYTES[:length]
+      encoded = base58.b58encode_blocks(raw_bytes)
+      self.assertEqual(base58.b58decode_blocks(encoded), raw_bytes)
+    encoded = base58.b58encode_blocks(LARGE_RANDOM_BYTES)
+    self.assertEqual(base58.b58decode_blocks(encoded), LARGE_RANDOM_BYTES)
+    self.assertEqual(codec.base58_decode_blocks(
+        codec.base58_encode_blocks(RANDOM_BYTES)), RANDOM_BYTES)
+
+  def test_blocks_are_encoded_independently(self):
+    encoded = base58.b58encode_blocks(LARGE_RANDOM_BYTES)
+    self.assertEqual(len(encoded), 11 * (len(LARGE_RANDOM_BYTES) // 8) + 9)
+    for i in builtins.range(0, 64, 8):
+      self.assertEqual(encoded[i // 8 * 11:(i // 8 + 1) * 11],
+                       base58.b58encode_blocks(LARGE_RANDOM_BYTES[i:i + 8]))
+    self.assertEqual(base58.b58encode_blocks(ZERO_BYTE * 9),
+                     base58.ASCII58_BYTES[0] * 13)
+
+  def test_partial_block_lengths(self):
+    lengths = [len(base58.b58encode_blocks(b("\xff") * size))
+               for size in builtins.range(1, 9)]
+    self.assertEqual(lengths, [2, 3, 5, 6, 7, 9, 10, 11])
+
+  def test_ignores_whitespace(self):
+    encoded = base58.b58encode_blocks(RAW_DATA)
+    spaced = b(" \n").join(encoded[i:i + 7]
+                           for i in builtins.range(0, len(encoded), 7))
+    self.assertEqual(base58.b58decode_blocks(spaced), RAW_DATA)
+
+  def test_workers(self):
+    raw_bytes = LARGE_RANDOM_BYTES * 260
+    encoded = base58.b58encode_blocks(raw_bytes)
+    self.assertEqual(base58.b58encode_blocks(raw_bytes, workers=2), encoded)
+    self.assertEqual(base58.b58decode_blocks(encoded, workers=2), raw_bytes)
+
+  def test_ValueError_when_invalid_input(self):
+    last = base58.ASCII58_BYTES[-1]
+    # Too large for 64 bits.
+    self.assertRaises(ValueError, base58.b58decode_blocks, last * 11)
+    # Too large for 1 byte.
+    self.assertRaises(ValueError, base58.b58decode_blocks, last * 2)
+    # No partial block is 4 characters long.
+    self.assertRaises(ValueError, base58.b58decode_blocks, last * 4)
+    self.assertRaises(ValueError, base58.b58decode_blocks, b("!!"))
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, base58.b58encode_blocks,
+                      constants.UNICODE_STRING)
+    self.assertRaises(TypeError, base58.b58decode_blocks,
+                      constants.UNICODE_STRING)
@@ -34,6 +34,8 @@ __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
 b = builtins.b
 
 RANDOM_BYTES_LEN_512 = random.generate_random_bytes(512)
+# Long enough to go through the divide-and-conquer conversion engine.
+LARGE_RANDOM_BYTES = b("\x00\x00\x00") + random.generate_random_bytes(4099)
 
 ZERO_BYTES = b("\x00\x00\x00\x00")
 ONE_ZERO_BYTE = b("\x00")
@@ -116,3 +118,100 @@ class Test_base62_codec(unittest2.TestCase):
     self.assertRaises(TypeError, _alt_base.b62encode_naive, constants.UNICODE_STRING)
     self.assertRaises(TypeError, base62.b62decode, constants.UNICODE_STRING)
     self.assertRaises(TypeError, _alt_base.b62decode_naive, constants.UNICODE_STRING)
+
+  def test_large_input(self):
+    encoded = base62.b62encode(LARGE_RANDOM_BYTES)
+    self.assertEqual(encoded, _alt_base.b62encode_naive(LARGE_RANDOM_BYTES))
+    self.assertEqual(base62.b62decode(encoded), LARGE_RANDOM_BYTES)
+
+
+class Test_base62_many(unittest2.TestCase):
+  def setUp(self):
+    self.raw_list = [RAW_DATA, PADDING_RAW, ONE_ZERO_BYTE, ONE_ZERO_BYTE * 3,
+                     RANDOM_BYTES_LEN_512[:16], RANDOM_BYTES_LEN_512,
+                     LARGE_RANDOM_BYTES]
+    self.encoded_list = [base62.b62encode(x) for x in self.raw_list]
+
+  def test_matches_single_item_codec(self):
+    self.assertEqual(base62.b62encode_many(self.raw_list), self.encoded_list)
+    self.assertEqual(base62.b62decode_many(self.encoded_list), self.raw_list)
+    self.assertEqual(codec.base62_encode_many(self.raw_list),
+                     self.encoded_list)
+    self.assertEqual(codec.base62_decode_many(self.encoded_list),
+                     self.raw_list)
+
+  def test_empty(self):
+    self.assertEqual(base62.b62encode_many([]), [])
+    self.assertEqual(base62.b62decode_many([]), [])
+    self.assertEqual(base62.b62encode_many([b("")]), [b("")])
+    self.assertEqual(base62.b62decode_many([b("")]), [b("")])
+
+  def test_ignores_whitespace(self):
+    self.assertEqual(base62.b62decode_many([ENCODED_WITH_WHITESPACE]),
+                     [RAW_DATA])
+
+  def test_workers(self):
+    raw_list = self.raw_list[:-1] * 1000
+    encoded_list = self.encoded_list[:-1] * 1000
+    self.assertEqual(base62.b62encode_many(raw_list, workers=2), encoded_list)
+    self.assertEqual(base62.b62decode_many(encoded_list, workers=2), raw_list)
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, base62.b62encode_many,
+                      [RAW_DATA, constants.UNICODE_STRING])
+    self.assertRaises(TypeError, base62.b62decode_many,
+                      [ENCODED, constants.UNICODE_STRING])
+
+
+class Test_base62_blocks(unittest2.TestCase):
+  def test_codec_identity(self):
+    for length in builtins.range(0, 42):
+      raw_bytes = LARGE_RANDOM_BYTES[:length]
+      encoded = base62.b62encode_blocks(raw_bytes)
+      self.assertEqual(base62.b62decode_blocks(encoded), raw_bytes)
+    encoded = base62.b62encode_blocks(LARGE_RANDOM_BYTES)
+    self.assertEqual(base62.b62decode_blocks(encoded), LARGE_RANDOM_BYTES)
+    self.assertEqual(codec.base62_decode_blocks(
+        codec.base62_encode_blocks(RANDOM_BYTES_LEN_512)), RANDOM_BYTES_LEN_512)
+
+  def test_blocks_are_encoded_independently(self):
+    encoded = base62.b62encode_blocks(LARGE_RANDOM_BYTES)
+    self.assertEqual(len(encoded), 11 * (len(LARGE_RANDOM_BYTES) // 8) + 9)
+    for i in builtins.range(0, 64, 8):
+      self.assertEqual(encoded[i // 8 * 11:(i // 8 + 1) * 11],
+                       base62.b62encode_blocks(LARGE_RANDOM_BYTES[i:i + 8]))
+    self.assertEqual(base62.b62encode_blocks(ONE_ZERO_BYTE * 9),
+                     base62.ASCII62_BYTES[0] * 13)
+
+  def test_partial_block_lengths(self):
+    lengths = [len(base62.b62encode_blocks(b("\xff") * size))
+               for size in builtins.range(1, 9)]
+    self.assertEqual(lengths, [2, 3, 5, 6, 7, 9, 10, 11])
+
+  def test_ignores_whitespace(self):
+    encoded = base62.b62encode_blocks(RAW_DATA)
+    spaced = b(" \n").join(encoded[i:i + 7]
+                           for i in builtins.range(0, len(encoded), 7))
+    self.assertEqual(base62.b62decode_blocks(spaced), RAW_DATA)
+
+  def test_workers(self):
+    raw_bytes = LARGE_RANDOM_BYTES * 260
+    encoded = base62.b62encode_blocks(raw_bytes)
+    self.assertEqual(base62.b62encode_blocks(raw_bytes, workers=2), encoded)
+    self.assertEqual(base62.b62decode_blocks(encoded, workers=2), raw_bytes)
+
+  def test_ValueError_when_invalid_input(self):
+    last = base62.ASCII62_BYTES[-1]
+    # Too large for 64 bits.
+    self.assertRaises(ValueError, base62.b62decode_blocks, last * 11)
+    # Too large for 1 byte.
+    self.assertRaises(ValueError, base62.b62decode_blocks, last * 2)
+    # No partial block is 4 characters long.
+    self.assertRaises(ValueError, base62.b62decode_blocks, last * 4)
+    self.assertRaises(ValueError, base62.b62decode_blocks, b("!!"))
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, base62.b62encode_blocks,
+                      constants.UNICODE_STRING)
+    self.assertRaises(TypeError, base62.b62decode_blocks,
+                      constants.UNICODE_STRING)
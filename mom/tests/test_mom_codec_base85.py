@@ -18,11 +18,13 @@
 
 from __future__ import absolute_import
 
+import io
 import os
 import unittest2
 
 from mom import builtins
 from mom.codec import _alt_base
+from mom.codec import _numpy_base85
 from mom.codec import base85
 from mom.tests import constants
 
@@ -150,6 +152,13 @@ class Test_base85_encode(unittest2.TestCase):
   def test_TypeError_on_unicode(self):
     self.assertRaises(TypeError, base85.b85encode, constants.UNICODE_STRING2)
 
+  def test_compacts_only_aligned_zero_groups(self):
+    # "!!" ends the first group and "!!!!&" is the second one.
+    raw = b("\x00n>\xa8\x00\x00\x00\x05")
+    self.assertEqual(base85.b85encode(raw), b("!,b!!!!!!&"))
+    self.assertEqual(base85.b85decode(base85.b85encode(raw)), raw)
+    self.assertEqual(base85.b85encode(b("\x00") * 9), b("zz!!"))
+
 
 class Test_base85_decode(unittest2.TestCase):
   def test_decoder(self):
@@ -188,6 +197,26 @@ class Test_base85_decode(unittest2.TestCase):
   def test_ValueError_when_zero_char_in_middle_of_chunk(self):
     self.assertRaises(ValueError, base85.b85decode, b("zaz"))
 
+  def test_decodes_z_groups_between_whitespace(self):
+    self.assertEqual(base85.b85decode(b("z 9jqo^\nz\tz F*2M7z")),
+                     b("\x00") * 4 + b("Man ") + b("\x00") * 8 + b("sure") +
+                     b("\x00") * 4)
+
+  def test_error_positions_ignore_whitespace(self):
+    try:
+      base85.b85decode(b("<~z9jq z~>"), base85.ASCII85_PREFIX,
+                       base85.ASCII85_SUFFIX)
+    except ValueError as exc:
+      self.assertTrue("at index 6" in str(exc))
+    else:
+      self.fail("ValueError not raised")
+    try:
+      base85.b85decode(b("z 9jqo^ zxy!!!"))
+    except OverflowError as exc:
+      self.assertTrue("at index 7" in str(exc))
+    else:
+      self.fail("OverflowError not raised")
+
 
 class Test_codec(unittest2.TestCase):
   def test_identity(self):
@@ -218,6 +247,125 @@ class Test_codec(unittest2.TestCase):
                       _compact_char=constants.UNICODE_STRING)
 
 
+def _split(data, size):
+  return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class Test_B85Encoder(unittest2.TestCase):
+  def test_matches_one_shot_encoding(self):
+    raw = RANDOM_ODD_BYTES + b("\x00") * 11 + RAW
+    for size in (1, 3, 4, 7, 1000):
+      encoder = base85.B85Encoder(base85.ASCII85_PREFIX, base85.ASCII85_SUFFIX)
+      encoded = b("").join([encoder.update(chunk)
+                            for chunk in _split(raw, size)])
+      encoded += encoder.finalize()
+      self.assertEqual(encoded, base85.b85encode(raw, base85.ASCII85_PREFIX,
+                                                 base85.ASCII85_SUFFIX))
+
+  def test_empty(self):
+    encoder = base85.B85Encoder(base85.ASCII85_PREFIX, base85.ASCII85_SUFFIX)
+    self.assertEqual(encoder.update(b("")), base85.ASCII85_PREFIX)
+    self.assertEqual(encoder.finalize(), base85.ASCII85_SUFFIX)
+
+  def test_ValueError_when_finalized(self):
+    encoder = base85.B85Encoder()
+    encoder.finalize()
+    self.assertRaises(ValueError, encoder.update, b("foo"))
+    self.assertRaises(ValueError, encoder.finalize)
+
+  def test_TypeError_when_not_bytes(self):
+    self.assertRaises(TypeError, base85.B85Encoder().update,
+                      constants.UNICODE_STRING)
+    self.assertRaises(TypeError, base85.B85Encoder, constants.UNICODE_STRING)
+
+
+class Test_B85Decoder(unittest2.TestCase):
+  def test_decodes_in_pieces(self):
+    for size in (1, 2, 5, 6, 1000):
+      decoder = base85.B85Decoder(base85.ASCII85_PREFIX, base85.ASCII85_SUFFIX)
+      decoded = b("").join([decoder.update(chunk) for chunk in
+                            _split(ENCODED_WITH_ENDS_AND_WHITESPACE, size)])
+      decoded += decoder.finalize()
+      self.assertEqual(decoded, RAW)
+
+  def test_expands_zero_groups_across_pieces(self):
+    decoder = base85.B85Decoder()
+    decoded = b("").join([decoder.update(chunk) for chunk in
+                          _split(b("9jqo^zz/c"), 2)])
+    decoded += decoder.finalize()
+    self.assertEqual(decoded, b("Man ") + b("\x00") * 8 + b("."))
+
+  def test_ValueError_when_zero_char_in_middle_of_chunk(self):
+    decoder = base85.B85Decoder()
+    decoder.update(b("za"))
+    self.assertRaises(ValueError, decoder.update, b("z"))
+
+  def test_TypeError_when_not_bytes(self):
+    self.assertRaises(TypeError, base85.B85Decoder().update,
+                      constants.UNICODE_STRING)
+
+
+class Test_streams(unittest2.TestCase):
+  def test_b85_stream_identity(self):
+    raw = RANDOM_ODD_BYTES + b("\x00") * 11 + RAW
+    encoded = b("").join(base85.b85encode_stream(io.BytesIO(raw),
+                                                 chunk_size=99))
+    self.assertEqual(encoded, base85.b85encode(raw))
+    decoded = b("").join(base85.b85decode_stream(io.BytesIO(encoded),
+                                                 chunk_size=101))
+    self.assertEqual(decoded, raw)
+
+  def test_rfc1924_stream_identity(self):
+    encoded = b("").join(base85.rfc1924_b85encode_stream(
+        io.BytesIO(RANDOM_256_BYTES), chunk_size=7))
+    self.assertEqual(encoded, RANDOM_256_MERCURIAL)
+    decoded = b("").join(base85.rfc1924_b85decode_stream(
+        io.BytesIO(RANDOM_256_MERCURIAL), chunk_size=7))
+    self.assertEqual(decoded, RANDOM_256_BYTES)
+
+
+@unittest2.skipUnless(_numpy_base85.HAVE_NUMPY, "requires numpy")
+class Test_numpy_chunks(unittest2.TestCase):
+  def test_matches_pure_encoding(self):
+    for charset in (base85.ASCII85_BYTES, base85.RFC1924_BYTES):
+      for size in (0, 1, 2, 3, 4, 5, 1023, 4096):
+        raw = os.urandom(size)
+        for padding in (False, True):
+          self.assertEqual(
+            _numpy_base85.b85encode_chunks(raw, charset, padding),
+            base85._pure_b85encode_chunks(raw, charset, padding))
+
+  def test_matches_pure_decoding(self):
+    for charset, ords in ((base85.ASCII85_BYTES, base85.ASCII85_ORDS),
+                          (base85.RFC1924_BYTES, base85.RFC1924_ORDS)):
+      for size in (0, 1, 2, 3, 4, 5, 1023, 4096):
+        raw = os.urandom(size)
+        encoded = base85._pure_b85encode_chunks(raw, charset)
+        self.assertEqual(_numpy_base85.b85decode_chunks(encoded, charset),
+                         raw)
+        self.assertEqual(
+          base85._pure_b85decode_chunks(encoded, charset, ords), raw)
+
+  def test_OverflowError_names_bad_chunk(self):
+    valid = base85._pure_b85encode_chunks(os.urandom(4096),
+                                         base85.ASCII85_BYTES)
+    self.assertRaises(OverflowError, _numpy_base85.b85decode_chunks,
+                      valid + b("s8W-\""), base85.ASCII85_BYTES)
+    try:
+      _numpy_base85.b85decode_chunks(valid[:10] + b("~~~~~") + valid,
+                                     base85.ASCII85_BYTES)
+    except OverflowError as exc:
+      self.assertTrue("~~~~~" in str(exc))
+    else:
+      self.fail("OverflowError not raised")
+
+  def test_large_codec_identity(self):
+    raw = os.urandom(1 << 16) + b("\x00") * 8
+    self.assertEqual(base85.b85decode(base85.b85encode(raw)), raw)
+    self.assertEqual(base85.rfc1924_b85decode(base85.rfc1924_b85encode(raw)),
+                     raw)
+
+
 class Test_rfc1924_base85_encoding(unittest2.TestCase):
   def test_encoding(self):
     self.assertEqual(base85.rfc1924_b85encode(MERCURIAL_BYTES), MERCURIAL_ENCODED)
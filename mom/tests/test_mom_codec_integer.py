@@ -18,10 +18,12 @@
 
 from __future__ import absolute_import
 
+import array
 import unittest2
 
 from mom import builtins
 from mom import prime_sieve
+from mom.security import random
 from mom.codec import _alt_integer
 from mom.codec import integer
 from mom.tests import constants
@@ -334,3 +336,130 @@ class Test_uint_to_bytes(unittest2.TestCase):
     self.assertRaises(TypeError, _alt_integer.uint_to_bytes_array_based, None)
     self.assertRaises(TypeError, _alt_integer.uint_to_bytes_naive, None)
     self.assertRaises(TypeError, _alt_integer.uint_to_bytes_naive_array_based, None)
+
+
+class Test_little_endian(unittest2.TestCase):
+  def test_uint_to_bytes(self):
+    self.assertEqual(integer.uint_to_bytes(0xc0ffee, little_endian=True),
+                     b("\xee\xff\xc0"))
+    self.assertEqual(integer.uint_to_bytes(0xc0ffee, fill_size=5,
+                                           little_endian=True),
+                     b("\xee\xff\xc0\x00\x00"))
+    self.assertEqual(integer.uint_to_bytes(0xc0ffee, chunk_size=4,
+                                           little_endian=True),
+                     b("\xee\xff\xc0\x00"))
+    self.assertEqual(integer.uint_to_bytes(LONG_VALUE, little_endian=True),
+                     EXPECTED_BYTES[::-1])
+
+  def test_bytes_to_uint(self):
+    self.assertEqual(integer.bytes_to_uint(b("\xee\xff\xc0\x00"),
+                                           little_endian=True), 0xc0ffee)
+    self.assertEqual(integer.bytes_to_uint(EXPECTED_BYTES[::-1],
+                                           little_endian=True), LONG_VALUE)
+    self.assertEqual(integer.bytes_to_uint(b(""), little_endian=True), 0)
+
+
+class Test_signed_integer_codec(unittest2.TestCase):
+  def test_int_to_bytes(self):
+    self.assertEqual(integer.int_to_bytes(0), b("\x00"))
+    self.assertEqual(integer.int_to_bytes(127), b("\x7f"))
+    self.assertEqual(integer.int_to_bytes(128), b("\x00\x80"))
+    self.assertEqual(integer.int_to_bytes(-1), b("\xff"))
+    self.assertEqual(integer.int_to_bytes(-128), b("\x80"))
+    self.assertEqual(integer.int_to_bytes(-129), b("\xff\x7f"))
+    self.assertEqual(integer.int_to_bytes(-2, fill_size=4), b("\xff") * 3 +
+                     b("\xfe"))
+    self.assertEqual(integer.int_to_bytes(-2, chunk_size=2), b("\xff\xfe"))
+    self.assertEqual(integer.int_to_bytes(-129, little_endian=True),
+                     b("\x7f\xff"))
+    self.assertEqual(integer.int_to_bytes(LONG_VALUE), EXPECTED_BYTES)
+
+  def test_bytes_to_int(self):
+    self.assertEqual(integer.bytes_to_int(b("")), 0)
+    self.assertEqual(integer.bytes_to_int(b("\x7f")), 127)
+    self.assertEqual(integer.bytes_to_int(b("\x80")), -128)
+    self.assertEqual(integer.bytes_to_int(b("\xff\xff\xff\xfe")), -2)
+    self.assertEqual(integer.bytes_to_int(b("\xfe\xff"), little_endian=True),
+                     -2)
+    self.assertEqual(integer.bytes_to_int(bytearray(b("\xff\x7f"))), -129)
+
+  def test_codec_identity(self):
+    for number in (0, 1, -1, 255, -255, 256, -256, 1 << 64, -(1 << 64),
+                   LONG_VALUE, -LONG_VALUE):
+      for little_endian in (False, True):
+        raw_bytes = integer.int_to_bytes(number, little_endian=little_endian)
+        self.assertEqual(integer.bytes_to_int(raw_bytes, little_endian),
+                         number)
+        raw_bytes = integer.int_to_bytes(number, fill_size=64,
+                                         little_endian=little_endian)
+        self.assertEqual(len(raw_bytes), 64)
+        self.assertEqual(integer.bytes_to_int(raw_bytes, little_endian),
+                         number)
+
+  def test_OverflowError_when_fill_size_insufficient(self):
+    self.assertRaises(OverflowError, integer.int_to_bytes, 128, 1)
+    self.assertRaises(OverflowError, integer.int_to_bytes, -129, 1)
+    self.assertEqual(integer.int_to_bytes(-129, 1, overflow=True),
+                     b("\xff\x7f"))
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, integer.int_to_bytes, None)
+    self.assertRaises(TypeError, integer.int_to_bytes, 2.4)
+    self.assertRaises(TypeError, integer.bytes_to_int,
+                      constants.UNICODE_STRING)
+
+
+class Test_fixed_width_fields(unittest2.TestCase):
+  def test_codec_identity(self):
+    for width in (1, 2, 3, 4, 8, 16, 20, 32, 256):
+      raw_bytes = random.generate_random_bytes(width * 50)
+      for little_endian in (False, True):
+        numbers = integer.unpack_uints(raw_bytes, width,
+                                       little_endian=little_endian)
+        self.assertEqual(numbers,
+                         [integer.bytes_to_uint(raw_bytes[i:i + width],
+                                                little_endian)
+                          for i in builtins.range(0, len(raw_bytes), width)])
+        self.assertEqual(bytes(integer.pack_uints(numbers, width,
+                                                  little_endian=little_endian)),
+                         raw_bytes)
+
+  def test_unpack_offset_and_count(self):
+    raw_bytes = b("\xff\x00\x01\x00\x02\x00\x03\xff")
+    self.assertEqual(integer.unpack_uints(raw_bytes, 2, offset=1),
+                     [1, 2, 3])
+    self.assertEqual(integer.unpack_uints(raw_bytes, 3, offset=1, count=1),
+                     [0x000100])
+    self.assertEqual(integer.unpack_uints(raw_bytes, 2, offset=8), [])
+    self.assertEqual(integer.unpack_uints(bytearray(raw_bytes), 2, 1, 2),
+                     [1, 2])
+    self.assertEqual(integer.unpack_uints(array.array("B", raw_bytes), 7),
+                     [0xff000100020003])
+
+  def test_pack_into_buffer(self):
+    out = bytearray(b("\xee") * 8)
+    self.assertTrue(integer.pack_uints([1, 0xfffe], 3, out, offset=1) is out)
+    self.assertEqual(out, bytearray(b("\xee\x00\x00\x01\x00\xff\xfe\xee")))
+    self.assertEqual(integer.pack_uints([], 5), bytearray())
+    self.assertEqual(integer.pack_uints(iter([1, 2]), 2),
+                     bytearray(b("\x00\x01\x00\x02")))
+
+  def test_ValueError_when_bad_arguments(self):
+    self.assertRaises(ValueError, integer.unpack_uints, b("abcd"), 0)
+    self.assertRaises(ValueError, integer.unpack_uints, b("abcd"), 2, 5)
+    self.assertRaises(ValueError, integer.unpack_uints, b("abcd"), 2, 1, 2)
+    self.assertRaises(ValueError, integer.pack_uints, [1, -1], 4)
+    self.assertRaises(ValueError, integer.pack_uints, [1, 2], 4,
+                      bytearray(7))
+    self.assertRaises(ValueError, integer.pack_uints, [1], 4,
+                      bytearray(7), 4)
+
+  def test_OverflowError_when_number_does_not_fit(self):
+    self.assertRaises(OverflowError, integer.pack_uints, [1, 256], 1)
+    self.assertRaises(OverflowError, integer.pack_uints, [1 << 160], 20)
+
+  def test_TypeError_when_bad_type(self):
+    self.assertRaises(TypeError, integer.unpack_uints,
+                      constants.UNICODE_STRING, 1)
+    self.assertRaises(TypeError, integer.unpack_uints, b("abcd"), 2.0)
+    self.assertRaises(TypeError, integer.pack_uints, [1.0], 4)
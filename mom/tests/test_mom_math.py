@@ -18,11 +18,19 @@
 
 from __future__ import absolute_import
 
+import array
+import sys
 import unittest2
 
 
 from mom import _prime_sieve
 from mom import math
+from mom import prime_sieve
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
 
 
 __author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
@@ -41,6 +49,208 @@ class Test__pure_is_prime(unittest2.TestCase):
   def test_non_prime_by_sieve(self):
     self.assertFalse(math._pure_is_prime(100))
 
+  def test_small_numbers(self):
+    primes = set(_prime_sieve.primes_between(0, 120000))
+    for num in range(-2, 120000):
+      self.assertEqual(math._pure_is_prime(num), num in primes, num)
+
+  def test_composites_of_large_primes(self):
+    # 1000003 and 1000033 both pass trial division.
+    self.assertFalse(math._pure_is_prime(1000003 * 1000033))
+    self.assertTrue(math._pure_is_prime(1000003))
+    self.assertTrue(math._pure_is_prime((1 << 127) - 1))
+    self.assertFalse(math._pure_is_prime(((1 << 127) - 1) * 9973))
+    self.assertFalse(math._pure_is_prime(((1 << 127) - 1) * 10007))
+
+  def test_random_bases_on_request(self):
+    self.assertTrue(math._pure_is_prime((1 << 127) - 1, iterations=5))
+    self.assertFalse(math._pure_is_prime(1000003 * 1000033, iterations=5))
+
+
+class Test_is_probable_prime(unittest2.TestCase):
+  def test_small_numbers(self):
+    primes = set(_prime_sieve.primes_between(0, 50000))
+    for num in range(2, 50000):
+      self.assertEqual(math._is_probable_prime(num), num in primes, num)
+
+  def test_deterministic_bounds(self):
+    # Each bound is a strong pseudoprime to all the bases of its tier.
+    for bound, _ in math._DETERMINISTIC_BASES:
+      self.assertFalse(math._is_probable_prime(bound), bound)
+
+  def test_baillie_psw(self):
+    self.assertTrue(math._is_probable_prime((1 << 521) - 1))
+    self.assertFalse(math._is_probable_prime((1 << 523) - 1))
+    self.assertFalse(math._is_probable_prime(((1 << 89) - 1) ** 2))
+    self.assertFalse(math._is_probable_prime(
+        ((1 << 89) - 1) * ((1 << 107) - 1)))
+
+  def test_strong_lucas_pseudoprimes(self):
+    primes = set(_prime_sieve.primes_between(0, 100000))
+    pseudoprimes = [num for num in range(5, 100000, 2)
+                    if math._is_strong_lucas_prime(num) and num not in primes]
+    self.assertEqual(pseudoprimes, [5459, 5777, 10877, 16109, 18971, 22499,
+                                    24569, 25199, 40309, 58519, 75077, 97439])
+
+  def test_jacobi(self):
+    self.assertEqual(math._jacobi(1001, 9907), -1)
+    self.assertEqual(math._jacobi(19, 45), 1)
+    self.assertEqual(math._jacobi(8, 21), -1)
+    self.assertEqual(math._jacobi(5, 21), 1)
+    self.assertEqual(math._jacobi(6, 21), 0)
+
+
+class Test_is_prime_many(unittest2.TestCase):
+  def setUp(self):
+    self.numbers = list(range(-5, 30000)) + [
+        (1 << 61) - 1, (1 << 64) - 59, (1 << 64) - 1, 1000003 * 1000033,
+        (1 << 127) - 1, ((1 << 127) - 1) * 10007]
+    self.expected = [math.is_prime(num) for num in self.numbers]
+
+  def test_list(self):
+    self.assertEqual(math.is_prime_many(self.numbers), self.expected)
+    self.assertEqual(math.is_prime_many([]), [])
+
+  def test_workers(self):
+    self.assertEqual(math.is_prime_many(self.numbers, workers=2),
+                     self.expected)
+
+  def test_array(self):
+    numbers = array.array("l", range(-5, 30000))
+    self.assertEqual(math.is_prime_many(numbers), self.expected[:30005])
+
+
+@unittest2.skipUnless(numpy, "requires numpy")
+class Test_numpy_is_prime_many(unittest2.TestCase):
+  def test_signed(self):
+    numbers = numpy.arange(-5, 30000, dtype=numpy.int64)
+    result = math.is_prime_many(numbers)
+    self.assertEqual(result.dtype, bool)
+    self.assertEqual(result.tolist(),
+                     [math.is_prime(int(num)) for num in numbers])
+
+  def test_uint64(self):
+    numbers = [(1 << 61) - 1, (1 << 64) - 59, (1 << 64) - 1,
+               1000003 * 1000033, 9973 * 10007, 10007 * 10009, 9973, 2, 0]
+    result = math.is_prime_many(numpy.array(numbers,
+                                                 dtype=numpy.uint64))
+    self.assertEqual(result.tolist(), [math.is_prime(num) for num in numbers])
+
+  def test_object(self):
+    numbers = [(1 << 127) - 1, (1 << 127) + 1, 7, 1]
+    result = math.is_prime_many(numpy.array(numbers, dtype=object))
+    self.assertEqual(result.tolist(), [True, False, True, False])
+
+  def test_array_when_numpy_imported(self):
+    self.assertTrue("numpy" in sys.modules)
+    numbers = array.array("L", range(30000))
+    self.assertEqual(math.is_prime_many(numbers),
+                     [math.is_prime(num) for num in numbers])
+
+
+class Test_small_primes(unittest2.TestCase):
+  def test_table_is_ordered(self):
+    self.assertEqual(list(math._SMALL_PRIMES), sorted(prime_sieve.SIEVE))
+    self.assertEqual(math._SMALL_PRIMES.typecode, "H")
+
+  def test_has_small_factor(self):
+    for prime in (2, 3, 251, 257, 9973):
+      self.assertTrue(math._has_small_factor(prime * 10007))
+    self.assertFalse(math._has_small_factor(10007 * 10009))
+
+
+class Test_iter_primes(unittest2.TestCase):
+  def setUp(self):
+    self.primes = sorted(prime_sieve.SIEVE)
+
+  def test_matches_table(self):
+    self.assertEqual(list(math.iter_primes(0, 10000)), self.primes)
+    self.assertEqual(_prime_sieve.make_prime_sieve(10000), self.primes)
+
+  def test_ranges(self):
+    for low, high in [(0, 0), (2, 2), (2, 3), (3, 3), (0, 2), (4, 5),
+                      (5, 6), (7919, 7920), (90, 97), (90, 98), (1000, 3000)]:
+      self.assertEqual(list(math.iter_primes(low, high)),
+                       [p for p in self.primes if low <= p < high])
+
+  def test_small_segments(self):
+    for segment_size in (1, 2, 3, 5, 8):
+      self.assertEqual(_prime_sieve.primes_between(500, 9000, segment_size),
+                       [p for p in self.primes if 500 <= p < 9000])
+
+  def test_unbounded(self):
+    primes = []
+    for prime in math.iter_primes(segment_size=1):
+      if prime >= 10000:
+        break
+      primes.append(prime)
+    self.assertEqual(primes, self.primes)
+
+  def test_far_window(self):
+    low = 10 ** 12
+    primes = _prime_sieve.primes_between(low, low + 2000)
+    self.assertEqual(primes[:3], [1000000000039, 1000000000061,
+                                  1000000000063])
+    for prime in primes:
+      self.assertTrue(math.is_prime(prime))
+    composites = set(range(low, low + 2000)) - set(primes)
+    for number in range(low + 1, low + 2000, 2):
+      if number in composites:
+        self.assertFalse(math.is_prime(number))
+
+  def test_invalid_segment_size(self):
+    self.assertRaises(ValueError, list, math.iter_primes(0, 100, 0))
+
+
+class Test_prime_pi(unittest2.TestCase):
+  def setUp(self):
+    self.primes = sorted(prime_sieve.SIEVE)
+
+  def test_small(self):
+    for num in list(range(-3, 200)) + [997, 7919, 7920, 9999]:
+      expected = len([p for p in self.primes if p <= num])
+      self.assertEqual(math.prime_pi(num), expected)
+      self.assertEqual(_prime_sieve.count_primes(0, num + 1), expected)
+
+  def test_pure_matches_sieve(self):
+    for num in (10 ** 5, 123457, 10 ** 6):
+      self.assertEqual(_prime_sieve._pure_prime_pi(num),
+                       _prime_sieve.count_primes(0, num + 1))
+
+  @unittest2.skipUnless(numpy, "requires numpy")
+  def test_numpy_matches_pure(self):
+    for num in (10 ** 5, 123457, 10 ** 7 + 1):
+      self.assertEqual(_prime_sieve._numpy_prime_pi(numpy, num),
+                       _prime_sieve._pure_prime_pi(num))
+
+  def test_known_values(self):
+    self.assertEqual(math.prime_pi(10 ** 8), 5761455)
+    self.assertEqual(math.prime_pi(10 ** 9), 50847534)
+
+  def test_count_primes(self):
+    for low, high in [(0, 0), (2, 3), (3, 3), (4, 5), (90, 97), (90, 98),
+                      (1000, 9000)]:
+      self.assertEqual(_prime_sieve.count_primes(low, high),
+                       len([p for p in self.primes if low <= p < high]))
+    self.assertEqual(_prime_sieve.count_primes(500, 9000, 1),
+                     len([p for p in self.primes if 500 <= p < 9000]))
+
+
+class Test_nth_prime(unittest2.TestCase):
+  def test_table(self):
+    primes = sorted(prime_sieve.SIEVE)
+    for index in range(1, len(primes) + 1):
+      self.assertEqual(math.nth_prime(index), primes[index - 1])
+
+  def test_known_values(self):
+    self.assertEqual(math.nth_prime(10 ** 6), 15485863)
+    self.assertEqual(math.nth_prime(50847534), 999999937)
+    self.assertEqual(math.nth_prime(50847535), 1000000007)
+
+  def test_invalid_index(self):
+    self.assertRaises(ValueError, math.nth_prime, 0)
+    self.assertRaises(ValueError, math.nth_prime, -1)
+
 
 class Test_generate_random_prime(unittest2.TestCase):
   def test_generate_random_prime(self):
@@ -48,11 +258,130 @@ class Test_generate_random_prime(unittest2.TestCase):
       self.assertTrue(math.is_prime(math.generate_random_prime(64)))
 
 
+  def test_bit_length(self):
+    for bits in (10, 14, 16, 64, 256):
+      for _ in range(10):
+        prime = math.generate_random_prime(bits)
+        self.assertEqual(prime.bit_length(), bits)
+        self.assertTrue(prime >> (bits - 2) == 3)
+
+
+  def test_workers(self):
+    primes = set(math.generate_random_prime(128, workers=2) for _ in range(3))
+    for prime in primes:
+      self.assertEqual(prime.bit_length(), 128)
+      self.assertTrue(math.is_prime(prime))
+    self.assertEqual(len(primes), 3)
+
+
 class Test_generate_random_safe_prime(unittest2.TestCase):
   def test_generate_random_safe_prime(self):
     for _ in range(20):
       self.assertTrue(math.is_prime(math.generate_random_safe_prime(32)))
 
+  def test_safe_prime(self):
+    for bits in (10, 16, 64, 128):
+      prime = math.generate_random_safe_prime(bits)
+      self.assertEqual(prime.bit_length(), bits)
+      self.assertTrue(math.is_prime(prime))
+      self.assertTrue(math.is_prime((prime - 1) // 2))
+
+  def test_workers(self):
+    prime = math.generate_random_safe_prime(64, workers=2)
+    self.assertEqual(prime.bit_length(), 64)
+    self.assertTrue(math.is_prime(prime))
+    self.assertTrue(math.is_prime((prime - 1) // 2))
+
+
+class Test_prime_candidates(unittest2.TestCase):
+  def test_sieve_window(self):
+    primes = math._SMALL_PRIMES[1:]
+    start = (1 << 64) + 1
+    residues = [start % prime for prime in primes]
+    for safe in (False, True):
+      sieve = math._sieve_window(residues, primes, 1000, safe)
+      for i, survivor in enumerate(sieve):
+        candidate = start + 2 * i
+        expected = not math._has_small_factor(candidate)
+        if safe:
+          expected = expected and not math._has_small_factor(2 * candidate + 1)
+        self.assertEqual(bool(survivor), expected)
+
+  def test_candidates_in_range(self):
+    low, high = 3 << 40, 1 << 42
+    candidates = math._prime_candidates(low, high, window=64)
+    for _ in range(500):
+      candidate = next(candidates)
+      self.assertTrue(low <= candidate < high)
+      self.assertFalse(math._has_small_factor(candidate))
+
+  def test_candidates_wrap_at_high(self):
+    # The window overruns high, so new starts must be picked.
+    low, high = 20000, 20100
+    candidates = math._prime_candidates(low, high)
+    seen = set(next(candidates) for _ in range(200))
+    self.assertTrue(seen <= set(_prime_sieve.primes_between(low, high)))
+
+
+class Test_PowModContext(unittest2.TestCase):
+  def test_matches_pow(self):
+    modulus = (1 << 127) - 1
+    context = math.PowModContext(3, modulus)
+    for exponent in (0, 1, 2, 63, 64, 65, (1 << 127) - 2, 12345 << 100):
+      self.assertEqual(context.pow(exponent), pow(3, exponent, modulus))
+
+  def test_small_windows(self):
+    modulus = 1000003 * 1000033
+    for window in (1, 2, 3, 7):
+      context = math.PowModContext(7, modulus, window=window)
+      for exponent in range(0, 5000, 37):
+        self.assertEqual(context.pow(exponent), pow(7, exponent, modulus))
+
+  def test_grows_for_large_exponents(self):
+    context = math.PowModContext(5, 10007, exponent_bits=8)
+    exponent = 1 << 200 | 12345
+    self.assertEqual(context.pow(exponent), pow(5, exponent, 10007))
+
+  def test_negative_exponent(self):
+    context = math.PowModContext(5, 10007)
+    self.assertEqual(context.pow(-3) * pow(5, 3, 10007) % 10007, 1)
+    self.assertRaises(ValueError, math.PowModContext(6, 9).pow, -1)
+
+  def test_invalid_arguments(self):
+    self.assertRaises(ValueError, math.PowModContext, 2, 0)
+    self.assertRaises(ValueError, math.PowModContext, 2, 7, window=0)
+
+  def test_unit_modulus(self):
+    self.assertEqual(math.PowModContext(3, 1).pow(5), 0)
+
+
+class Test_multi_pow_mod(unittest2.TestCase):
+  def test_matches_pow(self):
+    modulus = (1 << 127) - 1
+    for exponents in ([0, 0], [1, 0], [0, 1], [12345, 1 << 126],
+                      [(1 << 127) - 2, 3]):
+      self.assertEqual(math.multi_pow_mod([3, 5], exponents, modulus),
+                       pow(3, exponents[0], modulus) *
+                       pow(5, exponents[1], modulus) % modulus)
+
+  def test_many_bases(self):
+    modulus = 1000003 * 1000033
+    bases = [2, 3, 5, 7, 11]
+    exponents = [10, 200, 3000, 40000, 500000]
+    expected = 1
+    for base, exponent in zip(bases, exponents):
+      expected = expected * pow(base, exponent, modulus) % modulus
+    self.assertEqual(math.multi_pow_mod(bases, exponents, modulus), expected)
+    self.assertEqual(math.multi_pow_mod([], [], modulus), 1)
+
+  def test_negative_exponent(self):
+    self.assertEqual(math.multi_pow_mod([5, 3], [-3, 2], 10007) *
+                     pow(5, 3, 10007) % 10007, 9)
+    self.assertRaises(ValueError, math.multi_pow_mod, [6], [-1], 9)
+
+  def test_mismatched_lengths(self):
+    self.assertRaises(ValueError, math.multi_pow_mod, [2, 3], [1], 7)
+
 
 class Test_gcd(unittest2.TestCase):
   def test_gcd(self):
@@ -62,6 +391,96 @@ class Test_gcd(unittest2.TestCase):
     self.assertEqual(math.gcd(24, 54), 6)
 
 
+class Test_inverse_mod_many(unittest2.TestCase):
+  def test_matches_inverse_mod(self):
+    modulus = (1 << 127) - 1
+    values = [1, 2, 3, modulus - 1, 1 << 100, 12345678901234567890]
+    self.assertEqual(math.inverse_mod_many(values, modulus),
+                     [math.inverse_mod(value, modulus) for value in values])
+
+  def test_values_without_inverse(self):
+    modulus = 1000 * 1001
+    values = list(range(200)) + [modulus, modulus + 7]
+    self.assertEqual(math.inverse_mod_many(values, modulus),
+                     [math.inverse_mod(value % modulus, modulus)
+                      for value in values])
+
+  def test_reduces_values(self):
+    self.assertEqual(math.inverse_mod_many([-1, 12], 11), [10, 1])
+
+  def test_empty(self):
+    self.assertEqual(math.inverse_mod_many([], 7), [])
+
+
+class Test_CRTContext(unittest2.TestCase):
+  def test_combine(self):
+    context = math.CRTContext([3, 5, 7])
+    self.assertEqual(context.modulus, 105)
+    self.assertEqual(context.combine([2, 3, 2]), 23)
+    for num in range(105):
+      self.assertEqual(context.combine(context.split(num)), num)
+
+  def test_large_moduli(self):
+    moduli = [(1 << 61) - 1, (1 << 89) - 1, (1 << 107) - 1]
+    context = math.CRTContext(moduli)
+    num = 1 << 250 | 123456789
+    self.assertEqual(context.split(num), [num % modulus for modulus in moduli])
+    self.assertEqual(context.combine(context.split(num)), num)
+
+  def test_invalid_moduli(self):
+    self.assertRaises(ValueError, math.CRTContext, [])
+    self.assertRaises(ValueError, math.CRTContext, [6, 9])
+    self.assertRaises(ValueError, math.CRTContext, [5, 0])
+
+  def test_residue_count(self):
+    self.assertRaises(ValueError, math.CRTContext([3, 5]).combine, [1])
+
+
+class Test_batch_gcd(unittest2.TestCase):
+  def setUp(self):
+    primes = [math.generate_random_prime(128) for _ in range(80)]
+    self.moduli = [primes[2 * i] * primes[2 * i + 1] for i in range(36)]
+    # A prime shared by three keys, and a key duplicated outright.
+    self.shared = primes[72]
+    for i, other in ((3, primes[73]), (17, primes[74]), (30, primes[75])):
+      self.moduli[i] = self.shared * other
+    self.moduli[9] = self.moduli[21] = primes[76] * primes[77]
+    self.expected = [1] * 36
+    for i in (3, 17, 30):
+      self.expected[i] = self.shared
+    self.expected[9] = self.expected[21] = self.moduli[9]
+
+  def test_planted_factors(self):
+    self.assertEqual(math.batch_gcd(self.moduli), self.expected)
+
+  def test_matches_pairwise_gcd(self):
+    for i, factor in enumerate(math.batch_gcd(self.moduli)):
+      product = 1
+      for j, modulus in enumerate(self.moduli):
+        if j != i:
+          product *= modulus
+      self.assertEqual(factor, math.gcd(self.moduli[i], product))
+
+  def test_workers(self):
+    self.assertEqual(math.batch_gcd(self.moduli, workers=3), self.expected)
+
+  def test_small_inputs(self):
+    self.assertEqual(math.batch_gcd([]), [])
+    self.assertEqual(math.batch_gcd([15]), [1])
+    self.assertEqual(math.batch_gcd([15, 21, 22]), [3, 3, 1])
+    self.assertRaises(ValueError, math.batch_gcd, [15, 0])
+
+
+class Test_recursive_mod(unittest2.TestCase):
+  def test_matches_builtin(self):
+    dividend = (3 ** 40000) | 1
+    for bits in (100, 4000, 4001, 9999, 31000):
+      divisor = (1 << (bits - 1)) | (7 ** 9000 % (1 << bits))
+      self.assertEqual(math._recursive_mod(dividend, divisor),
+                       dividend % divisor)
+    self.assertEqual(math._recursive_mod(5, 1 << 5000), 5)
+
+
 class Test_lcm(unittest2.TestCase):
   def test_lcm(self):
     self.assertEqual(math.lcm(4, 6), 12)
@@ -69,6 +488,51 @@ class Test_lcm(unittest2.TestCase):
     self.assertEqual(math.lcm(21, 6), 42)
 
 
+class Test_factorize(unittest2.TestCase):
+  def assertFactors(self, num, factors):
+    product = 1
+    for factor in factors:
+      self.assertTrue(math.is_prime(factor))
+      product *= factor
+    self.assertEqual(product, num)
+    self.assertEqual(factors, sorted(factors))
+
+  def test_small(self):
+    self.assertEqual(math.factorize(1), [])
+    for num in range(2, 3000):
+      self.assertFactors(num, math.factorize(num))
+
+  def test_known_values(self):
+    self.assertEqual(math.factorize(2 ** 61 - 1), [2 ** 61 - 1])
+    self.assertEqual(math.factorize(2 ** 64 + 1), [274177, 67280421310721])
+    self.assertEqual(math.factorize(10 ** 30 + 1),
+                     [61, 101, 3541, 9901, 27961, 4188901, 39526741])
+    self.assertEqual(math.factorize(998244353 * 1000000007),
+                     [998244353, 1000000007])
+
+  def test_powers(self):
+    self.assertEqual(math.factorize(3 ** 40), [3] * 40)
+    self.assertEqual(math.factorize(65537 ** 3 * 65539),
+                     [65537] * 3 + [65539])
+    self.assertEqual(math.factorize((2 ** 31 - 1) ** 2), [2 ** 31 - 1] * 2)
+    self.assertEqual(math.factorize(1000003 ** 6), [1000003] * 6)
+
+  def test_ecm(self):
+    primes = [math.generate_random_prime(36) for _ in range(2)]
+    self.assertEqual(math._pollard_brent(primes[0] * primes[1], 1000), None)
+    self.assertFactors(primes[0] * primes[1],
+                       math.factorize(primes[0] * primes[1]))
+    self.assertTrue(math._ecm(primes[0] * primes[1]) in primes)
+
+  def test_ecm_workers(self):
+    primes = [math.generate_random_prime(36) for _ in range(2)]
+    self.assertTrue(math._ecm(primes[0] * primes[1], workers=2) in primes)
+
+  def test_ValueError_when_not_positive(self):
+    self.assertRaises(ValueError, math.factorize, 0)
+    self.assertRaises(ValueError, math.factorize, -6)
+
+
 class Test_exact_log2(unittest2.TestCase):
   def test_ValueError_when_not_found(self):
     self.assertRaises(ValueError, math.exact_log2, 7)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import io
+import os
+import shutil
+import tempfile
+import unittest2
+
+from mom import _prime_sieve
+from mom import builtins
+from mom import prime_sieve
+
+
+__author__ = "yesudeep@google.com (Yesudeep Mangalapilly)"
+
+
+def _make_table(limit):
+  stream = io.BytesIO()
+  prime_sieve.write_prime_table(stream, limit)
+  return stream.getvalue()
+
+
+class Test_default_table(unittest2.TestCase):
+  def setUp(self):
+    self.table = prime_sieve.load_prime_table()
+
+  def test_shared(self):
+    self.assertTrue(prime_sieve.load_prime_table() is self.table)
+    self.assertEqual(self.table.limit, prime_sieve.DEFAULT_LIMIT)
+
+  def test_matches_sieve(self):
+    self.assertEqual(list(self.table.iter_primes()),
+                     _prime_sieve.primes_between(0, self.table.limit))
+
+  def test_small_sieve(self):
+    self.assertEqual(prime_sieve.SIEVE,
+                     set(_prime_sieve.primes_between(0, 10000)))
+
+  def test_is_prime(self):
+    primes = set(_prime_sieve.primes_between(0, 20000))
+    for num in range(-3, 20000):
+      self.assertEqual(self.table.is_prime(num), num in primes, num)
+    self.assertTrue(self.table.is_prime(1048573))
+    self.assertFalse(self.table.is_prime(1048575))
+    self.assertRaises(ValueError, self.table.is_prime, self.table.limit)
+
+  def test_ranges(self):
+    primes = _prime_sieve.primes_between(0, 3000)
+    for low, high in [(0, 0), (2, 3), (3, 3), (0, 2), (4, 5), (5, 6),
+                      (15, 18), (16, 17), (17, 18), (90, 98), (1000, 3000)]:
+      self.assertEqual(list(self.table.iter_primes(low, high)),
+                       [p for p in primes if low <= p < high])
+    self.assertRaises(ValueError, list,
+                      self.table.iter_primes(0, self.table.limit + 1))
+
+
+class Test_write_prime_table(unittest2.TestCase):
+  def test_limits(self):
+    for limit in (0, 1, 2, 3, 4, 5, 16, 17, 18, 100, 12345):
+      table = prime_sieve.PrimeTable(_make_table(limit))
+      self.assertEqual(table.limit, limit)
+      self.assertEqual(list(table.iter_primes()),
+                       _prime_sieve.primes_between(0, limit))
+
+  def test_segments(self):
+    # More than one sieve segment.
+    limit = (_prime_sieve.SEGMENT_SIZE << 5) + 101
+    table = prime_sieve.PrimeTable(_make_table(limit))
+    self.assertEqual(list(table.iter_primes(limit - 5000)),
+                     _prime_sieve.primes_between(limit - 5000, limit))
+
+  def test_load_file(self):
+    directory = tempfile.mkdtemp()
+    try:
+      path = os.path.join(directory, "primes.bin")
+      stream = open(path, "wb")
+      try:
+        stream.write(_make_table(100000))
+      finally:
+        stream.close()
+      table = prime_sieve.load_prime_table(path)
+      self.assertEqual(table.limit, 100000)
+      self.assertTrue(table.is_prime(99991))
+      self.assertFalse(table.is_prime(99993))
+    finally:
+      shutil.rmtree(directory)
+
+  def test_invalid_tables(self):
+    data = _make_table(1000)
+    self.assertRaises(ValueError, prime_sieve.PrimeTable, data[:10])
+    self.assertRaises(ValueError, prime_sieve.PrimeTable, data[:-1])
+    self.assertRaises(ValueError, prime_sieve.PrimeTable,
+                      builtins.b("X") + data[1:])
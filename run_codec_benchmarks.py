@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 Google Inc. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Size-scaling codec benchmarks with regression gates.
+
+Examples::
+
+    # Record a baseline.
+    python run_codec_benchmarks.py --output baseline.json
+
+    # Later: fail (exit status 1) if anything got more than 25% slower or
+    # its complexity exponent grew.
+    python run_codec_benchmarks.py --baseline baseline.json --threshold 0.25
+
+See :mod:`mom.tests.scaling` for what is measured.
+"""
+
+from __future__ import absolute_import
+
+import json
+import optparse
+import sys
+
+from mom.tests import scaling
+
+
+def _format_bytes(size):
+  for unit in ("B", "KB", "MB", "GB"):
+    if size < 1024 or unit == "GB":
+      return "%d %s" % (size, unit)
+    size >>= 10
+
+
+def _print_sweep(name, operation, result):
+  exponent = result["exponent"]
+  print("%-16s %-7s exponent %s" %
+        (name, operation, "n/a" if exponent is None else "%.2f" % exponent))
+  for size, secs, rate, peak in zip(result["sizes"], result["seconds"],
+                                    result["mb_per_s"], result["peak_bytes"]):
+    print("    %8s  %12.6f s  %10.2f MB/s  peak %s" %
+          (_format_bytes(size), secs, rate or 0,
+           "n/a" if peak is None else _format_bytes(peak)))
+  sys.stdout.flush()
+
+
+def main(argv=None):
+  parser = optparse.OptionParser(usage="%prog [options]")
+  parser.add_option("--codec", action="append", dest="codecs", default=[],
+                    help="benchmark only this codec (repeatable); one of: " +
+                    ", ".join(name for name, _, _ in scaling.CODECS))
+  parser.add_option("--min-size", type="int", default=scaling.MIN_SIZE,
+                    help="smallest input in bytes [%default]")
+  parser.add_option("--max-size", type="int", default=scaling.MAX_SIZE,
+                    help="largest input in bytes [%default]")
+  parser.add_option("--factor", type="int", default=scaling.GROWTH_FACTOR,
+                    help="ratio between consecutive sizes [%default]")
+  parser.add_option("--min-time", type="float", default=scaling.MIN_TIME,
+                    help="seconds per timing measurement [%default]")
+  parser.add_option("--max-seconds", type="float",
+                    default=scaling.MAX_SECONDS,
+                    help="stop a sweep after a call slower than this "
+                    "[%default]")
+  parser.add_option("--no-memory", action="store_false", dest="memory",
+                    default=True, help="skip peak allocation measurements")
+  parser.add_option("--output", metavar="FILE",
+                    help="write JSON results to FILE")
+  parser.add_option("--baseline", metavar="FILE",
+                    help="compare against JSON results in FILE")
+  parser.add_option("--threshold", type="float",
+                    default=scaling.SLOWDOWN_THRESHOLD,
+                    help="accepted relative slowdown per size [%default]")
+  parser.add_option("--exponent-threshold", type="float",
+                    default=scaling.EXPONENT_THRESHOLD,
+                    help="accepted growth of the complexity exponent "
+                    "[%default]")
+  options, args = parser.parse_args(argv)
+  if args:
+    parser.error("unexpected arguments: %s" % " ".join(args))
+
+  codecs = scaling.CODECS
+  if options.codecs:
+    unknown = set(options.codecs) - set(name for name, _, _ in codecs)
+    if unknown:
+      parser.error("unknown codecs: %s" % ", ".join(sorted(unknown)))
+    codecs = [entry for entry in codecs if entry[0] in options.codecs]
+
+  print("Python %s" % sys.version)
+  results = scaling.run(codecs,
+                        scaling.geometric_sizes(options.min_size,
+                                                options.max_size,
+                                                options.factor),
+                        min_time=options.min_time,
+                        max_seconds=options.max_seconds,
+                        measure_memory=options.memory,
+                        progress=_print_sweep)
+  if options.output:
+    with open(options.output, "w") as output:
+      json.dump(results, output, indent=2, sort_keys=True)
+
+  if options.baseline:
+    with open(options.baseline) as baseline_file:
+      baseline = json.load(baseline_file)
+    regressions = scaling.compare(results, baseline, options.threshold,
+                                  options.exponent_threshold)
+    if regressions:
+      print("\nRegressions against %s:" % options.baseline)
+      for regression in regressions:
+        print("  " + regression)
+      return 1
+    print("\nNo regressions against %s." % options.baseline)
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
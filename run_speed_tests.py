@@ -42,10 +42,35 @@ setups = [
   "from mom.codec.base62 import b62encode; import os; b = os.urandom(60)",
   "from mom.codec._alt_base import b62encode_naive; import os; b = os.urandom(60)",
   None,
+  "from mom.codec.base58 import b58encode; import os; b = os.urandom(16384)",
+  "from mom.codec.base58 import b58decode, b58encode; import os; b = b58encode(os.urandom(16384))",
+  "from mom.codec.base58 import b58encode; import os; b = os.urandom(65536)",
+  "from mom.codec.base58 import b58decode, b58encode; import os; b = b58encode(os.urandom(65536))",
+  "from mom.codec.base58 import b58encode; import os; b = os.urandom(262144)",
+  "from mom.codec.base58 import b58decode, b58encode; import os; b = b58encode(os.urandom(262144))",
+  "from mom.codec.base58 import b58encode_blocks; import os; b = os.urandom(262144)",
+  "from mom.codec.base58 import b58decode_blocks, b58encode_blocks; import os; b = b58encode_blocks(os.urandom(262144))",
+  "from mom.codec.base62 import b62encode_blocks; import os; b = os.urandom(262144)",
+  "from mom.codec.base62 import b62decode_blocks, b62encode_blocks; import os; b = b62encode_blocks(os.urandom(262144))",
+  None,
+  "from mom.codec.base58 import b58encode; import os; l = [os.urandom(24) for _ in range(1000)]",
+  "from mom.codec.base58 import b58encode_many; import os; l = [os.urandom(24) for _ in range(1000)]",
+  "from mom.codec.base58 import b58decode, b58encode; import os; l = [b58encode(os.urandom(24)) for _ in range(1000)]",
+  "from mom.codec.base58 import b58decode_many, b58encode; import os; l = [b58encode(os.urandom(24)) for _ in range(1000)]",
+  "from mom.codec.base62 import b62encode; import os; l = [os.urandom(24) for _ in range(1000)]",
+  "from mom.codec.base62 import b62encode_many; import os; l = [os.urandom(24) for _ in range(1000)]",
+  "from mom.codec.base62 import b62decode, b62encode; import os; l = [b62encode(os.urandom(24)) for _ in range(1000)]",
+  "from mom.codec.base62 import b62decode_many, b62encode; import os; l = [b62encode(os.urandom(24)) for _ in range(1000)]",
+  None,
   "from mom.codec.base85 import b85encode; import os; b = os.urandom(256)",
   "from mom.codec.base85 import b85decode, b85encode; import os; b = b85encode(os.urandom(256))",
   "from mom.codec.base85 import b85encode; import os; b = os.urandom(3079)",
   "from mom.codec.base85 import b85decode, b85encode; import os; b = b85encode(os.urandom(3079))",
+  "from mom.codec.base85 import b85encode; import os; b = os.urandom(1048576)",
+  "from mom.codec.base85 import b85decode, b85encode; import os; b = b85encode(os.urandom(1048576))",
+  "from mom.codec.base85 import _pure_b85encode_chunks, ASCII85_BYTES; import os; b = os.urandom(1048576)",
+  "from mom.codec.base85 import _pure_b85decode_chunks, _pure_b85encode_chunks, ASCII85_BYTES, ASCII85_ORDS; import os; b = _pure_b85encode_chunks(os.urandom(1048576), ASCII85_BYTES)",
+  "from mom.codec.base85 import b85decode, b85encode; from mom.builtins import b; import os; b = b85encode(b('').join(os.urandom(8) + b('\\x00') * 56 for _ in range(4096)))",
   None,
   "from mom.codec.base85 import ipv6_b85encode; ip = 21932261930451111902915077091070067066",
   "from mom.codec._alt_base import ipv6_b85encode_naive; ip = 21932261930451111902915077091070067066",
@@ -57,6 +82,42 @@ setups = [
   "from mom.codec.base85 import rfc1924_b85encode; import os; b = os.urandom(3079)",
   "from mom.codec.base85 import rfc1924_b85decode, rfc1924_b85encode; import os; b = rfc1924_b85encode(os.urandom(3079))",
   None,
+  "import os, tempfile; from mom.codec import encode_file; fd, path = tempfile.mkstemp(); os.write(fd, os.urandom(8 << 20)); os.close(fd); out = open(os.devnull, 'wb')",
+  "import os, tempfile; from mom.codec import encode_file; fd, path = tempfile.mkstemp(); os.write(fd, os.urandom(8 << 20)); os.close(fd); out = open(os.devnull, 'wb')",
+  "import binascii, os, tempfile; from mom.codec import decode_file; fd, path = tempfile.mkstemp(); os.write(fd, binascii.hexlify(os.urandom(6 << 20))); os.close(fd); out = open(os.devnull, 'wb')",
+  None,
+  "from mom._prime_sieve import primes_between",
+  "from mom._prime_sieve import primes_between",
+  "from mom._prime_sieve import _pure_prime_pi",
+  "from mom.math import prime_pi",
+  "from mom.math import nth_prime",
+  None,
+  "from mom.math import _has_small_factor; from mom.codec.integer import bytes_to_uint; import os; ns=[bytes_to_uint(os.urandom(256)) | 1 for _ in range(1000)]",
+  "from mom.math import _pure_is_prime, generate_random_prime; p = generate_random_prime(1024)",
+  "from mom.math import _pure_is_prime, generate_random_prime; p = generate_random_prime(1024)",
+  "from mom.math import is_prime; import os; from mom.codec.integer import unpack_uints; ns = unpack_uints(os.urandom(8 * 10000), 8)",
+  "from mom.math import is_prime_many; import os; from mom.codec.integer import unpack_uints; ns = unpack_uints(os.urandom(8 * 10000), 8)",
+  "from mom.math import is_prime_many; import os, numpy; ns = numpy.frombuffer(os.urandom(8 * 10000), dtype=numpy.uint64)",
+  None,
+  "from mom.math import pow_mod, generate_random_prime; import random; n = generate_random_prime(2048); e = random.getrandbits(2048)",
+  "from mom.math import PowModContext, generate_random_prime; import random; c = PowModContext(2, generate_random_prime(2048)); e = random.getrandbits(2048)",
+  "from mom.math import pow_mod, generate_random_prime; import random; n = generate_random_prime(2048); a, b = random.getrandbits(2048), random.getrandbits(2048)",
+  "from mom.math import multi_pow_mod, generate_random_prime; import random; n = generate_random_prime(2048); a, b = random.getrandbits(2048), random.getrandbits(2048)",
+  None,
+  "from mom.math import inverse_mod, generate_random_prime; import random; n = generate_random_prime(2048); vs = [random.getrandbits(2048) for _ in range(500)]",
+  "from mom.math import inverse_mod_many, generate_random_prime; import random; n = generate_random_prime(2048); vs = [random.getrandbits(2048) for _ in range(500)]",
+  "from mom.math import inverse_mod, generate_random_prime; import random; ms = [generate_random_prime(1024) for _ in range(4)]; n = ms[0] * ms[1] * ms[2] * ms[3]; rs = [random.getrandbits(1000) for _ in ms]",
+  "from mom.math import CRTContext, generate_random_prime; import random; c = CRTContext([generate_random_prime(1024) for _ in range(4)]); rs = [random.getrandbits(1000) for _ in c.moduli]",
+  None,
+  "from mom.math import gcd; import random; ns = [random.getrandbits(1024) | 1 for _ in range(1000)]",
+  "from mom.math import batch_gcd; import random; ns = [random.getrandbits(1024) | 1 for _ in range(1000)]",
+  None,
+  "from mom.math import factorize, generate_random_prime; n = generate_random_prime(20) * generate_random_prime(20)",
+  "from mom.math import factorize, generate_random_prime; n = generate_random_prime(30) * generate_random_prime(30)",
+  "from mom.math import factorize, generate_random_prime; n = generate_random_prime(40) * generate_random_prime(40)",
+  "from mom.math import factorize, generate_random_prime; n = generate_random_prime(50) * generate_random_prime(50)",
+  "from mom.math import factorize, generate_random_prime; n = generate_random_prime(60) * generate_random_prime(60)",
+  None,
   "from mom.builtins import integer_byte_length; n=1<<4096",
   "from mom._alt_builtins import integer_byte_length_word_aligned; n=1<<4096",
   "from mom._alt_builtins import integer_byte_length_shift_counting; n=1<<4096",
@@ -64,6 +125,16 @@ setups = [
   "from mom.builtins import integer_bit_length; n=1<<4096",
   "from mom._alt_builtins import integer_bit_length_word_aligned; n=1<<4096",
   "from mom._alt_builtins import integer_bit_length_shift_counting; n=1<<4096",
+  "from mom._alt_builtins import integer_bit_length_hex; n=1<<4096",
+  "from mom.math import exact_log2; n=1<<4096",
+  None,
+  "from mom.builtins import integer_bit_count; n=(1<<4096)-1",
+  "from mom._alt_builtins import integer_bit_count_clearing; n=(1<<4096)-1",
+  None,
+  "from mom.builtins import bit_length_many; import os; from mom.codec.integer import bytes_to_uint; ns=[bytes_to_uint(os.urandom(32)) for _ in range(10000)]",
+  "from mom.builtins import integer_bit_length; import os; from mom.codec.integer import bytes_to_uint; ns=[bytes_to_uint(os.urandom(32)) for _ in range(10000)]",
+  "from mom.builtins import popcount_many; import os; from mom.codec.integer import bytes_to_uint; ns=[bytes_to_uint(os.urandom(32)) for _ in range(10000)]",
+  "from mom.builtins import integer_bit_count; import os; from mom.codec.integer import bytes_to_uint; ns=[bytes_to_uint(os.urandom(32)) for _ in range(10000)]",
   None,
   "from mom.codec.integer import uint_to_bytes; n=1<<4096",
   "from mom.codec._alt_integer import uint_to_bytes_simple; n=1<<4096",
@@ -72,6 +143,23 @@ setups = [
   "from mom.codec._alt_integer import uint_to_bytes_naive; n=1<<4096",
   "from mom.codec._alt_integer import uint_to_bytes_naive_array_based; n=1<<4096",
   None,
+  "import os; from mom.codec.integer import bytes_to_uint, uint_to_bytes; n = bytes_to_uint(os.urandom(1024))",
+  "import os; from mom.codec.integer import bytes_to_uint, uint_to_bytes; n = bytes_to_uint(os.urandom(16384))",
+  "import os; from mom.codec.integer import bytes_to_uint, uint_to_bytes; n = bytes_to_uint(os.urandom(65536))",
+  "import os; from mom.codec.integer import bytes_to_uint, uint_to_bytes; n = bytes_to_uint(os.urandom(1024))",
+  "import os; from mom.codec.integer import bytes_to_uint, int_to_bytes; n = -bytes_to_uint(os.urandom(1024))",
+  "import os; from mom.codec.integer import bytes_to_int; b = os.urandom(1024)",
+  "import os; from mom.codec.integer import bytes_to_uint, uint_to_bytes; n = bytes_to_uint(os.urandom(65536))",
+  "import os; from mom.codec.integer import bytes_to_uint, int_to_bytes; n = -bytes_to_uint(os.urandom(65536))",
+  "import os; from mom.codec.integer import bytes_to_int; b = os.urandom(65536)",
+  None,
+  "import os; from mom.codec.integer import bytes_to_uint; b = os.urandom(32 * 10000)",
+  "import os; from mom.codec.integer import unpack_uints; b = os.urandom(32 * 10000)",
+  "import os; from mom.codec.integer import unpack_uints, uint_to_bytes; l = unpack_uints(os.urandom(32 * 10000), 32)",
+  "import os; from mom.codec.integer import pack_uints, unpack_uints; l = unpack_uints(os.urandom(32 * 10000), 32); out = bytearray(32 * 10000)",
+  "import os; from mom.codec.integer import unpack_uints; b = os.urandom(256 * 1000)",
+  "import os; from mom.codec.integer import pack_uints, unpack_uints; l = unpack_uints(os.urandom(256 * 1000), 256); out = bytearray(256 * 1000)",
+  None,
   "import os; from mom.codec.integer import bytes_to_uint; b = os.urandom(4003)",
   "import os; from mom.codec._alt_integer import bytes_to_uint_naive; b = os.urandom(4003)",
   "import os; from mom.codec._alt_integer import bytes_to_uint_simple; b = os.urandom(4003)",
@@ -99,10 +187,35 @@ statements = [
   "b62encode(b)",
   "b62encode_naive(b)",
   None,
+  "b58encode(b)",
+  "b58decode(b)",
+  "b58encode(b)",
+  "b58decode(b)",
+  "b58encode(b)",
+  "b58decode(b)",
+  "b58encode_blocks(b)",
+  "b58decode_blocks(b)",
+  "b62encode_blocks(b)",
+  "b62decode_blocks(b)",
+  None,
+  "[b58encode(x) for x in l]",
+  "b58encode_many(l)",
+  "[b58decode(x) for x in l]",
+  "b58decode_many(l)",
+  "[b62encode(x) for x in l]",
+  "b62encode_many(l)",
+  "[b62decode(x) for x in l]",
+  "b62decode_many(l)",
+  None,
   "b85encode(b)",
   "b85decode(b)",
   "b85encode(b)",
   "b85decode(b)",
+  "b85encode(b)",
+  "b85decode(b)",
+  "_pure_b85encode_chunks(b, ASCII85_BYTES)",
+  "_pure_b85decode_chunks(b, ASCII85_BYTES, ASCII85_ORDS)",
+  "b85decode(b)",
   None,
   "ipv6_b85encode(ip)",
   "ipv6_b85encode_naive(ip)",
@@ -114,6 +227,42 @@ statements = [
   "rfc1924_b85encode(b)",
   "rfc1924_b85decode(b)",
   None,
+  "encode_file(path, out, 'base64')",
+  "encode_file(path, out, 'base85')",
+  "decode_file(path, out, 'hex')",
+  None,
+  "primes_between(2, 10 ** 6)",
+  "primes_between(10 ** 12, 10 ** 12 + 10 ** 6)",
+  "_pure_prime_pi(10 ** 10)",
+  "prime_pi(10 ** 11)",
+  "nth_prime(4118054813)",
+  None,
+  "[_has_small_factor(n) for n in ns]",
+  "_pure_is_prime(p)",
+  "_pure_is_prime(p, 5)",
+  "[is_prime(n) for n in ns]",
+  "is_prime_many(ns)",
+  "is_prime_many(ns)",
+  None,
+  "pow_mod(2, e, n)",
+  "c.pow(e)",
+  "pow_mod(2, a, n) * pow_mod(3, b, n) % n",
+  "multi_pow_mod([2, 3], [a, b], n)",
+  None,
+  "[inverse_mod(v, n) for v in vs]",
+  "inverse_mod_many(vs, n)",
+  "sum(r * (n // m) * inverse_mod(n // m, m) for r, m in zip(rs, ms)) % n",
+  "c.combine(rs)",
+  None,
+  "[gcd(ns[0], n) for n in ns]",
+  "batch_gcd(ns)",
+  None,
+  "factorize(n)",
+  "factorize(n)",
+  "factorize(n)",
+  "factorize(n)",
+  "factorize(n)",
+  None,
   "integer_byte_length(n)",
   "integer_byte_length_word_aligned(n)",
   "integer_byte_length_shift_counting(n)",
@@ -121,6 +270,16 @@ statements = [
   "integer_bit_length(n)",
   "integer_bit_length_word_aligned(n)",
   "integer_bit_length_shift_counting(n)",
+  "integer_bit_length_hex(n)",
+  "exact_log2(n)",
+  None,
+  "integer_bit_count(n)",
+  "integer_bit_count_clearing(n)",
+  None,
+  "bit_length_many(ns)",
+  "[integer_bit_length(x) for x in ns]",
+  "popcount_many(ns)",
+  "[integer_bit_count(x) for x in ns]",
   None,
   "uint_to_bytes(n)",
   "uint_to_bytes_simple(n)",
@@ -129,6 +288,23 @@ statements = [
   "uint_to_bytes_naive(n)",
   "uint_to_bytes_naive_array_based(n)",
   None,
+  "uint_to_bytes(n)",
+  "uint_to_bytes(n)",
+  "uint_to_bytes(n)",
+  "uint_to_bytes(n, little_endian=True)",
+  "int_to_bytes(n)",
+  "bytes_to_int(b)",
+  "uint_to_bytes(n, little_endian=True)",
+  "int_to_bytes(n)",
+  "bytes_to_int(b)",
+  None,
+  "[bytes_to_uint(b[i:i + 32]) for i in range(0, len(b), 32)]",
+  "unpack_uints(b, 32)",
+  "b''.join([uint_to_bytes(x, fill_size=32) for x in l])",
+  "pack_uints(l, 32, out)",
+  "unpack_uints(b, 256)",
+  "pack_uints(l, 256, out)",
+  None,
   "bytes_to_uint(b)",
   "bytes_to_uint_naive(b)",
   "bytes_to_uint_simple(b)",
@@ -69,6 +69,7 @@ setup(name="mom",
       zip_safe=True,
       platforms="any",
       packages=["mom"],
+      package_data={"mom": ["primes.bin"]},
       include_package_data=True,
       install_requires=install_requires,
       keywords=' '.join([
@@ -16,6 +16,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+"""Writes a binary prime table (see :mod:`mom.prime_sieve`).
+
+Usage: dump_primes.py [LIMIT [OUTPUT]]
+
+LIMIT defaults to the limit of the table shipped with the package and
+OUTPUT to that table, mom/primes.bin. Tables are written one sieve segment
+at a time, so a limit of 10**9 (50 million primes, 60 MB) takes about as
+much memory as the default.
+"""
+
 import sys
 import os
 
@@ -23,34 +33,22 @@ sys.path[0:0] = [
   os.curdir,
   ]
 
-from mom._prime_sieve import make_prime_sieve
-from pprint import pprint
-
-header = '''\
-#/usr/bin/env python
-# -*- coding: utf-8 -*-
-# Automatically-generated by dump_primes.py
-#
-# Copyright 2012 Google Inc. All Rights Reserved.
-#
-# Licensed under the Apache License, Version 2.0 (the "License");
-# you may not use this file except in compliance with the License.
-# You may obtain a copy of the License at
-#
-#     http://www.apache.org/licenses/LICENSE-2.0
-#
-# Unless required by applicable law or agreed to in writing, software
-# distributed under the License is distributed on an "AS IS" BASIS,
-# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# See the License for the specific language governing permissions and
-# limitations under the License.
+from mom import prime_sieve
 
-"""Precomputed prime sieve for faster lookups."""
 
-'''
-print(header)
+def main(argv):
+  limit = prime_sieve.DEFAULT_LIMIT
+  path = prime_sieve.DEFAULT_PATH
+  if len(argv) > 1:
+    limit = int(float(argv[1]))
+  if len(argv) > 2:
+    path = argv[2]
+  stream = open(path, "wb")
+  try:
+    prime_sieve.write_prime_table(stream, limit)
+  finally:
+    stream.close()
 
-a = set(make_prime_sieve(9999))
 
-sys.stdout.write("SIEVE = ")
-pprint(a)
+if __name__ == "__main__":
+  main(sys.argv)